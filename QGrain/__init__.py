@@ -35,6 +35,18 @@ def start_local_server():
     qgrain_server.serve()
 
 
+def run_demo(main_window):
+    # load the artificial dataset to show the functions of all modules
+    dataset = main_window.dataset_generator.get_random_dataset(100)
+    main_window.load_dataset_dialog.dataset_loaded.emit(dataset.dataset)
+    main_window.ssu_analyzer.on_try_fit_clicked()
+    main_window.parameter_editor.refer_parameters(dataset.distribution_type, dataset.parameters[0])
+    main_window.parameter_editor.enabled_checkbox.setChecked(True)
+    main_window.emma_analyzer.on_try_fit_clicked()
+    main_window.udm_analyzer.on_try_fit_clicked()
+    main_window.parameter_editor.enabled_checkbox.setChecked(False)
+
+
 def main():
     print(HELLO_TEXT)
     import argparse
@@ -55,6 +67,8 @@ def main():
                         dest="max_dataset_size")
     parser.add_argument("--target", type=str, default="localhost:50051",
                         help="specify the remote ip address of the grpc server")
+    parser.add_argument("--demo", action="store_true", default=False,
+                        help="load an artificial dataset and fit it by all modules after the startup")
     args = parser.parse_args()
     if args.server:
         from .protos.server import QGrainServicer
@@ -86,17 +100,12 @@ def main():
         QGrainClient.set_target(args.target)
         app = setup_app()
         main_window = MainWindow()
-        # load the artificial dataset to show the functions of all modules
-        dataset = main_window.dataset_generator.get_random_dataset(100)
-        main_window.load_dataset_dialog.dataset_loaded.emit(dataset.dataset)
-        main_window.ssu_analyzer.on_try_fit_clicked()
-        main_window.parameter_editor.refer_parameters(dataset.distribution_type, dataset.parameters[0])
-        main_window.parameter_editor.enabled_checkbox.setChecked(True)
-        main_window.emma_analyzer.on_try_fit_clicked()
-        main_window.udm_analyzer.on_try_fit_clicked()
-        main_window.parameter_editor.enabled_checkbox.setChecked(False)
         setup_logging(main_window.statusBar(), main_window.log_dialog)
         main_window.show()
+        if args.demo:
+            # the demo is started by the event loop, after the main window is shown
+            from PySide6 import QtCore
+            QtCore.QTimer.singleShot(0, lambda: run_demo(main_window))
         app.exec()
         if process is not None:
             process.terminate()
@@ -35,7 +35,6 @@ class BoxplotChart(BaseChart):
             flier.set_markeredgewidth(0.0)
         self._axes.set_ylabel(ylabel)
         self._axes.set_title(title)
-        self._figure.tight_layout()
         self._canvas.draw()
         self._last_result = dataset, xlabels, ylabel, title
 
@@ -12,7 +12,6 @@ from . import BaseChart
 from . import normal_color
 from ..metrics import loss_numpy
 from ..models import SSUResult, ArtificialSample
-from ..statistics import to_microns, mode
 
 
 class DistributionChart(BaseChart):
@@ -20,18 +19,7 @@ class DistributionChart(BaseChart):
         super().__init__(parent=parent, figsize=size)
         self.setWindowTitle(self.tr("Distribution Chart"))
         self._axes: plt.Axes = self._figure.subplots()
-        self.scale_menu = QtWidgets.QMenu(self.tr("Scale"))
-        self.menu.insertMenu(self.edit_figure_action, self.scale_menu)
-        self.scale_group = QtGui.QActionGroup(self.scale_menu)
-        self.scale_group.setExclusive(True)
-        self.scale_actions: List[QtGui.QAction] = []
-        for key, name in self.supported_scales:
-            scale_action = self.scale_group.addAction(name)
-            scale_action.setCheckable(True)
-            scale_action.triggered.connect(self.update_chart)
-            self.scale_menu.addAction(scale_action)
-            self.scale_actions.append(scale_action)
-        self.scale_actions[0].setChecked(True)
+        self.setup_scale_menu()
         self.show_mode_lines_action = QtGui.QAction(self.tr("Show Mode Lines"))
         self.show_mode_lines_action.triggered.connect(self.update_chart)
         self.menu.insertAction(self.edit_figure_action, self.show_mode_lines_action)
@@ -55,10 +43,12 @@ class DistributionChart(BaseChart):
         for interval, name in self.supported_intervals:
             interval_action = self.interval_group.addAction(name)
             interval_action.setCheckable(True)
-            interval_action.triggered.connect(self.update_chart)
+            interval_action.setData(interval)
             self.interval_menu.addAction(interval_action)
             self.interval_actions.append(interval_action)
         self.interval_actions[3].setChecked(True)
+        self._animation_interval = self.supported_intervals[3][0]
+        self.interval_group.triggered.connect(self.on_interval_changed)
         self.repeat_animation_action = QtGui.QAction(self.tr("Repeat Animation"))
         self.repeat_animation_action.triggered.connect(self.update_chart)
         self.menu.insertAction(self.edit_figure_action, self.repeat_animation_action)
@@ -83,13 +73,6 @@ class DistributionChart(BaseChart):
                      (60, self.tr("60 Milliseconds")))
         return intervals
 
-    @property
-    def scale(self) -> str:
-        for i, scale_action in enumerate(self.scale_actions):
-            if scale_action.isChecked():
-                key, name = self.supported_scales[i]
-                return key
-
     @property
     def show_mode(self) -> bool:
         return self.show_mode_lines_action.isChecked()
@@ -104,47 +87,41 @@ class DistributionChart(BaseChart):
 
     @property
     def animation_interval(self) -> int:
-        for i, interval_action in enumerate(self.interval_actions):
-            if interval_action.isChecked():
-                interval, name = self.supported_intervals[i]
-                return interval
+        return self._animation_interval
 
     @property
     def repeat_animation(self) -> bool:
         return self.repeat_animation_action.isChecked()
 
-    @property
-    def transfer(self) -> Callable[[Union[float, ndarray]], Union[float, ndarray]]:
-        if self.scale == "log-linear":
-            return lambda classes_phi: to_microns(classes_phi)
-        elif self.scale == "log":
-            return lambda classes_phi: np.log(to_microns(classes_phi))
-        elif self.scale == "phi":
-            return lambda classes_phi: classes_phi
-        elif self.scale == "linear":
-            return lambda classes_phi: to_microns(classes_phi)
-
-    @property
-    def xlabel(self) -> str:
-        if self.scale == "log-linear":
-            return "Grain size (microns)"
-        elif self.scale == "log":
-            return "Ln(grain size in microns)"
-        elif self.scale == "phi":
-            return "Grain size (phi)"
-        elif self.scale == "linear":
-            return "Grain size (microns)"
-
     @property
     def ylabel(self) -> str:
         return "Frequency"
 
-    @property
-    def xlog(self) -> bool:
-        if self.scale == "log-linear":
-            return True
-        else:
-            return False
+    def _component_modes(self, result: Union[ArtificialSample, SSUResult]) -> Tuple[List[float], ndarray]:
+        # locate the modes of all components by one argmax, and transfer them to the x space by one call
+        # the sizes are only formatted into labels, convert them to floats at once instead of indexing the array
+        distributions = np.array([component.distribution for component in result])
+        mode_indexes = np.argmax(distributions, axis=1)
+        return result.classes[mode_indexes].tolist(), self.transfer(result.classes_phi[mode_indexes])
+
+    @staticmethod
+    def _component_colors(n_components: int) -> List[Tuple[float, float, float, float]]:
+        # look up the colormap once, the lines and mode lines of a component share the color
+        cmap = plt.get_cmap()
+        return [cmap(i) for i in range(n_components)]
+
+    def _plot_components(self, x: ndarray, result: Union[ArtificialSample, SSUResult],
+                         mode_sizes: List[float], colors: Sequence[Tuple[float, float, float, float]]) -> List[plt.Line2D]:
+        # add the lines of all components by one call and cycle the colors per line
+        self._axes.set_prop_cycle(color=colors)
+        lines = self._axes.plot(x, np.array([component.distribution * component.proportion for component in result]).T)
+        for i, (line, component) in enumerate(zip(lines, result)):
+            line.set_label(f"C{i + 1} ({mode_sizes[i]:.2f} μm, {component.proportion:.2%}))")
+        return lines
+
+    def on_interval_changed(self, action: QtGui.QAction):
+        self._animation_interval = action.data()
+        self.update_chart()
 
     def show_menu(self, pos: QtCore.QPoint):
         self.edit_figure_action.setEnabled(self._animation is None and self._last_result is not None)
@@ -167,20 +144,15 @@ class DistributionChart(BaseChart):
         self._axes.set_ylim(0.0, round(np.max(result.sample.distribution) * 1.2, 2))
         lmse_loss = loss_numpy("lmse")(result.distribution, result.sample.distribution, None)
         self._axes.plot(x, result.distribution, c=normal_color(), label=f"Prediction (LMSE={lmse_loss:.2f})")
-        for i, component in enumerate(result):
-            mode_micron = mode(result.classes, result.classes_phi, component.distribution, is_geometric=True)
-            self._axes.plot(x, component.distribution * component.proportion, c=plt.get_cmap()(i),
-                            label=f"C{i + 1} ({mode_micron:.2f} μm, {component.proportion:.2%}))")
+        mode_sizes, mode_positions = self._component_modes(result)
+        colors = self._component_colors(len(result))
+        self._plot_components(x, result, mode_sizes, colors)
         if self.xlog:
             self._axes.set_xscale("log")
         if self.show_mode:
-            modes = [self.transfer(mode(result.classes, result.classes_phi, component.distribution,
-                                        is_geometric=False)) for component in result]
-            colors = [plt.get_cmap()(i) for i in range(len(result))]
-            self._axes.vlines(modes, 0.0, 1.0, colors=colors)
+            self._axes.vlines(mode_positions, 0.0, 1.0, colors=colors)
         if self.show_legend:
             self._axes.legend(loc="upper left")
-        self._figure.tight_layout()
         self._canvas.draw()
 
     def show_animation(self, result: SSUResult):
@@ -197,8 +169,8 @@ class DistributionChart(BaseChart):
         self._axes.set_title(result.name)
         self._axes.set_xlabel(self.xlabel)
         self._axes.set_ylabel(self.ylabel)
-        observation_line = self._axes.plot(x, result.sample.distribution, c="#ffffff00", marker=".", ms=3,
-                                           mfc=normal_color(), mec=normal_color(), label="Observation")[0]
+        self._axes.plot(x, result.sample.distribution, c="#ffffff00", marker=".", ms=3,
+                        mfc=normal_color(), mec=normal_color(), label="Observation")
         self._axes.set_xlim(x[0], x[-1])
         self._axes.set_ylim(0.0, round(np.max(result.sample.distribution) * 1.2, 2))
 
@@ -216,16 +188,11 @@ class DistributionChart(BaseChart):
                 lmse_loss = loss_numpy("lmse")(result.distribution, result.sample.distribution, None)
                 prediction_line = self._axes.plot(x, result.distribution, c=normal_color(),
                                                   label=f"Prediction (LMSE={lmse_loss:.2f})")[0]
-                for i, component in enumerate(result):
-                    mode_micron = mode(result.classes, result.classes_phi, component.distribution, is_geometric=True)
-                    line = self._axes.plot(x, component.distribution * component.proportion, c=plt.get_cmap()(i),
-                                           label=f"C{i + 1} ({mode_micron:.2f} μm, {component.proportion:.2%}))")[0]
-                    component_lines.append(line)
+                mode_sizes, mode_positions = self._component_modes(result)
+                colors = self._component_colors(len(result))
+                component_lines = self._plot_components(x, result, mode_sizes, colors)
                 if self.show_mode:
-                    modes = [self.transfer(mode(result.classes, result.classes_phi, component.distribution,
-                                                is_geometric=False)) for component in result]
-                    colors = [plt.get_cmap()(i) for i in range(len(result))]
-                    mode_lines = self._axes.vlines(modes, 0.0, 1.0, colors=colors)
+                    mode_lines = self._axes.vlines(mode_positions, 0.0, 1.0, colors=colors)
                 if self.show_legend:
                     legend = self._axes.legend(loc="upper left")
             artists = [prediction_line, *component_lines]
@@ -238,30 +205,24 @@ class DistributionChart(BaseChart):
         def animate(current: SSUResult):
             nonlocal prediction_line
             nonlocal component_lines
-            nonlocal mode_lines
-            nonlocal legend
             prediction_line.set_ydata(current.distribution)
-            for i, (line, component) in enumerate(zip(component_lines, current)):
-                mode_micron = mode(current.classes, current.classes_phi, component.distribution, is_geometric=True)
+            # only the data changes, the styles and labels of the lines are set once by init
+            for line, component in zip(component_lines, current):
                 line.set_ydata(component.distribution * component.proportion)
-                line.set_label(f"C{i + 1} ({mode_micron:.2f} μm, {component.proportion:.2%}))")
             artists = [prediction_line, *component_lines]
+            mode_sizes, mode_positions = self._component_modes(current)
+            # move the mode lines and relabel the legend in place, instead of rebuilding them every frame
             if self.show_mode:
-                mode_lines.remove()
-                modes = [self.transfer(mode(current.classes, current.classes_phi, component.distribution,
-                                            is_geometric=False)) for component in current]
-                colors = [plt.get_cmap()(i) for i in range(len(current))]
-                mode_lines = self._axes.vlines(modes, 0.0, 1.0, colors=colors)
+                mode_lines.set_segments([[(position, 0.0), (position, 1.0)] for position in mode_positions])
                 artists.append(mode_lines)
             if self.show_legend:
                 lmse_loss = loss_numpy("lmse")(current.distribution, current.sample.distribution, None)
-                handles = [observation_line, prediction_line, *component_lines]
                 labels = ["Observation", f"Prediction (LMSE={lmse_loss:.2f})"]
                 for i, component in enumerate(current):
-                    mode_micron = mode(current.classes, current.classes_phi, component.distribution, is_geometric=True)
-                    label = f"C{i + 1} ({mode_micron:.2f} μm, {component.proportion:.2%})"
+                    label = f"C{i + 1} ({mode_sizes[i]:.2f} μm, {component.proportion:.2%})"
                     labels.append(label)
-                legend = self._axes.legend(handles=handles, labels=labels, loc="upper left")
+                for text, label in zip(legend.get_texts(), labels):
+                    text.set_text(label)
                 artists.append(legend)
             return artists
 
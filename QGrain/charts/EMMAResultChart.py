@@ -6,34 +6,25 @@ import matplotlib.pyplot as plt
 import numpy as np
 from PySide6 import QtCore, QtGui, QtWidgets
 from matplotlib.animation import FuncAnimation
+from matplotlib.collections import LineCollection
 from numpy import ndarray
 
 from . import BaseChart
 from . import normal_color
 from ..models import EMMAResult
-from ..statistics import to_microns
 from ..utils import get_image_by_proportions
 
 
 class EMMAResultChart(BaseChart):
     N_DISPLAY_SAMPLES = 200
+    N_MAX_FRAMES = 600
+    # the memory limit of the proportion images (one byte per pixel) rasterized before animating
+    N_MAX_IMAGE_BYTES = 128 * 1024 * 1024
 
     def __init__(self, parent=None, figsize=(4.4, 4.4)):
         super().__init__(parent=parent, figsize=figsize)
         self.setWindowTitle(self.tr("EMMA Chart"))
-        # self.axes = self.figure.subplots()
-        self.scale_menu = QtWidgets.QMenu(self.tr("Scale"))
-        self.menu.insertMenu(self.edit_figure_action, self.scale_menu)
-        self.scale_group = QtGui.QActionGroup(self.scale_menu)
-        self.scale_group.setExclusive(True)
-        self.scale_actions: List[QtGui.QAction] = []
-        for key, name in self.supported_scales:
-            scale_action = self.scale_group.addAction(name)
-            scale_action.setCheckable(True)
-            scale_action.triggered.connect(self.update_chart)
-            self.scale_menu.addAction(scale_action)
-            self.scale_actions.append(scale_action)
-        self.scale_actions[0].setChecked(True)
+        self.setup_scale_menu()
         self.loss_menu = QtWidgets.QMenu(self.tr("Loss Function"))
         self.menu.insertMenu(self.edit_figure_action, self.loss_menu)
         self.loss_group = QtGui.QActionGroup(self.loss_menu)
@@ -59,15 +50,18 @@ class EMMAResultChart(BaseChart):
         for interval, name in self.supported_intervals:
             interval_action = self.interval_group.addAction(name)
             interval_action.setCheckable(True)
-            interval_action.triggered.connect(self.update_chart)
+            interval_action.setData(interval)
             self.interval_menu.addAction(interval_action)
             self.interval_actions.append(interval_action)
         self.interval_actions[3].setChecked(True)
+        self._animation_interval = self.supported_intervals[3][0]
+        self.interval_group.triggered.connect(self.on_interval_changed)
         self.repeat_action = QtGui.QAction(self.tr("Repeat Animation"))
         self.repeat_action.triggered.connect(self.update_chart)
         self.menu.insertAction(self.edit_figure_action, self.repeat_action)
         self.repeat_action.setCheckable(True)
         self.repeat_action.setChecked(False)
+        self._axes: Optional[Tuple[plt.Axes, plt.Axes, plt.Axes, plt.Axes]] = None
         self._last_result: Optional[EMMAResult] = None
 
     @property
@@ -102,13 +96,6 @@ class EMMAResultChart(BaseChart):
                      (60, self.tr("60 Milliseconds")))
         return intervals
 
-    @property
-    def scale(self) -> str:
-        for i, scale_action in enumerate(self.scale_actions):
-            if scale_action.isChecked():
-                key, name = self.supported_scales[i]
-                return key
-
     @property
     def loss(self) -> Tuple[str, str]:
         for i, distance_action in enumerate(self.loss_actions):
@@ -122,47 +109,29 @@ class EMMAResultChart(BaseChart):
 
     @property
     def animation_interval(self) -> int:
-        for i, interval_action in enumerate(self.interval_actions):
-            if interval_action.isChecked():
-                interval, name = self.supported_intervals[i]
-                return interval
+        return self._animation_interval
 
     @property
     def repeat_animation(self) -> bool:
         return self.repeat_action.isChecked()
 
-    @property
-    def transfer(self) -> Callable[[Union[int, float, ndarray]], Union[int, float, ndarray]]:
-        if self.scale == "log-linear":
-            return lambda classes_phi: to_microns(classes_phi)
-        elif self.scale == "log":
-            return lambda classes_phi: np.log(to_microns(classes_phi))
-        elif self.scale == "phi":
-            return lambda classes_phi: classes_phi
-        elif self.scale == "linear":
-            return lambda classes_phi: to_microns(classes_phi)
-
-    @property
-    def xlabel(self) -> str:
-        if self.scale == "log-linear":
-            return "Grain size (microns)"
-        elif self.scale == "log":
-            return "Ln(grain size in microns)"
-        elif self.scale == "phi":
-            return "Grain size (phi)"
-        elif self.scale == "linear":
-            return "Grain size (microns)"
-
     @property
     def ylabel(self) -> str:
         return "Frequency"
 
-    @property
-    def xlog(self) -> bool:
-        if self.scale == "log-linear":
-            return True
+    def on_interval_changed(self, action: QtGui.QAction):
+        self._animation_interval = action.data()
+        self.update_chart()
+
+    def get_axes(self) -> Tuple[plt.Axes, plt.Axes, plt.Axes, plt.Axes]:
+        # reuse the axes, unless the figure has been recreated (e.g., the style was changed)
+        if self._axes is None or self._axes[0].figure is not self._figure:
+            self._figure.clear()
+            self._axes = tuple(self._figure.add_subplot(2, 2, i + 1) for i in range(4))
         else:
-            return False
+            for axes in self._axes:
+                axes.clear()
+        return self._axes
 
     def show_menu(self, pos: QtCore.QPoint):
         self.edit_figure_action.setEnabled(self._last_result is not None and not self.animated)
@@ -171,18 +140,19 @@ class EMMAResultChart(BaseChart):
 
     def show_chart(self, result: EMMAResult):
         self._last_result = result
-        self._figure.clear()
         if self._animation is not None:
             self._animation._stop()
             self._animation = None
+        sample_axes, loss_axes, end_member_axes, proportion_axes = self.get_axes()
         classes = self.transfer(result.dataset.classes_phi)
         loss_key, loss_name = self.loss
         loss_series = result.loss_series(loss_key)
         iteration_indexes = np.linspace(1, len(loss_series), len(loss_series))
         interval = max(1, result.n_samples // self.N_DISPLAY_SAMPLES)
-        sample_axes = self._figure.add_subplot(2, 2, 1)
-        for sample in result.dataset[::interval]:
-            sample_axes.plot(classes, sample.distribution, c=normal_color(), alpha=0.2)
+        # draw the distributions as one collection instead of a line per sample
+        distributions = result.dataset.distributions[::interval]
+        segments = np.stack([np.broadcast_to(classes, distributions.shape), distributions], axis=2)
+        sample_axes.add_collection(LineCollection(segments, colors=normal_color(), alpha=0.2))
         if self.xlog:
             sample_axes.set_xscale("log")
         sample_axes.set_xlim(classes[0], classes[-1])
@@ -190,13 +160,11 @@ class EMMAResultChart(BaseChart):
         sample_axes.set_xlabel(self.xlabel)
         sample_axes.set_ylabel(self.ylabel)
         sample_axes.set_title("GSDs")
-        loss_axes = self._figure.add_subplot(2, 2, 2)
         loss_axes.plot(iteration_indexes, loss_series, c=normal_color())
         loss_axes.set_xlim(0, len(loss_series))
         loss_axes.set_xlabel("Iteration")
         loss_axes.set_ylabel(loss_name)
         loss_axes.set_title("Loss variation")
-        end_member_axes = self._figure.add_subplot(2, 2, 3)
         if self.xlog:
             end_member_axes.set_xscale("log")
         for i in range(result.n_members):
@@ -206,7 +174,6 @@ class EMMAResultChart(BaseChart):
         end_member_axes.set_xlabel(self.xlabel)
         end_member_axes.set_ylabel(self.ylabel)
         end_member_axes.set_title("End members")
-        proportion_axes = self._figure.add_subplot(2, 2, 4)
         image = get_image_by_proportions(result.proportions, resolution=100)
         proportion_axes.imshow(image, plt.get_cmap(), aspect="auto", vmin=0, vmax=9,
                                extent=(0.0, result.n_samples, 100, 0.0), interpolation="none")
@@ -216,16 +183,15 @@ class EMMAResultChart(BaseChart):
         proportion_axes.set_xlabel("Sample index")
         proportion_axes.set_ylabel("Proportion")
         proportion_axes.set_title("Proportions")
-        self._figure.tight_layout()
         self._canvas.draw()
 
     def show_animation(self, result: EMMAResult):
         assert result.n_iterations > 1
         self._last_result = result
-        self._figure.clear()
         if self._animation is not None:
             self._animation._stop()
             self._animation = None
+        sample_axes, loss_axes, end_member_axes, proportion_axes = self.get_axes()
         classes = self.transfer(result.dataset.classes_phi)
         loss_key, loss_name = self.loss
         loss_series = result.loss_series(loss_key)
@@ -233,9 +199,10 @@ class EMMAResultChart(BaseChart):
         loss_series = result.loss_series(self.loss[0])
         min_distance, max_distance = np.min(loss_series), np.max(loss_series)
         interval = max(1, result.n_samples // self.N_DISPLAY_SAMPLES)
-        sample_axes = self._figure.add_subplot(2, 2, 1)
-        for sample in result.dataset[::interval]:
-            sample_axes.plot(classes, sample.distribution, c=normal_color(), alpha=0.2)
+        # draw the distributions as one collection instead of a line per sample
+        distributions = result.dataset.distributions[::interval]
+        segments = np.stack([np.broadcast_to(classes, distributions.shape), distributions], axis=2)
+        sample_axes.add_collection(LineCollection(segments, colors=normal_color(), alpha=0.2))
         if self.xlog:
             sample_axes.set_xscale("log")
         sample_axes.set_xlim(classes[0], classes[-1])
@@ -243,13 +210,11 @@ class EMMAResultChart(BaseChart):
         sample_axes.set_xlabel(self.xlabel)
         sample_axes.set_ylabel(self.ylabel)
         sample_axes.set_title("GSDs")
-        loss_axes = self._figure.add_subplot(2, 2, 2)
         loss_axes.plot(iteration_indexes, loss_series, c=normal_color())
         loss_axes.set_xlim(0, len(loss_series))
         loss_axes.set_xlabel("Iteration")
         loss_axes.set_ylabel(loss_name)
         loss_axes.set_title("Loss variation")
-        end_member_axes = self._figure.add_subplot(2, 2, 3)
         if self.xlog:
             end_member_axes.set_xscale("log")
         end_member_axes.set_xlim(classes[0], classes[-1])
@@ -257,7 +222,6 @@ class EMMAResultChart(BaseChart):
         end_member_axes.set_xlabel(self.xlabel)
         end_member_axes.set_ylabel(self.ylabel)
         end_member_axes.set_title("End members")
-        proportion_axes = self._figure.add_subplot(2, 2, 4)
         proportion_axes.set_xlim(0, result.n_samples)
         proportion_axes.set_ylim(0, 100)
         proportion_axes.set_yticks([0, 20, 40, 60, 80, 100], ["0.0", "0.2", "0.4", "0.6", "0.8", "1.0"])
@@ -285,21 +249,27 @@ class EMMAResultChart(BaseChart):
                     extent=(0.0, result.n_samples, 100, 0.0), interpolation="none")
             return iteration_line, proportion_image, *end_member_curves
 
-        def animate(args: Tuple[int, EMMAResult]):
+        def animate(args: Tuple[int, Tuple[ndarray, ndarray]]):
             nonlocal iteration_line
             nonlocal end_member_curves
             nonlocal proportion_image
-            iteration, current = args
+            iteration, (end_members, image) = args
             iteration_line.set_xdata((iteration, iteration))
-            for i in range(current.n_members):
-                end_member_curves[i].set_ydata(current.end_members[i])
-            image = get_image_by_proportions(current.proportions, resolution=100)
+            for i in range(result.n_members):
+                end_member_curves[i].set_ydata(end_members[i])
             proportion_image.set_data(image)
             return iteration_line, proportion_image, *end_member_curves
 
-        self._animation = FuncAnimation(self._figure, animate, init_func=init, frames=enumerate(result.history),
+        # rasterize the proportions of all frames before the animation starts
+        # each frame holds a 100-pixel-high image of all samples, so large datasets have fewer frames
+        n_frames = min(self.N_MAX_FRAMES, max(2, self.N_MAX_IMAGE_BYTES // (100 * result.n_samples)))
+        frame_indexes = np.unique(np.linspace(0, result.n_iterations - 1, n_frames).astype(int))
+        frame_states = [(current.end_members, get_image_by_proportions(current.proportions, resolution=100))
+                        for current in result.get_history(frame_indexes)]
+        self._animation = FuncAnimation(self._figure, animate, init_func=init,
+                                        frames=zip(frame_indexes, frame_states),
                                         interval=self.animation_interval, blit=True, repeat=self.repeat_animation,
-                                        repeat_delay=5.0, save_count=result.n_iterations)
+                                        repeat_delay=5.0, save_count=len(frame_indexes))
 
     def show_result(self, result: EMMAResult):
         if self.animated and result.n_iterations > 1:
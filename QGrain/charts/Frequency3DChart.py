@@ -3,10 +3,8 @@ __all__ = ["Frequency3DChart"]
 from typing import *
 
 import numpy as np
-from PySide6 import QtGui, QtWidgets
 from matplotlib.ticker import FuncFormatter
 from mpl_toolkits.mplot3d import Axes3D
-from numpy import ndarray
 
 from . import BaseChart
 from ..models import Sample
@@ -14,23 +12,16 @@ from ..statistics import to_microns
 
 
 class Frequency3DChart(BaseChart):
+    # the x axis can not be logarithmic, the log-linear scale is emulated by the logarithms and the tick formatter
+    SCALES = {**BaseChart.SCALES,
+              "log-linear": (lambda classes_phi: np.log10(to_microns(classes_phi)), "Grain size (microns)", False)}
+
     def __init__(self, parent=None, figsize=(6, 4)):
         super().__init__(parent=parent, figsize=figsize)
         self.setWindowTitle(self.tr("Frequency 3D Chart"))
         self._axes = Axes3D(self._figure, auto_add_to_figure=False)
         self._figure.add_axes(self._axes)
-        self.scale_menu = QtWidgets.QMenu(self.tr("Scale"))
-        self.menu.insertMenu(self.edit_figure_action, self.scale_menu)
-        self.scale_group = QtGui.QActionGroup(self.scale_menu)
-        self.scale_group.setExclusive(True)
-        self.scale_actions: List[QtGui.QAction] = []
-        for key, name in self.supported_scales:
-            scale_action = self.scale_group.addAction(name)
-            scale_action.setCheckable(True)
-            scale_action.triggered.connect(self.update_chart)
-            self.scale_menu.addAction(scale_action)
-            self.scale_actions.append(scale_action)
-        self.scale_actions[0].setChecked(True)
+        self.setup_scale_menu()
         self._last_samples = []
 
     @property
@@ -41,35 +32,6 @@ class Frequency3DChart(BaseChart):
                   ("linear", self.tr("Linear")))
         return scales
 
-    @property
-    def scale(self) -> str:
-        for i, scale_action in enumerate(self.scale_actions):
-            if scale_action.isChecked():
-                key, name = self.supported_scales[i]
-                return key
-
-    @property
-    def transfer(self) -> Callable[[Union[int, float, ndarray]], Union[int, float, ndarray]]:
-        if self.scale == "log-linear":
-            return lambda classes_phi: np.log10(to_microns(classes_phi))
-        elif self.scale == "log":
-            return lambda classes_phi: np.log(to_microns(classes_phi))
-        elif self.scale == "phi":
-            return lambda classes_phi: classes_phi
-        elif self.scale == "linear":
-            return lambda classes_phi: to_microns(classes_phi)
-
-    @property
-    def xlabel(self) -> str:
-        if self.scale == "log-linear":
-            return "Grain size (microns)"
-        elif self.scale == "log":
-            return "Ln(grain size in microns)"
-        elif self.scale == "phi":
-            return "Grain size (phi)"
-        elif self.scale == "linear":
-            return "Grain size (microns)"
-
     @property
     def ylabel(self) -> str:
         return "Frequency"
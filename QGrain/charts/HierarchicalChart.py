@@ -1,5 +1,7 @@
 from typing import *
 
+import numpy as np
+from matplotlib.collections import EllipseCollection, LineCollection
 from numpy import ndarray
 from scipy.cluster.hierarchy import dendrogram, linkage
 from sklearn.decomposition import PCA
@@ -14,26 +16,72 @@ class HierarchicalChart(BaseChart):
         self.setWindowTitle(self.tr("Hierarchical Clustering"))
         self._axes = self._figure.subplots()
         self._last_result = None
+        self._last_dataset = None
+        self._last_transformed: Optional[ndarray] = None
+        self._linkage_cache: Dict[Tuple[str, str], ndarray] = {}
+        self._last_layout = None
 
     def show_dataset(self, dataset: Union[ArtificialDataset, Dataset], method="ward", metric="euclidean", p=100):
-        pca = PCA(n_components=0.95)
-        transformed = pca.fit_transform(dataset.distributions)
-        linkage_matrix = linkage(transformed, method=method, metric=metric)
-        self.show_matrix(linkage_matrix, p)
+        # reuse the transformed data and linkage matrices while the dataset is not changed
+        if dataset is not self._last_dataset:
+            pca = PCA(n_components=0.95)
+            # it's only used to display, the precision of float32 is enough
+            self._last_transformed = pca.fit_transform(dataset.distributions.astype(np.float32))
+            self._last_dataset = dataset
+            self._linkage_cache.clear()
+        if (method, metric) not in self._linkage_cache:
+            self._linkage_cache[(method, metric)] = linkage(self._last_transformed, method=method, metric=metric)
+        self.show_matrix(self._linkage_cache[(method, metric)], p)
+
+    def get_layout(self, linkage_matrix: ndarray, p=100):
+        # the layout of dendrogram is expensive for thousands of samples, reuse it if possible
+        if self._last_layout is not None:
+            last_matrix, last_p, ddata, marks = self._last_layout
+            if last_matrix is linkage_matrix and last_p == p:
+                return ddata, marks
+        ddata = dendrogram(linkage_matrix, p=p, truncate_mode="lastp", no_plot=True)
+        # the contraction marks are not returned by scipy, collect them from the contracted nodes
+        n_samples = linkage_matrix.shape[0] + 1
+        marks = []
+        for i, leaf in enumerate(ddata["leaves"]):
+            x = i * 10 + 5
+            stack = [int(child) for child in linkage_matrix[leaf-n_samples, :2]] if leaf >= n_samples else []
+            while len(stack) != 0:
+                node = stack.pop()
+                if node >= n_samples:
+                    marks.append((x, linkage_matrix[node-n_samples, 2]))
+                    stack.extend(int(child) for child in linkage_matrix[node-n_samples, :2])
+        marks = np.array(marks).reshape(-1, 2)
+        self._last_layout = (linkage_matrix, p, ddata, marks)
+        return ddata, marks
 
     def show_matrix(self, linkage_matrix: ndarray, p=100):
         self._last_result = (linkage_matrix, p)
+        ddata, marks = self.get_layout(linkage_matrix, p)
         self._axes.clear()
-        dendrogram(linkage_matrix, no_labels=False, p=p, truncate_mode='lastp', show_contracted=True,
-                   leaf_font_size=7, ax=self._axes)
+        n_leaves = len(ddata["ivl"])
+        height = np.max(linkage_matrix[:, 2]) * 1.05
+        segments = [np.column_stack((xs, ys)) for xs, ys in zip(ddata["icoord"], ddata["dcoord"])]
+        self._axes.add_collection(LineCollection(segments, colors=ddata["color_list"]))
+        if len(marks) != 0:
+            self._axes.add_collection(EllipseCollection(
+                1.0, height / 100, 0.0, units="xy", offsets=marks,
+                offset_transform=self._axes.transData, facecolors="k", edgecolors="none", alpha=0.5))
+        self._axes.set_xlim(0, n_leaves * 10)
+        self._axes.set_ylim(0, height)
+        self._axes.set_xticks(np.arange(5, n_leaves * 10 + 5, 10))
+        # hide the tick lines which cover up the links
+        self._axes.tick_params(axis="x", length=0)
+        rotation = 0 if n_leaves <= 20 else 45 if n_leaves <= 40 else 90
+        self._axes.set_xticklabels(ddata["ivl"], rotation=rotation, fontsize=7)
         self._axes.set_xlabel("Sample count/index")
         self._axes.set_ylabel("Distance")
-        self._figure.tight_layout()
         self._canvas.draw()
 
     def update_chart(self):
-        self._figure.clear()
-        self._axes = self._figure.subplots()
+        # the axes only need to be recreated if the figure has been recreated
+        if self._axes.figure is not self._figure:
+            self._axes = self._figure.subplots()
         if self._last_result is not None:
             self.show_matrix(*self._last_result)
 
@@ -18,7 +18,6 @@ class LossSeriesChart(BaseChart):
         self._axes.set_xlabel("Iteration index")
         self._axes.set_ylabel(ylabel)
         self._axes.set_title(title)
-        self._figure.tight_layout()
         self._canvas.draw()
         self._last_result = series, ylabel, title
 
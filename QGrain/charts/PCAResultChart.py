@@ -21,8 +21,10 @@ class PCAResultChart(BaseChart):
     def show_dataset(self, dataset: Union[ArtificialDataset, Dataset]):
         assert dataset is not None
         self._last_dataset = dataset
-        pca = PCA()
-        transformed = pca.fit_transform(dataset.distributions)
+        # only PC1 and PC2 are displayed, the randomized solver will be used for large datasets
+        pca = PCA(n_components=2, random_state=0)
+        # it's only used to display, the precision of float32 is enough
+        transformed = pca.fit_transform(dataset.distributions.astype(np.float32))
         self.sample_axes.clear()
         self.shape_axes.clear()
         self.series_axes.clear()
@@ -52,14 +54,14 @@ class PCAResultChart(BaseChart):
         self.series_axes.set_xlabel("Sample index")
         self.series_axes.set_ylabel("Transformed value")
         self.series_axes.legend(loc="upper left")
-        self._figure.tight_layout()
         self._canvas.draw()
 
     def update_chart(self):
-        self._figure.clear()
-        self.sample_axes = self._figure.add_subplot(2, 2, 1)
-        self.shape_axes = self._figure.add_subplot(2, 2, 2)
-        self.series_axes = self._figure.add_subplot(2, 1, 2)
+        # the axes only need to be recreated if the figure has been recreated
+        if self.sample_axes.figure is not self._figure:
+            self.sample_axes = self._figure.add_subplot(2, 2, 1)
+            self.shape_axes = self._figure.add_subplot(2, 2, 2)
+            self.series_axes = self._figure.add_subplot(2, 1, 2)
         if self._last_dataset is not None:
             self.show_dataset(self._last_dataset)
 
@@ -4,41 +4,40 @@ import matplotlib.pyplot as plt
 import numpy as np
 from PySide6 import QtCore, QtGui, QtWidgets
 from matplotlib.animation import FuncAnimation
+from matplotlib.collections import LineCollection
 from numpy import ndarray
 
 from . import BaseChart
 from . import normal_color
 from ..models import UDMResult
-from ..statistics import to_microns
 from ..utils import get_image_by_proportions
 
 
-def summarize(components: ndarray, q=0.01):
+def summarize(components: ndarray, q=0.01, buffer: ndarray = None):
+    # the summary is only used to display, the precision of float32 is enough
+    # and it's a copy, so that it can be partitioned in place
+    if buffer is None:
+        components = components.astype(np.float32)
+    else:
+        # reuse the scratch buffer when summarizing many states of the same shape
+        np.copyto(buffer, components)
+        components = buffer
     mean = np.mean(components, axis=0)
-    upper = np.quantile(components, q=1 - q, axis=0)
-    lower = np.quantile(components, q=q, axis=0)
+    # evaluate both quantiles in one call, the components only need to be sorted once
+    lower, upper = np.quantile(components, q=(q, 1 - q), axis=0, overwrite_input=True)
     return mean, lower, upper
 
 
 class UDMResultChart(BaseChart):
     N_DISPLAY_SAMPLES = 200
+    N_MAX_FRAMES = 600
+    # the memory limit of the proportion images (one byte per pixel) rasterized before animating
+    N_MAX_IMAGE_BYTES = 128 * 1024 * 1024
 
     def __init__(self, parent=None, figsize=(4.4, 4.4)):
         super().__init__(parent=parent, figsize=figsize)
         self.setWindowTitle(self.tr("UDM Chart"))
-        # self.axes = self.figure.subplots()
-        self.scale_menu = QtWidgets.QMenu(self.tr("Scale"))
-        self.menu.insertMenu(self.edit_figure_action, self.scale_menu)
-        self.scale_group = QtGui.QActionGroup(self.scale_menu)
-        self.scale_group.setExclusive(True)
-        self.scale_actions: List[QtGui.QAction] = []
-        for key, name in self.supported_scales:
-            scale_action = self.scale_group.addAction(name)
-            scale_action.setCheckable(True)
-            scale_action.triggered.connect(self.update_chart)
-            self.scale_menu.addAction(scale_action)
-            self.scale_actions.append(scale_action)
-        self.scale_actions[0].setChecked(True)
+        self.setup_scale_menu()
         self.animated_action = QtGui.QAction(self.tr("Animated"))
         self.animated_action.triggered.connect(self.update_chart)
         self.menu.insertAction(self.edit_figure_action, self.animated_action)
@@ -52,15 +51,18 @@ class UDMResultChart(BaseChart):
         for interval, name in self.supported_intervals:
             interval_action = self.interval_group.addAction(name)
             interval_action.setCheckable(True)
-            interval_action.triggered.connect(self.update_chart)
+            interval_action.setData(interval)
             self.interval_menu.addAction(interval_action)
             self.interval_actions.append(interval_action)
         self.interval_actions[3].setChecked(True)
+        self._animation_interval = self.supported_intervals[3][0]
+        self.interval_group.triggered.connect(self.on_interval_changed)
         self.repeat_action = QtGui.QAction(self.tr("Repeat Animation"))
         self.repeat_action.triggered.connect(self.update_chart)
         self.menu.insertAction(self.edit_figure_action, self.repeat_action)
         self.repeat_action.setCheckable(True)
         self.repeat_action.setChecked(False)
+        self._axes: Optional[Tuple[plt.Axes, plt.Axes, plt.Axes, plt.Axes]] = None
         self._last_result = None
 
     @property
@@ -80,60 +82,35 @@ class UDMResultChart(BaseChart):
                      (60, self.tr("60 Milliseconds")))
         return intervals
 
-    @property
-    def scale(self) -> str:
-        for i, scale_action in enumerate(self.scale_actions):
-            if scale_action.isChecked():
-                key, name = self.supported_scales[i]
-                return key
-
     @property
     def animated(self) -> bool:
         return self.animated_action.isChecked()
 
     @property
     def animation_interval(self) -> int:
-        for i, interval_action in enumerate(self.interval_actions):
-            if interval_action.isChecked():
-                interval, name = self.supported_intervals[i]
-                return interval
+        return self._animation_interval
 
     @property
     def repeat_animation(self) -> bool:
         return self.repeat_action.isChecked()
 
-    @property
-    def transfer(self) -> Callable[[Union[float, ndarray]], Union[float, ndarray]]:
-        if self.scale == "log-linear":
-            return lambda classes_phi: to_microns(classes_phi)
-        elif self.scale == "log":
-            return lambda classes_phi: np.log(to_microns(classes_phi))
-        elif self.scale == "phi":
-            return lambda classes_phi: classes_phi
-        elif self.scale == "linear":
-            return lambda classes_phi: to_microns(classes_phi)
-
-    @property
-    def xlabel(self) -> str:
-        if self.scale == "log-linear":
-            return "Grain size (microns)"
-        elif self.scale == "log":
-            return "Ln(grain size in microns)"
-        elif self.scale == "phi":
-            return "Grain size (phi)"
-        elif self.scale == "linear":
-            return "Grain size (microns)"
-
     @property
     def ylabel(self) -> str:
         return "Frequency"
 
-    @property
-    def xlog(self) -> bool:
-        if self.scale == "log-linear":
-            return True
+    def on_interval_changed(self, action: QtGui.QAction):
+        self._animation_interval = action.data()
+        self.update_chart()
+
+    def get_axes(self) -> Tuple[plt.Axes, plt.Axes, plt.Axes, plt.Axes]:
+        # reuse the axes, unless the figure has been recreated (e.g., the style was changed)
+        if self._axes is None or self._axes[0].figure is not self._figure:
+            self._figure.clear()
+            self._axes = tuple(self._figure.add_subplot(2, 2, i + 1) for i in range(4))
         else:
-            return False
+            for axes in self._axes:
+                axes.clear()
+        return self._axes
 
     def show_menu(self, pos: QtCore.QPoint):
         self.edit_figure_action.setEnabled(self._last_result is not None and not self.animated)
@@ -143,16 +120,17 @@ class UDMResultChart(BaseChart):
     def show_chart(self, result: UDMResult):
         assert isinstance(result, UDMResult)
         self._last_result = result
-        self._figure.clear()
         if self._animation is not None:
             self._animation._stop()
             self._animation = None
+        sample_axes, loss_axes, component_axes, proportion_axes = self.get_axes()
         interval = max(1, result.n_samples // self.N_DISPLAY_SAMPLES)
         iteration_indexes = np.linspace(1, len(result.loss_series("total")), len(result.loss_series("total")))
         classes = self.transfer(result.dataset.classes_phi)
-        sample_axes = self._figure.add_subplot(2, 2, 1)
-        for sample in result.dataset[::interval]:
-            sample_axes.plot(classes, sample.distribution, c=normal_color(), alpha=0.2)
+        # draw the distributions as one collection instead of a line per sample
+        distributions = result.dataset.distributions[::interval]
+        segments = np.stack([np.broadcast_to(classes, distributions.shape), distributions], axis=2)
+        sample_axes.add_collection(LineCollection(segments, colors=normal_color(), alpha=0.2))
         if self.xlog:
             sample_axes.set_xscale("log")
         sample_axes.set_xlim(classes[0], classes[-1])
@@ -160,7 +138,6 @@ class UDMResultChart(BaseChart):
         sample_axes.set_xlabel(self.xlabel)
         sample_axes.set_ylabel(self.ylabel)
         sample_axes.set_title("GSDs")
-        loss_axes = self._figure.add_subplot(2, 2, 2)
         loss_axes.plot(iteration_indexes, result.loss_series("total"), color=plt.get_cmap()(0), label="Sum")
         loss_axes.plot(iteration_indexes, result.loss_series("distribution"), color=plt.get_cmap()(1), label="GSDs")
         loss_axes.plot(iteration_indexes, result.loss_series("component"), color=plt.get_cmap()(2), label="Components")
@@ -169,7 +146,6 @@ class UDMResultChart(BaseChart):
         loss_axes.set_ylabel("Loss")
         loss_axes.set_title("Loss variation")
         loss_axes.legend(loc="upper right")
-        component_axes = self._figure.add_subplot(2, 2, 3)
         mean, lower, upper = summarize(result.components, q=0.01)
         for i in range(result.n_components):
             component_axes.plot(classes, mean[i], c=plt.get_cmap()(i), zorder=20 + i)
@@ -182,7 +158,6 @@ class UDMResultChart(BaseChart):
         component_axes.set_xlabel(self.xlabel)
         component_axes.set_ylabel(self.ylabel)
         component_axes.set_title("Components")
-        proportion_axes = self._figure.add_subplot(2, 2, 4)
         image = get_image_by_proportions(result.proportions[:, 0, :], resolution=100)
         proportion_axes.imshow(image, plt.get_cmap(), aspect="auto", vmin=0, vmax=9,
                                extent=(0.0, result.n_samples, 100, 0.0), interpolation="none")
@@ -192,25 +167,25 @@ class UDMResultChart(BaseChart):
         proportion_axes.set_xlabel("Sample index")
         proportion_axes.set_ylabel("Proportion")
         proportion_axes.set_title("Proportions")
-        self._figure.tight_layout()
         self._canvas.draw()
 
     def show_animation(self, result: UDMResult):
         assert isinstance(result, UDMResult)
         assert result.n_iterations > 1
         self._last_result = result
-        self._figure.clear()
         if self._animation is not None:
             self._animation._stop()
             self._animation = None
+        sample_axes, loss_axes, component_axes, proportion_axes = self.get_axes()
         interval = max(1, result.n_samples // self.N_DISPLAY_SAMPLES)
         iteration_indexes = np.linspace(1, len(result.loss_series("total")), len(result.loss_series("total")))
         classes = self.transfer(result.dataset.classes_phi)
         losses = np.array([series for key, series in result._loss_series.items()])
         min_distance, max_distance = np.min(losses), np.max(losses)
-        sample_axes = self._figure.add_subplot(2, 2, 1)
-        for sample in result.dataset[::interval]:
-            sample_axes.plot(classes, sample.distribution, c=normal_color(), alpha=0.2)
+        # draw the distributions as one collection instead of a line per sample
+        distributions = result.dataset.distributions[::interval]
+        segments = np.stack([np.broadcast_to(classes, distributions.shape), distributions], axis=2)
+        sample_axes.add_collection(LineCollection(segments, colors=normal_color(), alpha=0.2))
         if self.xlog:
             sample_axes.set_xscale("log")
         sample_axes.set_xlim(classes[0], classes[-1])
@@ -218,7 +193,6 @@ class UDMResultChart(BaseChart):
         sample_axes.set_xlabel(self.xlabel)
         sample_axes.set_ylabel(self.ylabel)
         sample_axes.set_title("GSDs")
-        loss_axes = self._figure.add_subplot(2, 2, 2)
         loss_axes.plot(iteration_indexes, result.loss_series("total"), color=plt.get_cmap()(0), label="Sum")
         loss_axes.plot(iteration_indexes, result.loss_series("distribution"), color=plt.get_cmap()(1), label="GSDs")
         loss_axes.plot(iteration_indexes, result.loss_series("component"), color=plt.get_cmap()(2), label="Components")
@@ -227,7 +201,14 @@ class UDMResultChart(BaseChart):
         loss_axes.set_ylabel("Loss")
         loss_axes.set_title("Loss variation")
         loss_axes.legend(loc="upper right")
-        component_axes = self._figure.add_subplot(2, 2, 3)
+        # the frames of history only differ in their states, summarize them before the animation starts
+        # each frame holds a 100-pixel-high image of all samples, so large datasets have fewer frames
+        n_frames = min(self.N_MAX_FRAMES, max(2, self.N_MAX_IMAGE_BYTES // (100 * result.n_samples)))
+        frame_indexes = np.unique(np.linspace(0, result.n_iterations - 1, n_frames).astype(int))
+        buffer = np.empty(result.components.shape, dtype=np.float32)
+        frame_states = [(get_image_by_proportions(current.proportions[:, 0, :], resolution=100),
+                         summarize(current.components, q=0.01, buffer=buffer))
+                        for current in result.get_history(frame_indexes)]
         mean, lower, upper = summarize(result.components, q=0.01)
         if self.xlog:
             component_axes.set_xscale("log")
@@ -236,7 +217,6 @@ class UDMResultChart(BaseChart):
         component_axes.set_xlabel(self.xlabel)
         component_axes.set_ylabel(self.ylabel)
         component_axes.set_title("Components")
-        proportion_axes = self._figure.add_subplot(2, 2, 4)
         proportion_axes.set_xlim(0, result.n_samples)
         proportion_axes.set_ylim(0, 100)
         proportion_axes.set_yticks([0, 20, 40, 60, 80, 100], ["0.0", "0.2", "0.4", "0.6", "0.8", "1.0"])
@@ -244,54 +224,47 @@ class UDMResultChart(BaseChart):
         proportion_axes.set_ylabel("Proportion [%]")
         proportion_axes.set_title("Proportions")
 
-        iteration_line: Optional[plt.Line2D] = None
+        # FuncAnimation is preferred to ArtistAnimation, since pre-building the artists (curves, shadows and images)
+        # of hundreds of frames is slow and costs much more memory than the data of the frames
+        # the animated artists are only built once, and every frame just updates their data
+        iteration_line = loss_axes.plot([1, 1], [min_distance, max_distance], c=normal_color())[0]
         component_curves: List[plt.Line2D] = []
         component_shadows: List[plt.Artist] = []
-        proportion_image: Optional[plt.Artist] = None
+        for i in range(result.n_components):
+            curve = component_axes.plot(classes, mean[i], c=plt.get_cmap()(i), zorder=20 + i)[0]
+            shadow = component_axes.fill_between(classes, lower[i], upper[i], lw=0.02,
+                                                 color=plt.get_cmap()(i), alpha=0.2, zorder=10 + i)
+            component_curves.append(curve)
+            component_shadows.append(shadow)
+        image = get_image_by_proportions(result.proportions[:, 0, :], resolution=100)
+        proportion_image = proportion_axes.imshow(
+            image, plt.get_cmap(), aspect="auto", vmin=0, vmax=9,
+            extent=(0.0, result.n_samples, 100, 0.0), interpolation="none")
+        animated_artists = (iteration_line, proportion_image, *component_curves, *component_shadows)
+        # the x coordinates of the shadows never change, only their y coordinates need to be updated
+        n_classes = len(classes)
+        shadow_verts = np.empty((result.n_components, n_classes * 2, 2))
+        shadow_verts[:, :n_classes, 0] = classes
+        shadow_verts[:, n_classes:, 0] = classes[::-1]
 
         def init():
-            nonlocal iteration_line
-            nonlocal component_curves
-            nonlocal component_shadows
-            nonlocal proportion_image
-            if iteration_line is None:
-                iteration_line = loss_axes.plot([1, 1], [min_distance, max_distance], c=normal_color())[0]
-                mean, lower, upper = summarize(result.components, q=0.01)
-                for i in range(result.n_components):
-                    curve = component_axes.plot(classes, mean[i], c=plt.get_cmap()(i), zorder=20 + i)[0]
-                    shadow = component_axes.fill_between(classes, lower[i], upper[i], lw=0.02,
-                                                         color=plt.get_cmap()(i), alpha=0.2, zorder=10 + i)
-                    component_curves.append(curve)
-                    component_shadows.append(shadow)
-                image = get_image_by_proportions(result.proportions[:, 0, :], resolution=100)
-                proportion_image = proportion_axes.imshow(
-                    image, plt.get_cmap(), aspect="auto", vmin=0, vmax=9,
-                    extent=(0.0, result.n_samples, 100, 0.0), interpolation="none")
-            return iteration_line, proportion_image, *component_curves, *component_shadows
+            return animated_artists
 
-        def animate(args: Tuple[int, UDMResult]):
-            nonlocal iteration_line
-            nonlocal component_curves
-            nonlocal component_shadows
-            nonlocal proportion_image
-            iteration, current = args
-            mean, lower, upper = summarize(current.components, q=0.01)
+        def animate(args: Tuple[int, Tuple[ndarray, Tuple[ndarray, ndarray, ndarray]]]):
+            iteration, (image, (mean, lower, upper)) = args
             iteration_line.set_xdata([iteration, iteration])
-            for i in range(current.n_components):
+            for i in range(result.n_components):
                 component_curves[i].set_ydata(mean[i])
-                verts_lower = np.concatenate([np.expand_dims(classes, axis=1),
-                                              np.expand_dims(lower[i], axis=1)], axis=1)
-                verts_upper = np.concatenate([np.expand_dims(classes[::-1], axis=1),
-                                              np.expand_dims(upper[i][::-1], axis=1)], axis=1)
-                verts = np.concatenate([verts_lower, verts_upper], axis=0)
-                component_shadows[i].set_verts([verts])
-            image = get_image_by_proportions(current.proportions[:, 0, :], resolution=100)
+                shadow_verts[i, :n_classes, 1] = lower[i]
+                shadow_verts[i, n_classes:, 1] = upper[i][::-1]
+                component_shadows[i].set_verts([shadow_verts[i]])
             proportion_image.set_data(image)
-            return iteration_line, proportion_image, *component_curves, *component_shadows
+            return animated_artists
 
-        self._animation = FuncAnimation(self._figure, animate, init_func=init, frames=enumerate(result.history),
+        self._animation = FuncAnimation(self._figure, animate, init_func=init,
+                                        frames=zip(frame_indexes, frame_states),
                                         interval=self.animation_interval, blit=True, repeat=self.repeat_animation,
-                                        repeat_delay=5.0, save_count=result.n_iterations)
+                                        repeat_delay=5.0, save_count=len(frame_indexes))
 
     def show_result(self, result: UDMResult):
         if self.animated and result.n_iterations > 1:
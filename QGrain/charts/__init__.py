@@ -1,12 +1,28 @@
 import logging
 import os
+import queue
+import threading
+from io import BytesIO
 from typing import *
 
 import matplotlib.pyplot as plt
+import numpy as np
 from PySide6 import QtCore, QtGui, QtWidgets
-from matplotlib.animation import FFMpegWriter, FuncAnimation, ImageMagickWriter
+from matplotlib.animation import FFMpegWriter, FuncAnimation, PillowWriter
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.backends.backend_qtagg import NavigationToolbar2QT as NavigationToolbar
+from numpy import ndarray
+
+from ..statistics import to_microns
+
+try:
+    from matplotlib.animation import _validate_grabframe_kwargs
+except ImportError:
+    # the older versions of matplotlib check the keyword arguments inside `grab_frame`
+    def _validate_grabframe_kwargs(savefig_kwargs):
+        for k in ("dpi", "bbox_inches", "format"):
+            if k in savefig_kwargs:
+                raise TypeError(f"grab_frame got an unexpected keyword argument {k!r}")
 
 
 def normal_color():
@@ -55,12 +71,65 @@ def setup_matplotlib():
     synchronize_theme()
 
 
+class PipelinedFFMpegWriter(FFMpegWriter):
+    # the frames are rendered in the main thread (matplotlib is not thread-safe),
+    # and piped to ffmpeg by a background thread, so that rendering overlaps the encoding
+    def __init__(self, *args, max_queued_frames=8, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._frames = queue.Queue(maxsize=max_queued_frames)
+        self._pipe_thread: Optional[threading.Thread] = None
+        self._pipe_error: Optional[BaseException] = None
+
+    def _pipe_frames(self):
+        while True:
+            frame = self._frames.get()
+            if frame is None:
+                break
+            # keep draining the queue after an error, or the producer may be blocked forever
+            if self._pipe_error is None:
+                try:
+                    self._proc.stdin.write(frame)
+                except BaseException as e:
+                    self._pipe_error = e
+
+    def setup(self, fig, outfile, dpi=None):
+        super().setup(fig, outfile, dpi=dpi)
+        self._pipe_error = None
+        self._pipe_thread = threading.Thread(target=self._pipe_frames, daemon=True)
+        self._pipe_thread.start()
+
+    def grab_frame(self, **savefig_kwargs):
+        _validate_grabframe_kwargs(savefig_kwargs)
+        if self._pipe_error is not None:
+            raise self._pipe_error
+        self.fig.set_size_inches(self._w, self._h)
+        buffer = BytesIO()
+        self.fig.savefig(buffer, format=self.frame_format, dpi=self.dpi, **savefig_kwargs)
+        self._frames.put(buffer.getbuffer())
+
+    def finish(self):
+        if self._pipe_thread is not None:
+            self._frames.put(None)
+            self._pipe_thread.join()
+            self._pipe_thread = None
+        super().finish()
+        if self._pipe_error is not None:
+            raise self._pipe_error
+
+
 class BaseChart(QtWidgets.QWidget):
     logger = logging.getLogger("QGrain.charts")
+    # the transfer function of the classes (in phi), the label and the log flag of the x axis of each scale,
+    # they are looked up by the checked scale, instead of branching on it every time they are used
+    SCALES: Dict[str, Tuple[Callable[[Union[float, ndarray]], Union[float, ndarray]], str, bool]] = {
+        "log-linear": (to_microns, "Grain size (microns)", True),
+        "log": (lambda classes_phi: np.log(to_microns(classes_phi)), "Ln(grain size in microns)", False),
+        "phi": (lambda classes_phi: classes_phi, "Grain size (phi)", False),
+        "linear": (to_microns, "Grain size (microns)", False)}
 
     def __init__(self, parent=None, figsize=(4, 3)):
         super().__init__(parent=parent)
-        self._figure: plt.Figure = plt.figure(figsize=figsize)
+        self._figure: plt.Figure = plt.figure(figsize=figsize, layout="constrained")
         self._canvas = FigureCanvas(self._figure)
         self._toolbar = NavigationToolbar(self._canvas, self)
         self.main_layout = QtWidgets.QGridLayout(self)
@@ -77,6 +146,48 @@ class BaseChart(QtWidgets.QWidget):
         self.normal_msg = QtWidgets.QMessageBox(parent=self)
         self._animation: Optional[FuncAnimation] = None
 
+    def setup_scale_menu(self):
+        # the charts with the x axis of grain size call it to let the users choose the scale
+        self.scale_menu = QtWidgets.QMenu(self.tr("Scale"))
+        self.menu.insertMenu(self.edit_figure_action, self.scale_menu)
+        self.scale_group = QtGui.QActionGroup(self.scale_menu)
+        self.scale_group.setExclusive(True)
+        self.scale_actions: List[QtGui.QAction] = []
+        for key, name in self.supported_scales:
+            scale_action = self.scale_group.addAction(name)
+            scale_action.setCheckable(True)
+            scale_action.setData(key)
+            self.scale_menu.addAction(scale_action)
+            self.scale_actions.append(scale_action)
+        self.scale_actions[0].setChecked(True)
+        # cache the checked scale, instead of scanning the actions every time it is used
+        self._scale = self.supported_scales[0][0]
+        self.scale_group.triggered.connect(self.on_scale_changed)
+
+    @property
+    def supported_scales(self) -> Sequence[Tuple[str, str]]:
+        return ()
+
+    @property
+    def scale(self) -> str:
+        return self._scale
+
+    @property
+    def transfer(self) -> Callable[[Union[float, ndarray]], Union[float, ndarray]]:
+        return self.SCALES[self._scale][0]
+
+    @property
+    def xlabel(self) -> str:
+        return self.SCALES[self._scale][1]
+
+    @property
+    def xlog(self) -> bool:
+        return self.SCALES[self._scale][2]
+
+    def on_scale_changed(self, action: QtGui.QAction):
+        self._scale = action.data()
+        self.update_chart()
+
     def show_message(self, title: str, message: str):
         self.normal_msg.setWindowTitle(title)
         self.normal_msg.setText(message)
@@ -94,6 +205,12 @@ class BaseChart(QtWidgets.QWidget):
     def show_menu(self, pos: QtCore.QPoint):
         self.menu.popup(QtGui.QCursor.pos())
 
+    def to_image(self) -> QtGui.QImage:
+        # copy the figure rendered by the last drawing, this widget does not need to be repainted
+        buffer = self._canvas.buffer_rgba()
+        height, width = buffer.shape[:2]
+        return QtGui.QImage(buffer, width, height, QtGui.QImage.Format_RGBA8888).copy()
+
     def update_chart(self):
         pass
 
@@ -132,15 +249,17 @@ class BaseChart(QtWidgets.QWidget):
                     with open(filename, "w") as f:
                         f.write(html)
             elif filename[-4:] == ".gif":
-                if not ImageMagickWriter.isAvailable():
-                    self.show_error(self.tr("ImageMagick is not installed."))
-                else:
-                    self._animation.save(filename, writer="imagemagick", fps=10, progress_callback=callback)
+                # encode the frames in process by Pillow, it does not rely on ImageMagick
+                self._animation.save(filename, writer=PillowWriter(fps=10), progress_callback=callback)
             elif filename[-4:] == ".mp4":
                 if not FFMpegWriter.isAvailable():
                     self.show_error(self.tr("FFMpeg is not installed."))
                 else:
-                    self._animation.save(filename, writer="ffmpeg", fps=10, progress_callback=callback)
+                    # the frames are piped to ffmpeg as raw RGBA, and encoded with a constant quality,
+                    # one encoder thread is enough for such small frames, and it leaves the CPU for rendering
+                    writer = PipelinedFFMpegWriter(fps=10, codec="libx264", extra_args=[
+                        "-pix_fmt", "yuv420p", "-preset", "veryfast", "-crf", "23", "-threads", "1"])
+                    self._animation.save(filename, writer=writer, progress_callback=callback)
         except StopIteration:
             self.logger.info("The saving task was canceled.")
         finally:
@@ -155,7 +274,7 @@ class BaseChart(QtWidgets.QWidget):
             self._figure.clear()
             self.main_layout.removeWidget(self._canvas)
             self._canvas.setVisible(False)
-            self._figure = plt.figure(figsize=self._figure.get_size_inches())
+            self._figure = plt.figure(figsize=self._figure.get_size_inches(), layout="constrained")
             self._canvas = FigureCanvas(self._figure)
             self._toolbar = NavigationToolbar(self._canvas, self)
             self.main_layout.addWidget(self._canvas, 0, 0)
@@ -61,7 +61,6 @@ class DiagramChart(BaseChart):
             self.axes.text(x, y, text, color=normal_color(), label="_", **kwargs)
 
         self.plot_legend()
-        self._figure.tight_layout()
 
     def convert_samples(self, samples: List[Sample]) -> Tuple[Sequence[float], Sequence[float]]:
         pass
@@ -4,18 +4,58 @@ __all__ = ["Normal", "SkewNormal", "Weibull", "GeneralWeibull",
 import typing
 
 import numpy as np
-from scipy.special import softmax
-from scipy.stats import norm, skewnorm, weibull_min
+from scipy.special import gamma, ndtr, softmax
+from scipy.stats import norm, skewnorm
 
 from .models import DistributionType
 
 _INFINITESIMAL = 1e-8
+_NORMAL_PDF_C = np.sqrt(2*np.pi)
 
 
 def relu(x):
     return np.maximum(x, _INFINITESIMAL)
 
 
+# the same formulas as `scipy.stats`, without the overhead of checking and broadcasting the arguments,
+# they are evaluated thousands of times while fitting a sample
+def normal_pdf(x, loc, scale):
+    x = (x - loc) / scale
+    return np.exp(-x**2/2.0) / _NORMAL_PDF_C / scale
+
+
+def skew_normal_pdf(x, shape, loc, scale):
+    x = (x - loc) / scale
+    return 2.0 * (np.exp(-x**2/2.0) / _NORMAL_PDF_C) * ndtr(shape*x) / scale
+
+
+def weibull_pdf(x, shape, loc, scale):
+    x = (x - loc) / scale
+    # the negative x (masked below) may overflow `exp` if the shape is a whole number
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        # x**(c-1) is derived from x**c, only one power is evaluated
+        u = np.power(x, shape)
+        pdf = shape * u / x * np.exp(-u)
+        # u/x is 0/0 at the origin, use the original formula there
+        if np.any(x == 0.0):
+            pdf = np.where(x == 0.0, shape * np.power(x, shape - 1.0), pdf)
+    return np.where(x < 0.0, 0.0, pdf) / scale
+
+
+def weibull_moments(shape, loc, scale):
+    # the raw moments of Weibull distribution are gamma(1+n/c),
+    # the central ones are derived by the same steps as `weibull_min.stats`
+    mu, mu2p, mu3p, mu4p = [gamma(1.0 + n*1.0/shape) for n in range(1, 5)]
+    with np.errstate(invalid="ignore"):
+        mu2 = np.where(~np.isinf(mu), mu2p - mu**2, np.inf)
+        mu3 = (-mu*mu - 3*mu2)*mu + mu3p
+        g1 = mu3 / np.power(mu2, 1.5)
+        mu3 = g1 * np.power(mu2, 1.5)
+        mu4 = ((-mu**2 - 6*mu2) * mu - 4*mu3)*mu + mu4p
+        g2 = mu4 / mu2**2.0 - 3.0
+    return mu * scale + loc, mu2 * scale * scale, g1, g2
+
+
 class Normal:
     NAME = "Normal"
     N_PARAMETERS = 2
@@ -24,14 +64,16 @@ class Normal:
                         (_INFINITESIMAL, None))
 
     @staticmethod
-    def interpret(parameters: np.ndarray, classes: np.ndarray, interval: float):
+    def interpret(parameters: np.ndarray, classes: np.ndarray, interval: float, moments: bool = True):
         n_samples, n_components, n_classes = classes.shape
         assert parameters.ndim == 3
         assert parameters.shape == (n_samples, Normal.N_PARAMETERS + 1, n_components)
-        locations = np.expand_dims(parameters[:, 0, :], 2).repeat(n_classes, 2)
-        scales = np.expand_dims(relu(parameters[:, 1, :]), 2).repeat(n_classes, 2)
+        locations = np.expand_dims(parameters[:, 0, :], 2)
+        scales = np.expand_dims(relu(parameters[:, 1, :]), 2)
         proportions = np.expand_dims(softmax(parameters[:, 2, :], axis=1), 1)
-        components = norm.pdf(classes, loc=locations, scale=scales) * interval
+        components = normal_pdf(classes, locations, scales) * interval
+        if not moments:
+            return proportions, components, None
         m, v, s, k = norm.stats(loc=locations[:, :, 0], scale=scales[:, :, 0], moments="mvsk")
         return proportions, components, (m, np.sqrt(v), s, k)
 
@@ -53,15 +95,17 @@ class SkewNormal:
                         (_INFINITESIMAL, None))
 
     @staticmethod
-    def interpret(parameters: np.ndarray, classes: np.ndarray, interval: float):
+    def interpret(parameters: np.ndarray, classes: np.ndarray, interval: float, moments: bool = True):
         n_samples, n_components, n_classes = classes.shape
         assert parameters.ndim == 3
         assert parameters.shape == (n_samples, SkewNormal.N_PARAMETERS + 1, n_components)
-        shapes = np.expand_dims(parameters[:, 0, :], 2).repeat(n_classes, 2)
-        locations = np.expand_dims(parameters[:, 1, :], 2).repeat(n_classes, 2)
-        scales = np.expand_dims(relu(parameters[:, 2, :]), 2).repeat(n_classes, 2)
+        shapes = np.expand_dims(parameters[:, 0, :], 2)
+        locations = np.expand_dims(parameters[:, 1, :], 2)
+        scales = np.expand_dims(relu(parameters[:, 2, :]), 2)
         proportions = np.expand_dims(softmax(parameters[:, 3, :], axis=1), 1)
-        components = skewnorm.pdf(classes, shapes, loc=locations, scale=scales) * interval
+        components = skew_normal_pdf(classes, shapes, locations, scales) * interval
+        if not moments:
+            return proportions, components, None
         m, v, s, k = skewnorm.stats(shapes[:, :, 0], loc=locations[:, :, 0], scale=scales[:, :, 0], moments="mvsk")
         return proportions, components, (m, np.sqrt(v), s, k)
 
@@ -83,15 +127,17 @@ class Weibull:
                         (_INFINITESIMAL, None))
 
     @staticmethod
-    def interpret(parameters: np.ndarray, classes: np.ndarray, interval: float):
+    def interpret(parameters: np.ndarray, classes: np.ndarray, interval: float, moments: bool = True):
         n_samples, n_components, n_classes = classes.shape
         assert parameters.ndim == 3
         assert parameters.shape == (n_samples, Weibull.N_PARAMETERS + 1, n_components)
-        shapes = np.expand_dims(relu(parameters[:, 0, :]), 2).repeat(n_classes, 2)
-        scales = np.expand_dims(relu(parameters[:, 1, :]), 2).repeat(n_classes, 2)
+        shapes = np.expand_dims(relu(parameters[:, 0, :]), 2)
+        scales = np.expand_dims(relu(parameters[:, 1, :]), 2)
         proportions = np.expand_dims(softmax(parameters[:, 2, :], axis=1), 1)
-        components = weibull_min.pdf(classes, shapes, scale=scales) * interval
-        m, v, s, k = weibull_min.stats(shapes[:, :, 0], scale=scales[:, :, 0], moments="mvsk")
+        components = weibull_pdf(classes, shapes, 0.0, scales) * interval
+        if not moments:
+            return proportions, components, None
+        m, v, s, k = weibull_moments(shapes[:, :, 0], 0.0, scales[:, :, 0])
         return proportions, components, (m, np.sqrt(v), s, k)
 
     @staticmethod
@@ -112,16 +158,18 @@ class GeneralWeibull:
                         (_INFINITESIMAL, None))
 
     @staticmethod
-    def interpret(parameters: np.ndarray, classes: np.ndarray, interval: float):
+    def interpret(parameters: np.ndarray, classes: np.ndarray, interval: float, moments: bool = True):
         n_samples, n_components, n_classes = classes.shape
         assert parameters.ndim == 3
         assert parameters.shape == (n_samples, GeneralWeibull.N_PARAMETERS + 1, n_components)
-        shapes = np.expand_dims(relu(parameters[:, 0, :]), 2).repeat(n_classes, 2)
-        locations = np.expand_dims(parameters[:, 1, :], 2).repeat(n_classes, 2)
-        scales = np.expand_dims(relu(parameters[:, 2, :]), 2).repeat(n_classes, 2)
+        shapes = np.expand_dims(relu(parameters[:, 0, :]), 2)
+        locations = np.expand_dims(parameters[:, 1, :], 2)
+        scales = np.expand_dims(relu(parameters[:, 2, :]), 2)
         proportions = np.expand_dims(softmax(parameters[:, 3, :], axis=1), 1)
-        components = weibull_min.pdf(classes, shapes, loc=locations, scale=scales) * interval
-        m, v, s, k = weibull_min.stats(shapes[:, :, 0], loc=locations[:, :, 0], scale=scales[:, :, 0], moments="mvsk")
+        components = weibull_pdf(classes, shapes, locations, scales) * interval
+        if not moments:
+            return proportions, components, None
+        m, v, s, k = weibull_moments(shapes[:, :, 0], locations[:, :, 0], scales[:, :, 0])
         return proportions, components, (m, np.sqrt(v), s, k)
 
     @staticmethod
@@ -154,10 +202,8 @@ def get_sorted_indexes(
         interval: float) -> typing.Tuple[int]:
     distribution_class = get_distribution(distribution_type)
     proportions, components, (m, std, s, k) = distribution_class.interpret(parameters, classes, interval)
-    mean_values = [(i, mean) for i, mean in enumerate(np.median(m, axis=0))]
-    # sort them by mean size
-    mean_values.sort(key=lambda x: x[1], reverse=True)
-    sorted_indexes = tuple([i for i, _ in mean_values])
+    # sort them by mean size (descending in phi), the stable sort keeps the order of ties
+    sorted_indexes = tuple(np.argsort(-np.median(m, axis=0), kind="stable").tolist())
     return sorted_indexes
 
 
@@ -167,7 +213,4 @@ def sort_parameters(
         classes: np.ndarray,
         interval: float) -> np.ndarray:
     sorted_indexes = get_sorted_indexes(distribution_type, parameters, classes, interval)
-    sorted_parameters = np.zeros_like(parameters)
-    for i, j in enumerate(sorted_indexes):
-        sorted_parameters[:, :, i] = parameters[:, :, j]
-    return sorted_parameters
+    return parameters[:, :, list(sorted_indexes)]
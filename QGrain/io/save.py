@@ -1,21 +1,33 @@
+import datetime
 import logging
+import multiprocessing
+import pickle
 import string
 from typing import *
-from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from copy import copy
+from functools import lru_cache
+from operator import itemgetter
+from zipfile import ZipFile, ZIP_DEFLATED
 
 import numpy as np
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Alignment, Font, NamedStyle, PatternFill
-from openpyxl.worksheet.worksheet import Worksheet
-from sklearn.cluster import KMeans
+from openpyxl.worksheet._write_only import WriteOnlyWorksheet
+from openpyxl.worksheet.cell_range import CellRange
+from openpyxl.worksheet.dimensions import ColumnDimension
+from openpyxl.writer.excel import ExcelWriter
 from sklearn.decomposition import PCA
 
 from .. import QGRAIN_VERSION
-from ..models import DistributionType, Dataset, Sample, ArtificialDataset, SSUResult, EMMAResult , UDMResult
-from ..statistics import _all_scales, all_statistics, logarithmic
+from ..models import DistributionType, Dataset, ArtificialDataset, SSUResult, EMMAResult , UDMResult
+from ..statistics import _all_scales, all_statistics_batch
 from ..distributions import get_distribution
 
 
+# the same columns are converted again and again for every sheet
+@lru_cache(maxsize=None)
 def column_to_char(column_index: int):
     column = column_index + 1
     column_str = str()
@@ -108,10 +120,78 @@ def prepare_styles(wb: openpyxl.Workbook):
 SMALL_WIDTH = 12
 MEDIAN_WIDTH = 24
 LARGE_WIDTH = 48
+# the styles of even and odd rows
+ROW_STYLES = ("normal_dark", "normal_light")
+# the frequencies less than it are left blank if the distributions are written sparsely
+SPARSE_EPSILON = 1e-12
+
+
+def _append_row(ws: WriteOnlyWorksheet, values: Iterable[Any], style: str = "normal_light"):
+    # the write-only worksheet only supports appending rows, the missing (None) cells are left blank
+    # resolve the named style once for the whole row, assigning it by name (or by the NamedStyle object)
+    # to each cell looks it up in the named style list of workbook again and again
+    # the cells of a row are never restyled after appending, so they can share one copy of the style array
+    style_array = copy(ws.parent._named_styles[style].as_tuple())
+    # it's called for every cell, bind the names to locals
+    new_cell = WriteOnlyCell
+    row = []
+    append = row.append
+    for value in values:
+        if value is None:
+            append(None)
+        else:
+            cell = new_cell(ws, value=value)
+            cell._style = style_array
+            append(cell)
+    ws.append(row)
+
+
+def _set_column_widths(ws: WriteOnlyWorksheet, start_column: int, end_column: int, width: float):
+    # the column indexes start from 0 like `column_to_char`, the columns [start_column, end_column)
+    # share one dimension, so that it is written as a single <col> element
+    if end_column <= start_column:
+        return
+    letter = column_to_char(start_column)
+    ws.column_dimensions[letter] = ColumnDimension(ws, index=letter, min=start_column+1, max=end_column, width=width)
+
+
+def _merge_cells(ws: WriteOnlyWorksheet, start_row: int, start_column: int, end_row: int, end_column: int):
+    ws.merged_cells.add(CellRange(min_col=start_column, min_row=start_row, max_col=end_column, max_row=end_row))
+
+
+# the workbooks are saved one by one in this thread, if they are saved asynchronously
+_SAVE_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="QGrainSaver")
 
 
-def _write_readme_sheet(ws: Worksheet, text: str):
-    ws.title = "README"
+def _save_workbook(wb: openpyxl.Workbook, filename: str, logger: logging.Logger, message: str,
+                   compress_level: int = 6, async_save: bool = False) -> Optional[Future]:
+    # it's the same as `wb.save`, but the compression level of the zip archive can be lower (faster) than the default
+    def save():
+        # a large buffer reduces the small writes of the zip archive
+        with open(filename, "wb", buffering=1 << 20) as f:
+            archive = ZipFile(f, "w", ZIP_DEFLATED, allowZip64=True, compresslevel=compress_level)
+            wb.properties.modified = datetime.datetime.now(tz=datetime.timezone.utc).replace(tzinfo=None)
+            writer = ExcelWriter(wb, archive)
+            writer.save()
+        wb.close()
+        logger.info(message)
+
+    # return a future to let the caller go on while the file is being written
+    if async_save:
+        return _SAVE_EXECUTOR.submit(save)
+    save()
+    return None
+
+
+def _write_readme_sheet(ws: WriteOnlyWorksheet, text: str, sparse: bool = False, include_gsds: bool = True):
+    if not include_gsds:
+        text += """
+        Note: The GSDs sheet is not included, please refer to the file of the dataset that was saved separately.
+        """
+    if sparse:
+        text += f"""
+        Note: The near-zero (< {SPARSE_EPSILON}) frequencies of distributions are left blank to reduce the file size.
+        """
     full_text = \
         """
         This Excel file was generated by QGrain ({0}).
@@ -124,33 +204,27 @@ def _write_readme_sheet(ws: Worksheet, text: str):
 
         """.format(QGRAIN_VERSION, text)
     lines_of_description = full_text.split("\n")
-    for row, line in enumerate(lines_of_description):
-        cell = ws.cell(row+1, 1, value=line)
-        cell.style = "description"
     ws.column_dimensions[column_to_char(0)].width = 200
+    for line in lines_of_description:
+        _append_row(ws, [line], style="description")
+
 
+def _sparse(values: List[float]) -> List[Optional[float]]:
+    # the near-zero values are replaced by None, and then the cells are left blank
+    return [None if abs(value) < SPARSE_EPSILON else value for value in values]
 
-def _write_dataset_sheet(ws: Worksheet, dataset: Dataset, progress_callback: Callable[[float], None] = None):
-    def write(r, c, v, s="normal_light"):
-        cell = ws.cell(r+1, c+1, value=v)
-        cell.style = s
 
-    ws.title = "GSDs"
-    write(0, 0, "Sample Name", s="header")
+def _write_dataset_sheet(ws: WriteOnlyWorksheet, dataset: Dataset,
+                         progress_callback: Callable[[float], None] = None, sparse: bool = False):
     ws.column_dimensions[column_to_char(0)].width = 24
-    for col, value in enumerate(dataset.classes, 1):
-        write(0, col, value, s="header")
-        ws.column_dimensions[column_to_char(col)].width = 10
+    _set_column_widths(ws, 1, len(dataset.classes)+1, 10)
+    _append_row(ws, ["Sample Name", *dataset.classes.tolist()], style="header")
 
     for i_sample, sample in enumerate(dataset):
         row = i_sample + 1
-        if row % 2 == 0:
-            style = "normal_dark"
-        else:
-            style = "normal_light"
-        write(row, 0, sample.name, s=style)
-        for col, value in enumerate(sample.distribution, 1):
-            write(row, col, value, s=style)
+        style = ROW_STYLES[row % 2]
+        distribution = sample.distribution.tolist()
+        _append_row(ws, [sample.name, *(_sparse(distribution) if sparse else distribution)], style=style)
         if progress_callback is not None:
             progress = i_sample / len(dataset)
             progress_callback(progress)
@@ -158,13 +232,14 @@ def _write_dataset_sheet(ws: Worksheet, dataset: Dataset, progress_callback: Cal
 
 def save_artificial_dataset(dataset: ArtificialDataset, filename: str,
                             progress_callback: Callable[[float], None] = None,
-                            logger: logging.Logger = None):
+                            logger: logging.Logger = None, compress_level: int = 6,
+                            async_save: bool = False, sparse: bool = False) -> Optional[Future]:
     if logger is None:
         logger = logging.getLogger("QGrain")
     else:
         assert isinstance(logger, logging.Logger)
     logger.debug("Start to save the artificial dataset.")
-    wb = openpyxl.Workbook()
+    wb = openpyxl.Workbook(write_only=True)
     prepare_styles(wb)
     logger.debug("Creating the README sheet.")
     readme_text = \
@@ -182,113 +257,104 @@ def save_artificial_dataset(dataset: ArtificialDataset, filename: str,
             Noise Decimals: {dataset.noise}
             Number of Samples: {len(dataset)}
         """
-    _write_readme_sheet(wb.active, readme_text)
-
-    def write(r, c, v, s="normal_light"):
-        cell = ws.cell(r + 1, c + 1, value=v)
-        cell.style = s
+    _write_readme_sheet(wb.create_sheet("README"), readme_text, sparse=sparse)
 
     distribution_class = get_distribution(dataset.distribution_type)
     parameter_names = list(distribution_class.PARAMETER_NAMES) + ["Weight"]
 
     logger.debug("Creating the GSDs sheet.")
     ws = wb.create_sheet("GSDs")
-    write(0, 0, "Sample Name", s="header")
     ws.column_dimensions[column_to_char(0)].width = 24
-    for col, value in enumerate(dataset.classes, 1):
-        write(0, col, value, s="header")
-        ws.column_dimensions[column_to_char(col)].width = 10
+    _set_column_widths(ws, 1, len(dataset.classes)+1, 10)
+    _append_row(ws, ["Sample Name", *dataset.classes.tolist()], style="header")
     for row, sample in enumerate(dataset, 1):
-        if row % 2 == 0:
-            style = "normal_dark"
-        else:
-            style = "normal_light"
-        write(row, 0, sample.name, s=style)
-        for col, value in enumerate(sample.distribution, 1):
-            write(row, col, value, s=style)
+        style = ROW_STYLES[row % 2]
+        distribution = sample.distribution.tolist()
+        _append_row(ws, [sample.name, *(_sparse(distribution) if sparse else distribution)], style=style)
         if progress_callback is not None:
             progress_callback(row / len(dataset) * 0.2)
 
     logger.debug("Creating the Parameters sheet.")
     ws = wb.create_sheet("Parameters")
-    write(0, 0, "Sample Name", s="header")
-    ws.merge_cells(start_row=1, start_column=1, end_row=2, end_column=1)
+    _merge_cells(ws, 1, 1, 2, 1)
     ws.column_dimensions[column_to_char(0)].width = 24
+    header_row = ["Sample Name"] + [None] * (dataset.n_parameters * dataset.n_components)
+    sub_header_row = [None] * (dataset.n_parameters * dataset.n_components + 1)
     for i in range(dataset.n_components):
-        write(0, dataset.n_parameters * i + 1, f"Component{i+1}", s="header")
-        ws.merge_cells(start_row=1, start_column=dataset.n_parameters*i+2,
-                       end_row=1, end_column=dataset.n_parameters*(i+1)+1)
+        header_row[dataset.n_parameters*i+1] = f"Component{i+1}"
+        _merge_cells(ws, 1, dataset.n_parameters*i+2, 1, dataset.n_parameters*(i+1)+1)
         for j, header_name in enumerate(parameter_names):
-            write(1, dataset.n_parameters * i + 1 + j, header_name, s="header")
+            sub_header_row[dataset.n_parameters*i+1+j] = header_name
             ws.column_dimensions[column_to_char(dataset.n_parameters*i+1+j)].width = 16
-    for i, sample in enumerate(dataset):
+    _append_row(ws, header_row, style="header")
+    _append_row(ws, sub_header_row, style="header")
+    # (n_samples, n_parameters, n_components) -> (n_samples, n_components * n_parameters)
+    flat_parameters = dataset.parameters.transpose(0, 2, 1).reshape(dataset.n_samples, -1).tolist()
+    for i, (sample_name, parameters) in enumerate(zip(dataset.sample_names, flat_parameters)):
         row = i + 2
-        if row % 2 == 1:
-            style = "normal_dark"
-        else:
-            style = "normal_light"
-        write(row, 0, sample.name, s=style)
-        for j, component in enumerate(sample):
-            for k in range(dataset.n_parameters):
-                write(row, dataset.n_parameters * j + k + 1, dataset.parameters[i, k, j], s=style)
+        style = ROW_STYLES[(row + 1) % 2]
+        _append_row(ws, [sample_name, *parameters], style=style)
         if progress_callback is not None:
             progress_callback(1 / len(dataset) * 0.2 + 0.2)
 
     for i in range(dataset.n_components):
         logger.debug(f"Creating the C{i+1} sheet.")
         ws = wb.create_sheet(f"C{i+1}")
-        write(0, 0, "Sample Name", s="header")
         ws.column_dimensions[column_to_char(0)].width = 24
-        for col, value in enumerate(dataset.classes, 1):
-            write(0, col, value, s="header")
-            ws.column_dimensions[column_to_char(col)].width = 10
+        _set_column_widths(ws, 1, len(dataset.classes)+1, 10)
+        _append_row(ws, ["Sample Name", *dataset.classes.tolist()], style="header")
         for row, sample in enumerate(dataset, 1):
-            if row % 2 == 0:
-                style = "normal_dark"
-            else:
-                style = "normal_light"
-            write(row, 0, sample.name, s=style)
-            for col, value in enumerate(sample[i].distribution, 1):
-                write(row, col, value, s=style)
+            style = ROW_STYLES[row % 2]
+            distribution = sample[i].distribution.tolist()
+            _append_row(ws, [sample.name, *(_sparse(distribution) if sparse else distribution)], style=style)
             if progress_callback is not None:
                 progress_callback(((i*len(dataset) + row) / len(dataset)*dataset.n_components) * 0.6 + 0.4)
 
-    wb.save(filename)
-    wb.close()
+    future = _save_workbook(wb, filename, logger,
+                            f"The artificial dataset has been saved to the Excel file: [{filename}].",
+                            compress_level=compress_level, async_save=async_save)
     if progress_callback is not None:
         progress_callback(1.0)
-    logger.info(f"The artificial dataset has been saved to the Excel file: [{filename}].")
+    return future
 
 
 def save_dataset(dataset: Dataset, filename: str, progress_callback: Callable[[float], None] = None,
-                 logger: logging.Logger = None):
+                 logger: logging.Logger = None,
+                 compress_level: int = 6, async_save: bool = False, sparse: bool = False) -> Optional[Future]:
     assert dataset is not None
     if logger is None:
         logger = logging.getLogger("QGrain")
     else:
         assert isinstance(logger, logging.Logger)
     logger.debug("Start to save the grain size dataset.")
-    wb = openpyxl.Workbook()
+    wb = openpyxl.Workbook(write_only=True)
     prepare_styles(wb)
     logger.debug("Creating the README sheet.")
     readme_text = \
         """
         It only contains one sheet which stores the grain size distributions.
         """
-    _write_readme_sheet(wb.active, readme_text)
+    _write_readme_sheet(wb.create_sheet("README"), readme_text, sparse=sparse)
     logger.debug("Creating the GSDs sheet.")
     ws = wb.create_sheet("GSDs")
-    _write_dataset_sheet(ws, dataset, progress_callback)
+    _write_dataset_sheet(ws, dataset, progress_callback, sparse=sparse)
     logger.debug("Saving the workbook to file.")
-    wb.save(filename)
-    wb.close()
+    future = _save_workbook(wb, filename, logger, f"The dataset has been saved to the Excel file: [{filename}].",
+                            compress_level=compress_level, async_save=async_save)
     if progress_callback is not None:
         progress_callback(1.0)
-    logger.info(f"The dataset has been saved to the Excel file: [{filename}].")
+    return future
+
+
+def _execute_statistics(args: Tuple[np.ndarray, np.ndarray, np.ndarray]):
+    classes, classes_phi, distributions = args
+    return all_statistics_batch(classes, classes_phi, distributions)
 
 
 def save_statistics(dataset: Dataset, filename: str, progress_callback: Callable[[float], None] = None,
-                    logger: logging.Logger = None):
+                    logger: logging.Logger = None, n_processes: int = 1,
+                    compress_level: int = 6, async_save: bool = False, sparse: bool = False,
+                    include_gsds: bool = True) -> Optional[Future]:
     assert dataset is not None
     if logger is None:
         logger = logging.getLogger("QGrain")
@@ -298,13 +364,27 @@ def save_statistics(dataset: Dataset, filename: str, progress_callback: Callable
     # Calculate
     logger.debug("Calculating the statistical parameters and classification groups of all samples.")
     all_sample_statistics = []
-    for i, sample in enumerate(dataset):
-        sample_statistics = all_statistics(sample.classes, sample.classes_phi, sample.distribution)
-        all_sample_statistics.append(sample_statistics)
+    distributions = dataset.distributions
+    # calculate batch by batch to keep the progress updating
+    batch_size = 256
+    args = [(dataset.classes, dataset.classes_phi, distributions[start:start+batch_size])
+            for start in range(0, len(dataset), batch_size)]
+    if n_processes > 1:
+        multiprocessing.freeze_support()
+        pool = multiprocessing.Pool(n_processes)
+        batches = pool.imap(_execute_statistics, args)
+    else:
+        pool = None
+        batches = map(_execute_statistics, args)
+    for batch_statistics in batches:
+        all_sample_statistics.extend(batch_statistics)
         if progress_callback is not None:
-            progress = (i / len(dataset)) * 0.4
+            progress = len(all_sample_statistics) / len(dataset) * 0.4
             progress_callback(progress)
-    wb = openpyxl.Workbook()
+    if pool is not None:
+        pool.close()
+        pool.join()
+    wb = openpyxl.Workbook(write_only=True)
     prepare_styles(wb)
     logger.debug("Creating the README sheet.")
     readme_text = \
@@ -324,15 +404,17 @@ def save_statistics(dataset: Dataset, filename: str, progress_callback: Callable
             3. Folk, R. L. The Distinction between Grain Size and Mineral Composition in Sedimentary-Rock Nomenclature.
                 The Journal of Geology 62, 344–359 (1954).
         """
-    _write_readme_sheet(wb.active, readme_text)
-    logger.debug("Creating the GSDs sheet.")
-    if progress_callback is not None:
-        _callback = lambda p: progress_callback(p * 0.1 + 0.4)
-    else:
-        _callback = None
-    ws = wb.create_sheet("GSDs")
-    _write_dataset_sheet(ws, dataset, progress_callback=_callback)
+    _write_readme_sheet(wb.create_sheet("README"), readme_text, sparse=sparse, include_gsds=include_gsds)
+    if include_gsds:
+        logger.debug("Creating the GSDs sheet.")
+        if progress_callback is not None:
+            _callback = lambda p: progress_callback(p * 0.1 + 0.4)
+        else:
+            _callback = None
+        ws = wb.create_sheet("GSDs")
+        _write_dataset_sheet(ws, dataset, progress_callback=_callback, sparse=sparse)
 
+    # the keys of a statistical method get the values from its own dict, `itemgetter` avoids the lambda calls
     def get_keys(method: str):
         small_width = 12
         median_width = 24
@@ -340,32 +422,33 @@ def save_statistics(dataset: Dataset, filename: str, progress_callback: Callable
         if method == "arithmetic":
             unit = "μm"
             keys = [
-                (lambda s: s[method]["mean"], f"Mean [{unit}]", small_width),
-                (lambda s: s[method]["std"], f"Sorting Coefficient", small_width),
-                (lambda s: s[method]["skewness"], f"Skewness", small_width),
-                (lambda s: s[method]["kurtosis"], f"Kurtosis", small_width)]
+                (itemgetter("mean"), f"Mean [{unit}]", small_width),
+                (itemgetter("std"), f"Sorting Coefficient", small_width),
+                (itemgetter("skewness"), f"Skewness", small_width),
+                (itemgetter("kurtosis"), f"Kurtosis", small_width)]
             return keys
         elif method in ("geometric", "logarithmic", "geometric_fw57", "logarithmic_fw57"):
             unit = "μm" if method.startswith("geometric") else "φ"
             keys = [
-                (lambda s: s[method]["mean"], f"Mean [{unit}]", small_width),
-                (lambda s: s[method]["mean_description"], "Mean Description", median_width),
-                (lambda s: s[method]["median"], f"Median [{unit}]", small_width),
-                (lambda s: s[method]["mode"], f"Mode [{unit}]", small_width),
-                (lambda s: len(s[method]["modes"]), f"Number of Modes", small_width),
-                (lambda s: ", ".join([f"{mode: 0.4f}" for mode in s[method]["modes"]]), f"Modes [{unit}]", median_width),
-                (lambda s: s[method]["std"], "Sorting Coefficient", small_width),
-                (lambda s: s[method]["std_description"], "Sorting Description", median_width),
-                (lambda s: s[method]["skewness"], "Skewness", small_width),
-                (lambda s: s[method]["skewness_description"], "Skewness Description", median_width),
-                (lambda s: s[method]["kurtosis"], "Kurtosis", small_width),
-                (lambda s: s[method]["kurtosis_description"], "Kurtosis Description", median_width)]
+                (itemgetter("mean"), f"Mean [{unit}]", small_width),
+                (itemgetter("mean_description"), "Mean Description", median_width),
+                (itemgetter("median"), f"Median [{unit}]", small_width),
+                (itemgetter("mode"), f"Mode [{unit}]", small_width),
+                (lambda m: len(m["modes"]), f"Number of Modes", small_width),
+                (lambda m: ", ".join([f"{mode: 0.4f}" for mode in m["modes"]]), f"Modes [{unit}]", median_width),
+                (itemgetter("std"), "Sorting Coefficient", small_width),
+                (itemgetter("std_description"), "Sorting Description", median_width),
+                (itemgetter("skewness"), "Skewness", small_width),
+                (itemgetter("skewness_description"), "Skewness Description", median_width),
+                (itemgetter("kurtosis"), "Kurtosis", small_width),
+                (itemgetter("kurtosis_description"), "Kurtosis Description", median_width)]
             return keys
         elif method == "proportion_and_classification":
             keys = [
-                (lambda s: ", ".join([f"{p*100:0.4f}" for p in s["proportions_gsm"]]), "(Gravel, Sand, Mud) Proportions [%]", large_width),
-                (lambda s: ", ".join([f"{p*100:0.4f}" for p in s["proportions_ssc"]]), "(Sand, Silt, Clay) Proportions [%]", large_width),
-                (lambda s: ", ".join([f"{p*100:0.4f}" for p in s["proportions_bgssc"]]), "(Boulder, Gravel, Sand, Silt, Clay) Proportions [%]", large_width),
+                (itemgetter("_proportions_gsm_text"), "(Gravel, Sand, Mud) Proportions [%]", large_width),
+                (itemgetter("_proportions_ssc_text"), "(Sand, Silt, Clay) Proportions [%]", large_width),
+                (itemgetter("_proportions_bgssc_text"),
+                 "(Boulder, Gravel, Sand, Silt, Clay) Proportions [%]", large_width),
                 (lambda s: s["group_folk54"], "Group (Folk, 1954)", median_width),
                 (lambda s: s["group_bp12"], "Group (Blott & Pye, 2012)", large_width),
                 (lambda s: s["group_bp12_symbol"], "Group Symbol (Blott & Pye, 2012)", median_width)]
@@ -378,10 +461,13 @@ def save_statistics(dataset: Dataset, filename: str, progress_callback: Callable
         else:
             raise NotImplementedError(method)
 
-    def write(r, c, v, s="normal_light"):
-        cell = ws.cell(r + 1, c + 1, value=v)
-        cell.style = s
+    # format the proportions of all samples at once, instead of formatting them one by one for each row
+    for key in ("proportions_gsm", "proportions_ssc", "proportions_bgssc"):
+        percents = np.array([sample_statistics[key] for sample_statistics in all_sample_statistics]) * 100
+        for sample_statistics, texts in zip(all_sample_statistics, np.char.mod("%0.4f", percents).tolist()):
+            sample_statistics[f"_{key}_text"] = ", ".join(texts)
 
+    sample_names = dataset.sample_names
     methods = ["arithmetic", "geometric", "logarithmic", "geometric_fw57",
                "logarithmic_fw57", "proportion_and_classification"]
     sheet_names = ["Arithmetic", "Geometric", "Logarithmic", "Geometric_fw57",
@@ -389,35 +475,34 @@ def save_statistics(dataset: Dataset, filename: str, progress_callback: Callable
     for i_method, (method, sheet_name) in enumerate(zip(methods, sheet_names)):
         logger.debug(f"Creating the {sheet_name} sheet.")
         ws = wb.create_sheet(sheet_name)
-        write(0, 0, "Sample Name", s="header")
         keys = get_keys(method)
         ws.column_dimensions[column_to_char(0)].width = 16
         for col, (func, name, width) in enumerate(keys, 1):
-            write(0, col, name, s="header")
             ws.column_dimensions[column_to_char(col)].width = width
-        for i_sample, (sample, sample_statistics) in enumerate(zip(dataset, all_sample_statistics)):
+        _append_row(ws, ["Sample Name", *[name for func, name, width in keys]], style="header")
+        funcs = [func for func, name, width in keys]
+        for i_sample, (sample_name, sample_statistics) in enumerate(zip(sample_names, all_sample_statistics)):
             row = i_sample + 1
-            if row % 2 == 0:
-                style = "normal_dark"
-            else:
-                style = "normal_light"
-            write(row, 0, sample.name, s=style)
-            for col, (func, name, width) in enumerate(keys, 1):
-                value = func(sample_statistics)
-                write(row, col, value, s=style)
+            style = ROW_STYLES[row % 2]
+            # the proportions and groups are stored in the top level
+            record = sample_statistics.get(method, sample_statistics)
+            _append_row(ws, [sample_name, *[func(record) for func in funcs]], style=style)
             if progress_callback is not None:
                 progress = 0.5 + ((i_sample / len(dataset)) + i_method) / len(methods) * 0.5
                 progress_callback(progress)
     logger.debug("Saving the workbook to file.")
-    wb.save(filename)
-    wb.close()
+    future = _save_workbook(wb, filename, logger,
+                            f"The statistical result has been saved to the Excel file: [{filename}].",
+                            compress_level=compress_level, async_save=async_save)
     if progress_callback is not None:
         progress_callback(1.0)
-    logger.info(f"The statistical result has been saved to the Excel file: [{filename}].")
+    return future
 
 
 def save_pca(dataset: Dataset, filename: str, progress_callback: Callable[[float], None] = None,
-             logger: logging.Logger = None):
+             logger: logging.Logger = None,
+             compress_level: int = 6, async_save: bool = False, sparse: bool = False,
+             include_gsds: bool = True) -> Optional[Future]:
     assert dataset is not None
     if logger is None:
         logger = logging.getLogger("QGrain")
@@ -431,7 +516,7 @@ def save_pca(dataset: Dataset, filename: str, progress_callback: Callable[[float
     components = pca.components_
     ratios = pca.explained_variance_ratio_
 
-    wb = openpyxl.Workbook()
+    wb = openpyxl.Workbook(write_only=True)
     prepare_styles(wb)
     logger.debug("Creating the README sheet.")
     readme_text = \
@@ -445,65 +530,51 @@ def save_pca(dataset: Dataset, filename: str, progress_callback: Callable[[float
         You can get the details of algorithm from the following website.
         https://scikit-learn.org/stable/modules/generated/sklearn.decomposition.PCA.html
         """
-    _write_readme_sheet(wb.active, readme_text)
-    logger.debug("Creating the GSDs sheet.")
-    if progress_callback is not None:
-        _callback = lambda progress: progress_callback(progress * 0.2)
-    else:
-        _callback = None
-    ws = wb.create_sheet("GSDs")
-    _write_dataset_sheet(ws, dataset, progress_callback=_callback)
-
-    def write(r, c, v, s="normal_light"):
-        cell = ws.cell(r + 1, c + 1, value=v)
-        cell.style = s
+    _write_readme_sheet(wb.create_sheet("README"), readme_text, sparse=sparse, include_gsds=include_gsds)
+    if include_gsds:
+        logger.debug("Creating the GSDs sheet.")
+        if progress_callback is not None:
+            _callback = lambda progress: progress_callback(progress * 0.2)
+        else:
+            _callback = None
+        ws = wb.create_sheet("GSDs")
+        _write_dataset_sheet(ws, dataset, progress_callback=_callback, sparse=sparse)
 
     logger.debug("Creating the Distributions of PCs sheet.")
     ws = wb.create_sheet("Distributions of PCs")
-    write(0, 0, "PC", s="header")
     ws.column_dimensions[column_to_char(0)].width = 16
-    for col, value in enumerate(dataset.classes, 1):
-        write(0, col, value, s="header")
-        ws.column_dimensions[column_to_char(col)].width = 10
+    _set_column_widths(ws, 1, len(dataset.classes)+1, 10)
+    _append_row(ws, ["PC", *dataset.classes.tolist()], style="header")
     for i, component in enumerate(components):
         row = i + 1
-        if row % 2 == 0:
-            style = "normal_dark"
-        else:
-            style = "normal_light"
-        write(row, 0, f"PC{i+1} ({ratios[i]:0.2%})", s=style)
-        for col, value in enumerate(component, 1):
-            write(row, col, value, s=style)
+        style = ROW_STYLES[row % 2]
+        _append_row(ws, [f"PC{i+1} ({ratios[i]:0.2%})", *component.tolist()], style=style)
     if progress_callback is not None:
         progress_callback(0.3)
 
     logger.debug("Creating the Variations of PCs sheet.")
     ws = wb.create_sheet("Variations of PCs")
-    write(0, 0, "Sample Name", s="header")
     ws.column_dimensions[column_to_char(0)].width = 16
-    for i in range(10):
-        write(0, i + 1, f"PC{i+1} ({ratios[i]:0.2%})", s="header")
-        ws.column_dimensions[column_to_char(i+1)].width = 10
-    for row, variations in enumerate(transformed, 1):
-        if row % 2 == 0:
-            style = "normal_dark"
-        else:
-            style = "normal_light"
-        write(row, 0, dataset[row-1].name, s=style)
-        for col, value in enumerate(variations, 1):
-            write(row, col, value, s=style)
+    _set_column_widths(ws, 1, 11, 10)
+    _append_row(ws, ["Sample Name", *[f"PC{i+1} ({ratios[i]:0.2%})" for i in range(10)]], style="header")
+    sample_names = dataset.sample_names
+    for row, (sample_name, variations) in enumerate(zip(sample_names, transformed.tolist()), 1):
+        style = ROW_STYLES[row % 2]
+        _append_row(ws, [sample_name, *variations], style=style)
         if progress_callback is not None:
             progress_callback(row / len(dataset) * 0.7 + 0.3)
 
-    wb.save(filename)
-    wb.close()
+    future = _save_workbook(wb, filename, logger, f"The PCA result has been saved to the Excel file: [{filename}].",
+                            compress_level=compress_level, async_save=async_save)
     if progress_callback is not None:
         progress_callback(1.0)
-    logger.info(f"The PCA result has been saved to the Excel file: [{filename}].")
+    return future
 
 
 def save_clustering(dataset: Dataset, flags: Sequence[int], filename: str,
-                    progress_callback: Callable[[float], None] = None, logger: logging.Logger = None):
+                    progress_callback: Callable[[float], None] = None, logger: logging.Logger = None,
+                    compress_level: int = 6, async_save: bool = False, sparse: bool = False,
+                    include_gsds: bool = True) -> Optional[Future]:
     assert dataset is not None
     if logger is None:
         logger = logging.getLogger("QGrain")
@@ -512,16 +583,15 @@ def save_clustering(dataset: Dataset, flags: Sequence[int], filename: str,
     logger.debug("Start to save the clustering result.")
     flag_set = set(flags)
     n_clusters = len(flag_set)
-    typical_samples: List[Sample] = []
-    temp_flag_set = set()
+    sample_names = dataset.sample_names
+    distributions = dataset.distributions
+    # group the sample indexes by flags in one pass, the first sample of each cluster is the typical one
+    cluster_indexes: Dict[int, List[int]] = {}
     for i, flag in enumerate(flags):
-        if len(temp_flag_set) == n_clusters:
-            break
-        if flag not in temp_flag_set:
-            typical_samples.append(dataset[i])
-            temp_flag_set.add(flag)
+        cluster_indexes.setdefault(flag, []).append(i)
+    typical_indexes = [indexes[0] for indexes in cluster_indexes.values()]
 
-    wb = openpyxl.Workbook()
+    wb = openpyxl.Workbook(write_only=True)
     prepare_styles(wb)
     logger.debug("Creating the README sheet.")
     readme_text = \
@@ -536,33 +606,25 @@ def save_clustering(dataset: Dataset, flags: Sequence[int], filename: str,
         You can get the details of algorithm from the following website.
         https://docs.scipy.org/doc/scipy/reference/cluster.hierarchy.html
         """
-    _write_readme_sheet(wb.active, readme_text)
-    logger.debug("Creating the GSDs sheet.")
-    if progress_callback is not None:
-        _callback = lambda p: progress_callback(p * 0.2)
-    else:
-        _callback = None
-    ws = wb.create_sheet("GSDs")
-    _write_dataset_sheet(ws, dataset, progress_callback=_callback)
-
-    def write(r, c, v, s="normal_light"):
-        cell = ws.cell(r + 1, c + 1, value=v)
-        cell.style = s
+    _write_readme_sheet(wb.create_sheet("README"), readme_text, sparse=sparse, include_gsds=include_gsds)
+    if include_gsds:
+        logger.debug("Creating the GSDs sheet.")
+        if progress_callback is not None:
+            _callback = lambda p: progress_callback(p * 0.2)
+        else:
+            _callback = None
+        ws = wb.create_sheet("GSDs")
+        _write_dataset_sheet(ws, dataset, progress_callback=_callback, sparse=sparse)
 
     logger.debug("Creating the Cluster Flags of Samples sheet.")
     ws = wb.create_sheet("Cluster Flags of Samples")
-    write(0, 0, "Sample Name", s="header")
-    write(0, 1, "Cluster Flags", s="header")
     ws.column_dimensions[column_to_char(0)].width = 16
     ws.column_dimensions[column_to_char(1)].width = 16
-    for i, (sample, flag) in enumerate(zip(dataset, flags)):
+    _append_row(ws, ["Sample Name", "Cluster Flags"], style="header")
+    for i, (sample_name, flag) in enumerate(zip(sample_names, flags)):
         row = i + 1
-        if row % 2 == 0:
-            style = "normal_dark"
-        else:
-            style = "normal_light"
-        write(row, 0, sample.name, s=style)
-        write(row, 1, flag, s=style)
+        style = ROW_STYLES[row % 2]
+        _append_row(ws, [sample_name, flag], style=style)
         if progress_callback is not None:
             if n_clusters <= 100:
                 progress_callback(i / len(dataset) * 0.1 + 0.2)
@@ -571,20 +633,13 @@ def save_clustering(dataset: Dataset, flags: Sequence[int], filename: str,
 
     logger.debug("Creating the Typical Samples of Clusters sheet.")
     ws = wb.create_sheet("Typical Samples of Clusters")
-    write(0, 0, "Sample Name", s="header")
     ws.column_dimensions[column_to_char(0)].width = 16
-    for col, value in enumerate(dataset.classes, 1):
-        write(0, col, value, s="header")
-        ws.column_dimensions[column_to_char(col)].width = 10
-    for i, sample in enumerate(typical_samples):
+    _set_column_widths(ws, 1, len(dataset.classes)+1, 10)
+    _append_row(ws, ["Sample Name", *dataset.classes.tolist()], style="header")
+    for i, index in enumerate(typical_indexes):
         row = i + 1
-        if row % 2 == 0:
-            style = "normal_dark"
-        else:
-            style = "normal_light"
-        write(row, 0, sample.name, s=style)
-        for col, value in enumerate(sample.distribution, 1):
-            write(row, col, value, s=style)
+        style = ROW_STYLES[row % 2]
+        _append_row(ws, [sample_names[index], *distributions[index].tolist()], style=style)
         if progress_callback is not None:
             if n_clusters <= 100:
                 progress_callback(i / len(dataset) * 0.1 + 0.3)
@@ -593,45 +648,37 @@ def save_clustering(dataset: Dataset, flags: Sequence[int], filename: str,
 
     if n_clusters <= 100:
         for flag in flag_set:
-            samples = []
-            for sample, in_this_cluster in zip(dataset, np.equal(flags, flag)):
-                if in_this_cluster:
-                    samples.append(sample)
             logger.debug(f"Creating the Cluster{flag} sheet.")
             ws = wb.create_sheet(f"Cluster{flag}")
-            write(0, 0, "Sample Name", s="header")
             ws.column_dimensions[column_to_char(0)].width = 16
-            for col, value in enumerate(dataset.classes, 1):
-                write(0, col, value, s="header")
-                ws.column_dimensions[column_to_char(col)].width = 10
-            for i, sample in enumerate(samples):
+            _set_column_widths(ws, 1, len(dataset.classes)+1, 10)
+            _append_row(ws, ["Sample Name", *dataset.classes.tolist()], style="header")
+            for i, index in enumerate(cluster_indexes[flag]):
                 row = i + 1
-                if row % 2 == 0:
-                    style = "normal_dark"
-                else:
-                    style = "normal_light"
-                write(row, 0, sample.name, s=style)
-                for col, value in enumerate(sample.distribution, 1):
-                    write(row, col, value, s=style)
+                style = ROW_STYLES[row % 2]
+                _append_row(ws, [sample_names[index], *distributions[index].tolist()], style=style)
                 if progress_callback is not None:
                     progress_callback(i / len(dataset) / n_clusters * 0.6 + 0.4)
 
-    wb.save(filename)
-    wb.close()
+    future = _save_workbook(wb, filename, logger,
+                            f"The Clustering result has been saved to the Excel file: [{filename}].",
+                            compress_level=compress_level, async_save=async_save)
     if progress_callback is not None:
         progress_callback(1.0)
-    logger.info(f"The Clustering result has been saved to the Excel file: [{filename}].")
+    return future
 
 
 def save_emma(result: EMMAResult, filename: str, progress_callback: Callable[[float], None] = None,
-              logger: logging.Logger = None):
+              logger: logging.Logger = None,
+              compress_level: int = 6, async_save: bool = False, sparse: bool = False,
+              include_gsds: bool = True) -> Optional[Future]:
     if logger is None:
         logger = logging.getLogger("QGrain")
     else:
         assert isinstance(logger, logging.Logger)
     logger.debug("Start to save the EMMA result.")
 
-    wb = openpyxl.Workbook()
+    wb = openpyxl.Workbook(write_only=True)
     prepare_styles(wb)
     logger.debug("Creating the README sheet.")
     readme_text = \
@@ -662,65 +709,75 @@ def save_emma(result: EMMAResult, filename: str, progress_callback: Callable[[fl
             Update End Members: {"Unknown" if result.settings is None else result.settings["update_end_members"]}
             Need History: {"Unknown" if result.settings is None else result.settings["need_history"]}
         """
-    _write_readme_sheet(wb.active, readme_text)
-    logger.debug("Creating the GSDs sheet.")
-    if progress_callback is not None:
-        _callback = lambda p: progress_callback(p * 0.4)
-    else:
-        _callback = None
-    ws = wb.create_sheet("GSDs")
-    _write_dataset_sheet(ws, result.dataset, progress_callback=_callback)
-
-    def write(r, c, v, s="normal_light"):
-        cell = ws.cell(r + 1, c + 1, value=v)
-        cell.style = s
+    _write_readme_sheet(wb.create_sheet("README"), readme_text, sparse=sparse, include_gsds=include_gsds)
+    if include_gsds:
+        logger.debug("Creating the GSDs sheet.")
+        if progress_callback is not None:
+            _callback = lambda p: progress_callback(p * 0.4)
+        else:
+            _callback = None
+        ws = wb.create_sheet("GSDs")
+        _write_dataset_sheet(ws, result.dataset, progress_callback=_callback, sparse=sparse)
 
     logger.debug("Creating the Distributions of End Members sheet.")
     ws = wb.create_sheet("Distributions of End Members")
-    write(0, 0, "End Member", s="header")
     ws.column_dimensions[column_to_char(0)].width = 16
-    for col, value in enumerate(result.dataset.classes, 1):
-        write(0, col, value, s="header")
-        ws.column_dimensions[column_to_char(col)].width = 10
+    _set_column_widths(ws, 1, len(result.dataset.classes)+1, 10)
+    _append_row(ws, ["End Member", *result.dataset.classes], style="header")
     for i in range(result.n_members):
         row = i + 1
-        if row % 2 == 0:
-            style = "normal_dark"
-        else:
-            style = "normal_light"
-        write(row, 0, f"EM{i+1}", s=style)
-        for col, value in enumerate(result.end_members[i], 1):
-            write(row, col, value, s=style)
+        style = ROW_STYLES[row % 2]
+        _append_row(ws, [f"EM{i+1}", *result.end_members[i].tolist()], style=style)
 
     logger.debug("Creating the Proportions of End Members sheet.")
     ws = wb.create_sheet("Proportions of End Members")
-    write(0, 0, "Sample Name", s="header")
     ws.column_dimensions[column_to_char(0)].width = 16
-    for i in range(result.n_members):
-        write(0, i + 1, f"EM{i+1} [%]", s="header")
-        ws.column_dimensions[column_to_char(i+1)].width = 10
+    _set_column_widths(ws, 1, result.n_members+1, 10)
+    _append_row(ws, ["Sample Name", *[f"EM{i+1} [%]" for i in range(result.n_members)]], style="header")
     for i, sample_proportions in enumerate(result.proportions):
         row = i + 1
-        if row % 2 == 0:
-            style = "normal_dark"
-        else:
-            style = "normal_light"
-        write(row, 0, result.dataset[i].name, s=style)
-        for j in range(result.n_members):
-            col = j + 1
-            write(row, col, sample_proportions[j]*100, s=style)
+        style = ROW_STYLES[row % 2]
+        _append_row(ws, [result.dataset[i].name, *(sample_proportions*100).tolist()], style=style)
         if progress_callback is not None:
             progress_callback(i / result.n_samples * 0.6 + 0.4)
 
-    wb.save(filename)
-    wb.close()
+    future = _save_workbook(wb, filename, logger, f"The EMMA result has been saved to the Excel file: [{filename}].",
+                            compress_level=compress_level, async_save=async_save)
     if progress_callback is not None:
         progress_callback(1.0)
-    logger.info(f"The EMMA result has been saved to the Excel file: [{filename}].")
+    return future
+
+
+def _align_components(mean_values: np.ndarray, n_components: Sequence[int], n_groups: int,
+                      max_iter: int = 100) -> np.ndarray:
+    # group the components by their mean sizes (1-D k-means), the centers are initialized by the quantiles
+    centers = np.quantile(mean_values, (np.arange(n_groups) + 0.5) / n_groups)
+    for _ in range(max_iter):
+        labels = np.argmin(np.abs(mean_values[:, None] - centers[None, :]), axis=1)
+        # the sums and sizes of all groups are counted at once, the center of an empty group is kept
+        counts = np.bincount(labels, minlength=n_groups)
+        sums = np.bincount(labels, weights=mean_values, minlength=n_groups)
+        new_centers = np.where(counts > 0, sums / np.maximum(counts, 1), centers)
+        if np.allclose(new_centers, centers):
+            break
+        centers = new_centers
+    # the components of one result must be in different groups, keep them in the order of mean sizes
+    flags = np.empty(len(mean_values), dtype=int)
+    start = 0
+    for n in n_components:
+        previous = -1
+        for i, index in enumerate(np.argsort(mean_values[start:start+n])):
+            flag = min(max(labels[start+index], previous+1), n_groups-n+i)
+            flags[start+index] = flag
+            previous = flag
+        start += n
+    return flags
 
 
 def save_ssu(results: List[SSUResult], filename: str, align_components=False,
-             progress_callback: Callable[[float], None] = None, logger: logging.Logger = None):
+             progress_callback: Callable[[float], None] = None, logger: logging.Logger = None,
+             compress_level: int = 6, async_save: bool = False, sparse: bool = False,
+             include_gsds: bool = True) -> Optional[Future]:
     if logger is None:
         logger = logging.getLogger("QGrain")
     else:
@@ -731,46 +788,28 @@ def save_ssu(results: List[SSUResult], filename: str, align_components=False,
         "GSDs", [result.sample.name for result in results],
         results[0].classes,
         [result.sample.distribution for result in results])
-    max_n_components = max(Counter([len(result) for result in results]).keys())
+    n_components = [len(result) for result in results]
+    max_n_components = max(n_components)
+
+    # the distributions of all components, in the order of results
+    stacked_components = np.array([component.distribution for result in results for component in result])
+
+    component_statistics = all_statistics_batch(dataset.classes, dataset.classes_phi, stacked_components)
+    # the rows of components and unmixed (i.e., scaled by proportions) components are converted at once
+    proportions = np.array([component.proportion for result in results for component in result])
+    component_rows = stacked_components.tolist()
+    unmixed_rows = (stacked_components * proportions[:, None]).tolist()
 
     # prepare flags
     flags = []
     if not align_components:
-        for result in results:
-            flags.extend(range(len(result)))
+        for n in n_components:
+            flags.extend(range(n))
     else:
-        stacked_components = []
-        for result in results:
-            for component in result:
-                stacked_components.append(component.distribution)
-        stacked_components = np.array(stacked_components)
-        clusters = KMeans(n_clusters=max_n_components)
-        flags = clusters.fit_predict(stacked_components)
-        # check flags to make it unique
-        flag_index = 0
-        for result in results:
-            result_flags = set()
-            for i in range(len(result)):
-                if flags[flag_index] in result_flags:
-                    if flags[flag_index] == max_n_components:
-                        flags[flag_index] = max_n_components-1
-                    else:
-                        flags[flag_index] += 1
-                    result_flags.add(flags[flag_index])
-                flag_index += 1
-
-        flag_set = set(flags)
-        picked = []
-        for target_flag in flag_set:
-            for i, flag in enumerate(flags):
-                if flag == target_flag:
-                    picked.append((target_flag, logarithmic(dataset.classes_phi, stacked_components[i])["mean"]))
-                    break
-        picked.sort(key=lambda x: x[1])
-        flag_map = {flag: index for index, (flag, _) in enumerate(picked)}
-        flags = np.array([flag_map[flag] for flag in flags])
-
-    wb = openpyxl.Workbook()
+        mean_values = np.array([s["logarithmic"]["mean"] for s in component_statistics])
+        flags = _align_components(mean_values, n_components, max_n_components)
+
+    wb = openpyxl.Workbook(write_only=True)
     prepare_styles(wb)
     logger.debug("Creating the README sheet.")
     readme_text = \
@@ -784,23 +823,20 @@ def save_ssu(results: List[SSUResult], filename: str, align_components=False,
 
         The SSU algorithm is implemented by QGrain.
         """
-    _write_readme_sheet(wb.active, readme_text)
-    logger.debug("Creating the GSDs sheet.")
-    if progress_callback is not None:
-        _callback = lambda p: progress_callback(p * 0.1)
-    else:
-        _callback = None
-    ws = wb.create_sheet("GSDs")
-    _write_dataset_sheet(ws, dataset, progress_callback=_callback)
-
-    def write(r, c, v, s="normal_light"):
-        cell = ws.cell(r + 1, c + 1, value=v)
-        cell.style = s
+    _write_readme_sheet(wb.create_sheet("README"), readme_text, sparse=sparse, include_gsds=include_gsds)
+    if include_gsds:
+        logger.debug("Creating the GSDs sheet.")
+        if progress_callback is not None:
+            _callback = lambda p: progress_callback(p * 0.1)
+        else:
+            _callback = None
+        ws = wb.create_sheet("GSDs")
+        _write_dataset_sheet(ws, dataset, progress_callback=_callback, sparse=sparse)
 
+    # all sheets are created at first, and then the rows of them are appended in one pass over the results
     logger.debug("Creating the Information of Fitting sheet.")
-    ws = wb.create_sheet("Information of Fitting")
-    write(0, 0, "Sample Name", s="header")
-    ws.column_dimensions[column_to_char(0)].width = 16
+    ws_info = wb.create_sheet("Information of Fitting")
+    ws_info.column_dimensions[column_to_char(0)].width = 16
     headers = ["Distribution Type",
                "Number of Components",
                "Resolver Settings",
@@ -810,34 +846,16 @@ def save_ssu(results: List[SSUResult], filename: str, align_components=False,
                "Number of Iterations",
                "Final Loss [LMSE]"]
     for col, value in enumerate(headers, 1):
-        write(0, col, value, s="header")
         if col in (3, 4, 5):
-            ws.column_dimensions[column_to_char(col)].width = 32
-        else:
-            ws.column_dimensions[column_to_char(col)].width = 10
-    for i, result in enumerate(results):
-        row = i + 1
-        if row % 2 == 0:
-            style = "normal_dark"
+            ws_info.column_dimensions[column_to_char(col)].width = 32
         else:
-            style = "normal_light"
-        write(row, 0, result.sample.name, s=style)
-        write(row, 1, result.distribution_type.name, s=style)
-        write(row, 2, len(result), s=style)
-        write(row, 3, "Default" if result.settings is None else str(result.settings), s=style)
-        write(row, 4, "None" if result.x0 is None else str(result.x0.tolist()), s=style)
-        write(row, 5, str(result.parameters[-1].tolist()), s=style)
-        write(row, 6, result.time_spent, s=style)
-        write(row, 7, len(result.loss_series("lmse")), s=style)
-        write(row, 8, result.loss("lmse"), s=style)
-        if progress_callback is not None:
-            progress_callback(i / len(dataset) * 0.1 + 0.1)
+            ws_info.column_dimensions[column_to_char(col)].width = 10
+    _append_row(ws_info, ["Sample Name", *headers], style="header")
 
     logger.debug("Creating the Statistical Moments sheet.")
-    ws = wb.create_sheet("Statistical Moments")
-    write(0, 0, "Sample Name", s="header")
-    ws.merge_cells(start_row=1, start_column=1, end_row=2, end_column=1)
-    ws.column_dimensions[column_to_char(0)].width = 16
+    ws_moments = wb.create_sheet("Statistical Moments")
+    _merge_cells(ws_moments, 1, 1, 2, 1)
+    ws_moments.column_dimensions[column_to_char(0)].width = 16
     headers = []
     sub_headers = ["Proportion [%]",
                    "Mean [phi]",
@@ -846,109 +864,105 @@ def save_ssu(results: List[SSUResult], filename: str, align_components=False,
                    "Standard Deviation [microns]",
                    "Skewness",
                    "Kurtosis"]
-    for i in range(max_n_components):
-        write(0, i * len(sub_headers) + 1, f"C{i+1}", s="header")
-        ws.merge_cells(start_row=1, start_column=i*len(sub_headers)+2, end_row=1, end_column=(i+1)*len(sub_headers)+1)
+    # the columns of each component group are fixed, so their slices are prepared once
+    n_sub_headers = len(sub_headers)
+    moment_slices = [slice(i*n_sub_headers+1, (i+1)*n_sub_headers+1) for i in range(max_n_components)]
+    empty_moments = [None] * (max_n_components * n_sub_headers)
+    header_row = ["Sample Name", *empty_moments]
+    for i, moment_slice in enumerate(moment_slices):
+        header_row[moment_slice.start] = f"C{i+1}"
+        _merge_cells(ws_moments, 1, moment_slice.start+1, 1, moment_slice.stop)
         headers.extend(sub_headers)
-    for col, value in enumerate(headers, 1):
-        write(1, col, value, s="header")
-        ws.column_dimensions[column_to_char(col)].width = 10
-    flag_index = 0
-    for i, result in enumerate(results):
-        row = i + 2
-        if row % 2 == 0:
-            style = "normal_light"
-        else:
-            style = "normal_dark"
-        write(row, 0, result.sample.name, s=style)
-        for component in result:
-            index = flags[flag_index]
-            s = all_statistics(result.classes, result.classes_phi, component.distribution)
-            write(row, index * len(sub_headers) + 1, component.proportion*100, s=style)
-            write(row, index * len(sub_headers) + 2, s["logarithmic"]["mean"], s=style)
-            write(row, index * len(sub_headers) + 3, s["geometric"]["mean"], s=style)
-            write(row, index * len(sub_headers) + 4, s["logarithmic"]["std"], s=style)
-            write(row, index * len(sub_headers) + 5, s["geometric"]["std"], s=style)
-            write(row, index * len(sub_headers) + 6, s["logarithmic"]["skewness"], s=style)
-            write(row, index * len(sub_headers) + 7, s["logarithmic"]["kurtosis"], s=style)
-            flag_index += 1
-        if progress_callback is not None:
-            progress_callback(i / len(dataset) * 0.1 + 0.2)
+    _set_column_widths(ws_moments, 1, len(headers)+1, 10)
+    _append_row(ws_moments, header_row, style="header")
+    _append_row(ws_moments, [None, *headers], style="header")
 
     logger.debug("Creating the Unmixed Components sheet.")
-    ws = wb.create_sheet("Unmixed Components")
-    ws.merge_cells(start_row=1, start_column=1, end_row=1, end_column=2)
-    write(0, 0, "Sample Name", s="header")
-    ws.column_dimensions[column_to_char(0)].width = 16
-    for col, value in enumerate(dataset.classes, 2):
-        write(0, col, value, s="header")
-        ws.column_dimensions[column_to_char(col)].width = 10
-    row = 1
-    for i, result in enumerate(results):
-        if i % 2 == 0:
-            style = "normal_light"
-        else:
-            style = "normal_dark"
-        write(row, 0, result.sample.name, s=style)
-        ws.merge_cells(start_row=row+1, start_column=1, end_row=row+len(result)+1, end_column=1)
-        for component_i, component in enumerate(result, 1):
-            write(row, 1, f"C{component_i}", s=style)
-            for col, value in enumerate(component.distribution*component.proportion, 2):
-                write(row, col, value, s=style)
-            row += 1
-        write(row, 1, "Sum", s=style)
-        for col, value in enumerate(result.distribution, 2):
-            write(row, col, value, s=style)
-        row += 1
-        if progress_callback is not None:
-            progress_callback(i / len(dataset) * 0.2 + 0.3)
+    ws_unmixed = wb.create_sheet("Unmixed Components")
+    _merge_cells(ws_unmixed, 1, 1, 1, 2)
+    ws_unmixed.column_dimensions[column_to_char(0)].width = 16
+    _set_column_widths(ws_unmixed, 2, len(dataset.classes)+2, 10)
+    _append_row(ws_unmixed, ["Sample Name", None, *dataset.classes.tolist()], style="header")
 
     logger.debug("Creating separate sheets for all components.")
     ws_dict = {}
+    n_rows_dict = {}
     flag_set = set(flags)
     for flag in flag_set:
         ws = wb.create_sheet(f"C{flag+1}")
-        write(0, 0, "Sample Name", s="header")
         ws.column_dimensions[column_to_char(0)].width = 16
-        for col, value in enumerate(dataset.classes, 1):
-            write(0, col, value, s="header")
-            ws.column_dimensions[column_to_char(col)].width = 10
+        _set_column_widths(ws, 1, len(dataset.classes)+1, 10)
+        _append_row(ws, ["Sample Name", *dataset.classes.tolist()], style="header")
         ws_dict[flag] = ws
+        n_rows_dict[flag] = 1
 
+    unmixed_row = 1
     flag_index = 0
     for i, result in enumerate(results):
         row = i + 1
-        if row % 2 == 0:
-            style = "normal_dark"
-        else:
-            style = "normal_light"
-
-        for component in result:
+        style = ROW_STYLES[row % 2]
+        _append_row(ws_info, [result.sample.name,
+                              result.distribution_type.name,
+                              len(result),
+                              "Default" if result.settings is None else str(result.settings),
+                              "None" if result.x0 is None else str(result.x0.tolist()),
+                              str(result.parameters[-1].tolist()),
+                              result.time_spent,
+                              len(result.loss_series("lmse")),
+                              result.loss("lmse")], style=style)
+
+        # the columns of the missing component groups are left blank
+        moments = [result.sample.name, *empty_moments]
+        _merge_cells(ws_unmixed, unmixed_row+1, 1, unmixed_row+len(result)+1, 1)
+        for component_i, component in enumerate(result, 1):
             flag = flags[flag_index]
+            s = component_statistics[flag_index]
+            moments[moment_slices[flag]] = [
+                component.proportion*100,
+                s["logarithmic"]["mean"],
+                s["geometric"]["mean"],
+                s["logarithmic"]["std"],
+                s["geometric"]["std"],
+                s["logarithmic"]["skewness"],
+                s["logarithmic"]["kurtosis"]]
+
+            sample_name = result.sample.name if component_i == 1 else None
+            _append_row(ws_unmixed,
+                        [sample_name, f"C{component_i}", *unmixed_rows[flag_index]],
+                        style=ROW_STYLES[(i + 1) % 2])
+            unmixed_row += 1
+
             ws = ws_dict[flag]
-            write(row, 0, result.sample.name, s=style)
-            for col, value in enumerate(component.distribution, 1):
-                write(row, col, value, s=style)
+            # the rows of the samples which have no component of this group are left blank
+            for _ in range(row - n_rows_dict[flag]):
+                ws.append([])
+            _append_row(ws, [result.sample.name, *component_rows[flag_index]], style=style)
+            n_rows_dict[flag] = row + 1
             flag_index += 1
+        _append_row(ws_moments, moments, style=ROW_STYLES[(row + 2) % 2])
+        _append_row(ws_unmixed, [None, "Sum", *result.distribution.tolist()], style=ROW_STYLES[(i + 1) % 2])
+        unmixed_row += 1
         if progress_callback is not None:
-            progress_callback(i / len(dataset) * 0.5 + 0.5)
+            progress_callback(i / len(dataset) * 0.9 + 0.1)
 
-    wb.save(filename)
-    wb.close()
+    future = _save_workbook(wb, filename, logger, f"The SSU results have been saved to the Excel file: [{filename}].",
+                            compress_level=compress_level, async_save=async_save)
     if progress_callback is not None:
         progress_callback(1.0)
-    logger.info(f"The SSU results have been saved to the Excel file: [{filename}].")
+    return future
 
 
 def save_udm(result: UDMResult, filename: str, progress_callback: Callable[[float], None] = None,
-             logger: logging.Logger = None):
+             logger: logging.Logger = None,
+             compress_level: int = 6, async_save: bool = False, sparse: bool = False,
+             include_gsds: bool = True) -> Optional[Future]:
     if logger is None:
         logger = logging.getLogger("QGrain")
     else:
         assert isinstance(logger, logging.Logger)
     logger.debug("Start to save the UDM result.")
 
-    wb = openpyxl.Workbook()
+    wb = openpyxl.Workbook(write_only=True)
     prepare_styles(wb)
     logger.debug("Creating the README sheet.")
     readme_text = \
@@ -981,54 +995,47 @@ def save_udm(result: UDMResult, filename: str, progress_callback: Callable[[floa
             Need History: {"Unknown" if result.settings is None else result.settings["need_history"]}
         """
 
-    _write_readme_sheet(wb.active, readme_text)
-    logger.debug("Creating the GSDs sheet.")
-    if progress_callback is not None:
-        _callback = lambda p: progress_callback(p * 0.1)
-    else:
-        _callback = None
-    ws = wb.create_sheet("GSDs")
-    _write_dataset_sheet(ws, result.dataset, progress_callback=_callback)
-
-    def write(r, c, v, s="normal_light"):
-        cell = ws.cell(r + 1, c + 1, value=v)
-        cell.style = s
+    _write_readme_sheet(wb.create_sheet("README"), readme_text, sparse=sparse, include_gsds=include_gsds)
+    if include_gsds:
+        logger.debug("Creating the GSDs sheet.")
+        if progress_callback is not None:
+            _callback = lambda p: progress_callback(p * 0.1)
+        else:
+            _callback = None
+        ws = wb.create_sheet("GSDs")
+        _write_dataset_sheet(ws, result.dataset, progress_callback=_callback, sparse=sparse)
 
     logger.debug("Creating the Resolved Parameters sheet.")
     ws = wb.create_sheet("Resolved Parameters")
-    write(0, 0, "Sample Name", s="header")
-    ws.merge_cells(start_row=1, start_column=1, end_row=2, end_column=1)
+    _merge_cells(ws, 1, 1, 2, 1)
     ws.column_dimensions[column_to_char(0)].width = 16
     headers = []
     distribution_type = DistributionType._member_map_[result.kernel_type.name]
     distribution_class = get_distribution(distribution_type)
     sub_headers = (*distribution_class.PARAMETER_NAMES, "Weight")
+    header_row = ["Sample Name"] + [None] * (result.n_components * len(sub_headers))
     for i in range(result.n_components):
-        write(0, i * len(sub_headers) + 1, f"C{i+1}", s="header")
-        ws.merge_cells(start_row=1, start_column=i*len(sub_headers)+2, end_row=1, end_column=(i+1)*len(sub_headers)+1)
+        header_row[i*len(sub_headers)+1] = f"C{i+1}"
+        _merge_cells(ws, 1, i*len(sub_headers)+2, 1, (i+1)*len(sub_headers)+1)
         headers.extend(sub_headers)
-    for col, value in enumerate(headers, 1):
-        write(1, col, value, s="header")
-        ws.column_dimensions[column_to_char(col)].width = 10
+    _set_column_widths(ws, 1, len(headers)+1, 10)
+    _append_row(ws, header_row, style="header")
+    _append_row(ws, [None, *headers], style="header")
     for i, sample in enumerate(result.dataset):
         row = i + 2
-        if row % 2 == 0:
-            style = "normal_light"
-        else:
-            style = "normal_dark"
-        write(row, 0, sample.name, s=style)
+        style = ROW_STYLES[(row + 1) % 2]
+        values = [sample.name]
+        parameters = result.parameters[-1, i].tolist()
         for j in range(result.n_components):
             for k in range(len(sub_headers)):
-                col = j * len(sub_headers) + k + 1
-                value = result.parameters[-1, i, k, j]
-                write(row, col, value, s=style)
+                values.append(parameters[k][j])
+        _append_row(ws, values, style=style)
         if progress_callback is not None:
             progress_callback(i / result.n_samples * 0.1 + 0.1)
 
     logger.debug("Creating the Statistical Moments sheet.")
     ws = wb.create_sheet("Statistical Moments")
-    write(0, 0, "Sample Name", s="header")
-    ws.merge_cells(start_row=1, start_column=1, end_row=2, end_column=1)
+    _merge_cells(ws, 1, 1, 2, 1)
     ws.column_dimensions[column_to_char(0)].width = 16
     headers = []
     sub_headers = ["Proportion [%]",
@@ -1038,59 +1045,52 @@ def save_udm(result: UDMResult, filename: str, progress_callback: Callable[[floa
                    "Standard Deviation [microns]",
                    "Skewness",
                    "Kurtosis"]
+    header_row = ["Sample Name"] + [None] * (result.n_components * len(sub_headers))
     for i in range(result.n_components):
-        write(0, i * len(sub_headers) + 1, f"C{i+1}", s="header")
-        ws.merge_cells(start_row=1, start_column=i*len(sub_headers)+2, end_row=1, end_column=(i+1)*len(sub_headers)+1)
+        header_row[i*len(sub_headers)+1] = f"C{i+1}"
+        _merge_cells(ws, 1, i*len(sub_headers)+2, 1, (i+1)*len(sub_headers)+1)
         headers.extend(sub_headers)
-    for col, value in enumerate(headers, 1):
-        write(1, col, value, s="header")
-        ws.column_dimensions[column_to_char(col)].width = 10
+    _set_column_widths(ws, 1, len(headers)+1, 10)
+    _append_row(ws, header_row, style="header")
+    _append_row(ws, [None, *headers], style="header")
 
+    component_statistics = [all_statistics_batch(result.dataset.classes, result.dataset.classes_phi,
+                                                 result.components[:, j]) for j in range(result.n_components)]
     for i, sample in enumerate(result.dataset):
         row = i + 2
-        if row % 2 == 0:
-            style = "normal_light"
-        else:
-            style = "normal_dark"
-        write(row, 0, sample.name, s=style)
+        style = ROW_STYLES[(row + 1) % 2]
+        values = [sample.name]
         for j in range(result.n_components):
-            s = all_statistics(result.dataset.classes, result.dataset.classes_phi, result.components[i, j])
-            write(row, j * len(sub_headers) + 1, result.proportions[i, 0, j] * 100, s=style)
-            write(row, j * len(sub_headers) + 2, s["logarithmic"]["mean"], s=style)
-            write(row, j * len(sub_headers) + 3, s["geometric"]["mean"], s=style)
-            write(row, j * len(sub_headers) + 4, s["logarithmic"]["std"], s=style)
-            write(row, j * len(sub_headers) + 5, s["geometric"]["std"], s=style)
-            write(row, j * len(sub_headers) + 6, s["logarithmic"]["skewness"], s=style)
-            write(row, j * len(sub_headers) + 7, s["logarithmic"]["kurtosis"], s=style)
+            s = component_statistics[j][i]
+            values.extend([result.proportions[i, 0, j] * 100,
+                           s["logarithmic"]["mean"],
+                           s["geometric"]["mean"],
+                           s["logarithmic"]["std"],
+                           s["geometric"]["std"],
+                           s["logarithmic"]["skewness"],
+                           s["logarithmic"]["kurtosis"]])
+        _append_row(ws, values, style=style)
         if progress_callback is not None:
             progress_callback(i / result.n_samples * 0.1 + 0.2)
 
     logger.debug("Creating the Unmixed Components sheet.")
     ws = wb.create_sheet("Unmixed Components")
-    ws.merge_cells(start_row=1, start_column=1, end_row=1, end_column=2)
-    write(0, 0, "Sample Name", s="header")
+    _merge_cells(ws, 1, 1, 1, 2)
     ws.column_dimensions[column_to_char(0)].width = 16
-    for col, value in enumerate(result.dataset.classes, 2):
-        write(0, col, value, s="header")
-        ws.column_dimensions[column_to_char(col)].width = 10
+    _set_column_widths(ws, 2, len(result.dataset.classes)+2, 10)
+    _append_row(ws, ["Sample Name", None, *result.dataset.classes], style="header")
 
     predict = result.proportions @ result.components
     row = 1
     for i, sample in enumerate(result.dataset):
-        if i % 2 == 0:
-            style = "normal_light"
-        else:
-            style = "normal_dark"
-        write(row, 0, sample.name, s=style)
-        ws.merge_cells(start_row=row+1, start_column=1, end_row=row+result.n_components+1, end_column=1)
+        style = ROW_STYLES[(i + 1) % 2]
+        _merge_cells(ws, row+1, 1, row+result.n_components+1, 1)
         for j in range(result.n_components):
-            write(row, 1, f"C{j+1}", s=style)
-            for col, value in enumerate(result.components[i, j]*result.proportions[i, 0, j], 2):
-                write(row, col, value, s=style)
+            sample_name = sample.name if j == 0 else None
+            _append_row(ws, [sample_name, f"C{j+1}", *(result.components[i, j]*result.proportions[i, 0, j]).tolist()],
+                        style=style)
             row += 1
-        write(row, 1, "Sum", s=style)
-        for col, value in enumerate(predict[i, 0], 2):
-            write(row, col, value, s=style)
+        _append_row(ws, [None, "Sum", *predict[i, 0].tolist()], style=style)
         row += 1
         if progress_callback is not None:
             progress_callback(i / result.n_samples * 0.2 + 0.3)
@@ -1098,25 +1098,28 @@ def save_udm(result: UDMResult, filename: str, progress_callback: Callable[[floa
     logger.debug("Creating separate sheets for all components.")
     for j in range(result.n_components):
         ws = wb.create_sheet(f"C{j+1}")
-        write(0, 0, "Sample Name", s="header")
         ws.column_dimensions[column_to_char(0)].width = 16
-        for col, value in enumerate(result.dataset.classes, 1):
-            write(0, col, value, s="header")
-            ws.column_dimensions[column_to_char(col)].width = 10
+        _set_column_widths(ws, 1, len(result.dataset.classes)+1, 10)
+        _append_row(ws, ["Sample Name", *result.dataset.classes], style="header")
         for i, sample in enumerate(result.dataset):
             row = i + 1
-            if row % 2 == 0:
-                style = "normal_dark"
-            else:
-                style = "normal_light"
-            write(row, 0, sample.name, s=style)
-            for col, value in enumerate(result.components[i, j], 1):
-                write(row, col, value, s=style)
+            style = ROW_STYLES[row % 2]
+            _append_row(ws, [sample.name, *result.components[i, j].tolist()], style=style)
             if progress_callback is not None:
                 progress_callback(((i / result.n_samples) + j) / result.n_components * 0.5 + 0.5)
 
-    wb.save(filename)
-    wb.close()
+    future = _save_workbook(wb, filename, logger, f"The UDM result have been saved to the Excel file: [{filename}].",
+                            compress_level=compress_level, async_save=async_save)
     if progress_callback is not None:
         progress_callback(1.0)
-    logger.info(f"The UDM result have been saved to the Excel file: [{filename}].")
+    return future
+
+
+# the protocol 5 writes the arrays without the intermediate copies, it's pinned (not the highest protocol of
+# the running interpreter) to let the dumped files be loaded by all supported versions of Python
+DUMP_PROTOCOL = 5
+
+
+def save_dump(obj: Any, filename: str):
+    with open(filename, "wb") as f:
+        pickle.dump(obj, f, protocol=DUMP_PROTOCOL)
@@ -4,6 +4,14 @@ import numpy as np
 from numpy import ndarray
 
 
+def _mean_square(errors: ndarray, axis: Union[int, Sequence[int]] = None) -> ndarray:
+    # the dot product squares and sums the errors in one pass, which is much lighter than `np.mean(np.square())`
+    if axis is None:
+        errors = np.ravel(errors)
+        return np.dot(errors, errors) / errors.size
+    return np.mean(np.square(errors), axis=axis)
+
+
 # P-Norm
 def p_norm_numpy(values: ndarray, targets: ndarray, p=2, axis: Union[int, Sequence[int]] = None) -> ndarray:
     return np.sum(np.abs(values - targets) ** p, axis=axis) ** (1 / p)
@@ -16,22 +24,22 @@ def mae_numpy(value: ndarray, targets: ndarray, axis: Union[int, Sequence[int]]
 
 # Mean Squared Error
 def mse_numpy(values: ndarray, targets: ndarray, axis: Union[int, Sequence[int]] = None) -> ndarray:
-    return np.mean(np.square(values - targets), axis=axis)
+    return _mean_square(values - targets, axis=axis)
 
 
 # Root Mean Squared Error
 def rmse_numpy(values: ndarray, targets: ndarray, axis: Union[int, Sequence[int]] = None) -> ndarray:
-    return np.sqrt(np.mean(np.square(values - targets), axis=axis))
+    return np.sqrt(_mean_square(values - targets, axis=axis))
 
 
 # Root Mean Squared Logarithmic Error
 def rmlse_numpy(values: ndarray, targets: ndarray, axis: Union[int, Sequence[int]] = None) -> ndarray:
-    return np.sqrt(np.mean(np.square(np.log(values + 1) - np.log(targets + 1)), axis=axis))
+    return np.sqrt(_mean_square(np.log(values + 1) - np.log(targets + 1), axis=axis))
 
 
 # Logarithmic Mean Squared Error
 def lmse_numpy(values: ndarray, targets: ndarray, axis: Union[int, Sequence[int]] = None) -> ndarray:
-    return np.log(np.mean(np.square(values - targets), axis=axis))
+    return np.log(_mean_square(values - targets, axis=axis))
 
 
 # Cosine
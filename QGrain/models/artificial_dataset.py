@@ -164,7 +164,7 @@ class ArtificialSample:
     def is_valid(self) -> bool:
         valid = True
         for values in [self._proportions, self._components, self._distribution, *self._moments]:
-            if np.any(np.logical_or(np.isnan(values), np.isinf(values))):
+            if not np.all(np.isfinite(values)):
                 valid = False
                 break
         return valid
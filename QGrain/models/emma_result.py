@@ -48,10 +48,9 @@ class EMMAResult:
         self._time_spent = time_spent
         self._settings = settings
         self._loss_series = loss_series
-        modes = [(i, dataset.classes[np.unravel_index(np.argmax(end_members[-1, i]), end_members[-1, i].shape)])
-                 for i in range(n_members)]
-        modes.sort(key=lambda x: x[1])
-        self._sorted_indexes = tuple([i for i, _ in modes])
+        # sort the end members by their modes, the stable sort keeps the order of the ones with the same mode
+        modes = dataset.classes[np.argmax(end_members[-1], axis=1)]
+        self._sorted_indexes = tuple(np.argsort(modes, kind="stable").tolist())
         self._sort()
 
     @property
@@ -100,7 +99,12 @@ class EMMAResult:
 
     @property
     def history(self):
-        for i in range(self._proportions.shape[0]):
+        return self.get_history()
+
+    def get_history(self, indexes: Iterable[int] = None):
+        if indexes is None:
+            indexes = range(self._proportions.shape[0])
+        for i in indexes:
             copy_result = copy.copy(self)
             copy_result._i = i
             yield copy_result
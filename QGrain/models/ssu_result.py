@@ -96,7 +96,7 @@ class SSUResult:
         self._parameters = parameters
         self._time_spent = time_spent
         self._settings = settings
-        classes = np.expand_dims(np.expand_dims(sample.classes_phi, 0), 0).repeat(n_components, 1)
+        classes = np.broadcast_to(sample.classes_phi, (1, n_components, len(sample.classes_phi)))
         proportions, components, (m, std, s, k) = distribution_class.interpret(
             np.expand_dims(self._parameters[-1], 0), classes, self._sample.interval_phi)
         proportions, components, (m, std, s, k) = proportions[0], components[0], (m[0], std[0], s[0], k[0])
@@ -181,7 +181,7 @@ class SSUResult:
     def is_valid(self) -> bool:
         valid = True
         for values in [self._proportions, self._components, self._distribution, *self._moments]:
-            if np.any(np.logical_or(np.isnan(values), np.isinf(values))):
+            if not np.all(np.isfinite(values)):
                 valid = False
                 break
         return valid
@@ -189,8 +189,7 @@ class SSUResult:
     @property
     def history(self):
         n_iterations, n_parameters, n_components = self._parameters.shape
-        classes = np.expand_dims(np.expand_dims(
-            self._sample.classes_phi, 0), 0).repeat(n_iterations, 0).repeat(n_components, 1)
+        classes = np.broadcast_to(self._sample.classes_phi, (n_iterations, n_components, len(self._sample.classes_phi)))
         distribution_class = get_distribution(self._distribution_type)
         proportions, components, (m, std, s, k) = distribution_class.interpret(
             self._parameters, classes, self._sample.interval_phi)
@@ -217,13 +216,12 @@ class SSUResult:
 
     def loss_series(self, name: str):
         n_iterations, n_parameters, n_components = self._parameters.shape
-        classes = np.expand_dims(np.expand_dims(
-            self._sample.classes_phi, 0), 0).repeat(n_iterations, 0).repeat(n_components, 1)
+        classes = np.broadcast_to(self._sample.classes_phi, (n_iterations, n_components, len(self._sample.classes_phi)))
         distribution_class = get_distribution(self._distribution_type)
         proportions, components, _ = distribution_class.interpret(
-            self._parameters, classes, self._sample.interval_phi)
+            self._parameters, classes, self._sample.interval_phi, moments=False)
         distributions = (proportions @ components)[:, 0, :]
-        targets = np.expand_dims(self._sample.distribution, 0).repeat(n_iterations, 0)
+        targets = np.broadcast_to(self._sample.distribution, distributions.shape)
         loss_func = loss_numpy(name)
         loss_series = loss_func(distributions, targets, 1)
         return loss_series
@@ -26,10 +26,7 @@ class UDMResult:
             self.n_samples, axis=0).repeat(self.n_components, axis=1)
         self._interval_phi = np.abs((self.dataset.classes_phi[0] - self.dataset.classes_phi[-1]) / (self.n_classes - 1))
         indexes = get_sorted_indexes(self.distribution_type, parameters[-1], self._classes_phi, self._interval_phi)
-        sorted_parameters = np.zeros_like(parameters)
-        for i, j in enumerate(indexes):
-            sorted_parameters[:, :, :, i] = parameters[:, :, :, j]
-        self._parameters = sorted_parameters
+        self._parameters = parameters[:, :, :, list(indexes)]
         self._update(-1)
 
     @property
@@ -86,7 +83,12 @@ class UDMResult:
 
     @property
     def history(self):
-        for i in range(self._parameters.shape[0]):
+        return self.get_history()
+
+    def get_history(self, indexes: Iterable[int] = None):
+        if indexes is None:
+            indexes = range(self._parameters.shape[0])
+        for i in indexes:
             copy_result = copy.copy(self)
             copy_result._update(i)
             yield copy_result
@@ -101,9 +103,9 @@ class UDMResult:
     def _update(self, index: int):
         distribution_class = get_distribution(DistributionType.__members__[self.kernel_type.name])
         proportions, components, _ = distribution_class.interpret(
-            self._parameters[index], self._classes_phi, self._interval_phi)
-        proportions[np.logical_or(np.isnan(proportions), np.isinf(proportions))] = 0.0
-        components[np.logical_or(np.isnan(components), np.isinf(components))] = 0.0
+            self._parameters[index], self._classes_phi, self._interval_phi, moments=False)
+        proportions[~np.isfinite(proportions)] = 0.0
+        components[~np.isfinite(components)] = 0.0
         self._proportions = proportions
         self._components = components
 
@@ -84,11 +84,13 @@ def try_ssu(sample: Union[ArtificialSample, Sample], distribution_type: Distribu
     iteration = 0
     max_iterations = global_max_niter * optimizer_max_niter if try_global else optimizer_max_niter
     history = [np.expand_dims(x0, axis=0)]
-    classes = np.expand_dims(np.expand_dims(sample.classes_phi, 0), 0).repeat(n_components, 1)
+    # a read-only view, all components share the same classes
+    classes = np.broadcast_to(sample.classes_phi, (1, n_components, len(sample.classes_phi)))
 
     def closure(x):
         x = x.reshape((1, distribution_class.N_PARAMETERS + 1, n_components))
-        proportions, components, _ = distribution_class.interpret(x, classes, sample.interval_phi)
+        # the loss only depends on the mixed distribution, skip calculating the moments of components
+        proportions, components, _ = distribution_class.interpret(x, classes, sample.interval_phi, moments=False)
         pred_distribution = (proportions[0] @ components[0]).squeeze()
         return loss_func(pred_distribution, sample.distribution, None)
 
@@ -105,8 +107,11 @@ def try_ssu(sample: Union[ArtificialSample, Sample], distribution_type: Distribu
     def global_callback(x: ndarray, f: float, accept: bool):
         nonlocal global_iteration
         global_iteration += 1
-        x = x.reshape((1, distribution_class.N_PARAMETERS + 1, n_components))
-        logger.debug(f"The global epoch {global_iteration} finished, x: {x}, function value: {f}, accepted: {accept}.")
+        # formatting the parameters every epoch is wasted when the debug messages are not shown
+        if logger.isEnabledFor(logging.DEBUG):
+            x = x.reshape((1, distribution_class.N_PARAMETERS + 1, n_components))
+            logger.debug(f"The global epoch {global_iteration} finished, x: {x}, function value: {f}, "
+                         f"accepted: {accept}.")
 
     if try_global:
         global_result = basinhopping(
@@ -135,9 +140,7 @@ def try_ssu(sample: Union[ArtificialSample, Sample], distribution_type: Distribu
     sorted_indexes = get_sorted_indexes(distribution_type, parameters, classes, sample.interval_phi)
     if need_history:
         parameters = np.concatenate(history, axis=0)
-    sorted_parameters = np.zeros_like(parameters)
-    for i, j in enumerate(sorted_indexes):
-        sorted_parameters[:, :, i] = parameters[:, :, j]
+    sorted_parameters = parameters[:, :, list(sorted_indexes)]
     settings = dict(loss=loss, optimizer=optimizer, try_global=try_global, global_max_niter=global_max_niter,
                     global_niter_success=global_max_niter, global_step_size=global_step_size,
                     optimizer_max_niter=optimizer_max_niter, need_history=need_history)
@@ -155,12 +158,15 @@ def try_dataset(
         dataset: Union[ArtificialDataset, Dataset],
         distribution_type: DistributionType,
         n_components: int,
-        n_processes: int = 1,
+        n_processes: int = None,
         options: Dict[str, Any] = None):
+    if options is None:
+        options = {}
     multiprocessing.freeze_support()
-    pool = multiprocessing.Pool(n_processes)
     args = [(sample, distribution_type, n_components, options) for sample in dataset]
-    results = pool.map(_execute, args)
+    # the samples are fitted independently, use all cores by default
+    with multiprocessing.Pool(n_processes) as pool:
+        results = pool.map(_execute, args)
     succeeded_results: List[SSUResult] = []
     failed_samples: List[Tuple[int, str]] = []
     for i, (result, message) in enumerate(results):
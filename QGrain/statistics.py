@@ -2,14 +2,14 @@ __all__ = ["mode", "modes", "to_cumulative", "reversed_phi_ppf", "interval_phi",
            "arithmetic", "geometric", "logarithmic", "logarithmic_fw57", "geometric_fw57", "scale_description",
            "proportions_gsm", "proportions_ssc", "proportions_bgssc", "all_proportions",
            "group_gsm_folk54", "group_ssc_folk54", "group_folk54", "GROUP_BP12_SYMBOL_MAP",
-           "group_gsm_bp12", "group_ssc_bp12", "group_bp12", "major_statistics", "all_statistics"]
+           "group_gsm_bp12", "group_ssc_bp12", "group_bp12", "major_statistics", "all_statistics",
+           "all_statistics_batch"]
 
 import string
 from typing import *
 
 import numpy as np
 from numpy import ndarray
-from scipy.interpolate import interp1d
 from scipy.signal import find_peaks
 
 
@@ -88,13 +88,18 @@ def reversed_phi_ppf(classes_phi: ndarray, distribution: ndarray) -> \
     :param classes_phi: The grain size classes in phi values.
     :param distribution: The frequency distribution of grain size classes.
         Note, the sum of frequencies should be equal to 1.
-    :return: A scipy `interp1d` object which is callable and can be regarded as a PPF function.
+    :return: A function which linearly interpolates the cumulative frequencies, it can be regarded as a PPF function.
     """
     interval = interval_phi(classes_phi)
     expand_classes = np.linspace(classes_phi[0] - interval, classes_phi[-1] + interval, len(classes_phi) + 2)
     cumulative = to_cumulative(distribution, expand=True)
     cumulative = np.array(cumulative)
-    ppf = interp1d(cumulative, expand_classes, kind="slinear")
+
+    # `np.interp` is the same linear interpolation as `interp1d(kind="slinear")` but much lighter,
+    # and it accepts the flat parts (i.e., the classes without particles) of the cumulative frequencies
+    def ppf(p: Union[int, float, ndarray]) -> Union[float, ndarray]:
+        return np.interp(p, cumulative, expand_classes)
+
     return ppf
 
 
@@ -145,6 +150,96 @@ def cm(classes_phi: ndarray, distribution: ndarray) -> Tuple[float, float]:
 
 # The following five formulas of calculating the statistical parameters referred to Blott & Pye (2001)'s work
 # DOI: 10.1002/esp.261
+def _geometric_std_description(std_value):
+    if std_value < 1.27:
+        return "Very well sorted"
+    elif std_value < 1.41:
+        return "Well sorted"
+    elif std_value < 1.62:
+        return "Moderately well sorted"
+    elif std_value < 2.00:
+        return "Moderately sorted"
+    elif std_value < 4.00:
+        return "Poorly sorted"
+    elif std_value < 16.00:
+        return "Very poorly sorted"
+    else:
+        return "Extremely poorly sorted"
+
+
+def _logarithmic_std_description(std_value):
+    if std_value < 0.35:
+        return "Very well sorted"
+    elif std_value < 0.50:
+        return "Well sorted"
+    elif std_value < 0.70:
+        return "Moderately well sorted"
+    elif std_value < 1.00:
+        return "Moderately sorted"
+    elif std_value < 2.00:
+        return "Poorly sorted"
+    elif std_value < 4.00:
+        return "Very poorly sorted"
+    else:
+        return "Extremely poorly sorted"
+
+
+def _moments_skewness_description(skewness_value):
+    # the skewness in phi values should be negated before
+    if skewness_value < -1.30:
+        return "Very fine skewed"
+    elif skewness_value < -0.43:
+        return "Fine skewed"
+    elif skewness_value < 0.43:
+        return "Symmetrical"
+    elif skewness_value < 1.30:
+        return "Coarse skewed"
+    else:
+        return "Very coarse skewed"
+
+
+def _moments_kurtosis_description(kurtosis_value):
+    if kurtosis_value < 1.70:
+        return "Very platykurtic"
+    elif kurtosis_value < 2.55:
+        return "Platykurtic"
+    elif kurtosis_value < 3.70:
+        return "Mesokurtic"
+    elif kurtosis_value < 7.40:
+        return "Leptokurtic"
+    else:
+        return "Very leptokurtic"
+
+
+def _fw57_skewness_description(skewness_value):
+    # the skewness in phi values should be negated before
+    if skewness_value < -0.3:
+        return "Very fine skewed"
+    elif skewness_value < -0.1:
+        return "Fine skewed"
+    elif skewness_value < 0.1:
+        return "Symmetrical"
+    elif skewness_value < 0.30:
+        return "Coarse skewed"
+    else:
+        return "Very coarse skewed"
+
+
+def _fw57_kurtosis_description(kurtosis_value):
+    if kurtosis_value < 0.67:
+        return "Very platykurtic"
+    elif kurtosis_value < 0.90:
+        return "Platykurtic"
+    elif kurtosis_value < 1.11:
+        return "Mesokurtic"
+    elif kurtosis_value < 1.50:
+        return "Leptokurtic"
+    elif kurtosis_value < 3.00:
+        return "Very leptokurtic"
+    else:
+        return "Extremely leptokurtic"
+
+
 def arithmetic(classes: ndarray, distribution: ndarray) -> Dict[str, float]:
     """
     Calculate the basic statistical parameters.
@@ -175,56 +270,15 @@ def geometric(classes: ndarray, distribution: ndarray) -> Dict[str, Union[float,
         `dict(mean=..., std=..., skewness=..., kurtosis=..., std_description=..., skewness_description=...,
             kurtosis_description=...)`
     """
-
-    def std_description(std_value):
-        if std_value < 1.27:
-            return "Very well sorted"
-        elif std_value < 1.41:
-            return "Well sorted"
-        elif std_value < 1.62:
-            return "Moderately well sorted"
-        elif std_value < 2.00:
-            return "Moderately sorted"
-        elif std_value < 4.00:
-            return "Poorly sorted"
-        elif std_value < 16.00:
-            return "Very poorly sorted"
-        else:
-            return "Extremely poorly sorted"
-
-    def skewness_description(skewness_value):
-        if skewness_value < -1.30:
-            return "Very fine skewed"
-        elif skewness_value < -0.43:
-            return "Fine skewed"
-        elif skewness_value < 0.43:
-            return "Symmetrical"
-        elif skewness_value < 1.30:
-            return "Coarse skewed"
-        else:
-            return "Very coarse skewed"
-
-    def kurtosis_description(kurtosis_value):
-        if kurtosis_value < 1.70:
-            return "Very platykurtic"
-        elif kurtosis_value < 2.55:
-            return "Platykurtic"
-        elif kurtosis_value < 3.70:
-            return "Mesokurtic"
-        elif kurtosis_value < 7.40:
-            return "Leptokurtic"
-        else:
-            return "Very leptokurtic"
-
     mean = np.exp(np.sum(distribution * np.log(classes)))
     std = np.exp(np.sqrt(np.sum(distribution * (np.log(classes) - np.log(mean)) ** 2)))
     skewness = np.sum(distribution * (np.log(classes) - np.log(mean)) ** 3) / (np.log(std) ** 3)
     kurtosis = np.sum(distribution * (np.log(classes) - np.log(mean)) ** 4) / (np.log(std) ** 4)
 
     return dict(mean=mean, std=std, skewness=skewness, kurtosis=kurtosis,
-                std_description=std_description(std),
-                skewness_description=skewness_description(skewness),
-                kurtosis_description=kurtosis_description(kurtosis))
+                std_description=_geometric_std_description(std),
+                skewness_description=_moments_skewness_description(skewness),
+                kurtosis_description=_moments_kurtosis_description(kurtosis))
 
 
 def logarithmic(classes_phi: ndarray, distribution: ndarray) -> Dict[str, Union[float, str]]:
@@ -239,57 +293,19 @@ def logarithmic(classes_phi: ndarray, distribution: ndarray) -> Dict[str, Union[
         `dict(mean=..., std=..., skewness=..., kurtosis=..., std_description=..., skewness_description=...,
             kurtosis_description=...)`
     """
-
-    def std_description(std_value):
-        if std_value < 0.35:
-            return "Very well sorted"
-        elif std_value < 0.50:
-            return "Well sorted"
-        elif std_value < 0.70:
-            return "Moderately well sorted"
-        elif std_value < 1.00:
-            return "Moderately sorted"
-        elif std_value < 2.00:
-            return "Poorly sorted"
-        elif std_value < 4.00:
-            return "Very poorly sorted"
-        else:
-            return "Extremely poorly sorted"
-
-    def skewness_description(skewness_value):
-        skewness_value = -skewness_value
-        if skewness_value < -1.30:
-            return "Very fine skewed"
-        elif skewness_value < -0.43:
-            return "Fine skewed"
-        elif skewness_value < 0.43:
-            return "Symmetrical"
-        elif skewness_value < 1.30:
-            return "Coarse skewed"
-        else:
-            return "Very coarse skewed"
-
-    def kurtosis_description(kurtosis_value):
-        if kurtosis_value < 1.70:
-            return "Very platykurtic"
-        elif kurtosis_value < 2.55:
-            return "Platykurtic"
-        elif kurtosis_value < 3.70:
-            return "Mesokurtic"
-        elif kurtosis_value < 7.40:
-            return "Leptokurtic"
-        else:
-            return "Very leptokurtic"
-
     mean = np.sum(classes_phi * distribution)
     std = np.sqrt(np.sum(distribution * (classes_phi - mean) ** 2))
     skewness = np.sum(distribution * (classes_phi - mean) ** 3) / (std ** 3)
     kurtosis = np.sum(distribution * (classes_phi - mean) ** 4) / (std ** 4)
 
     return dict(mean=mean, std=std, skewness=skewness, kurtosis=kurtosis,
-                std_description=std_description(std),
-                skewness_description=skewness_description(skewness),
-                kurtosis_description=kurtosis_description(kurtosis))
+                std_description=_logarithmic_std_description(std),
+                skewness_description=_moments_skewness_description(-skewness),
+                kurtosis_description=_moments_kurtosis_description(kurtosis))
+
+
+# the percentiles used by the graphical measures of Folk & Ward (1957)
+_FW57_PERCENTS = np.array([0.05, 0.16, 0.25, 0.50, 0.75, 0.84, 0.95])
 
 
 def logarithmic_fw57(_ppf: Callable[[Union[int, float, np.ndarray]], Union[int, float, np.ndarray]]) -> \
@@ -298,70 +314,24 @@ def logarithmic_fw57(_ppf: Callable[[Union[int, float, np.ndarray]], Union[int,
     Calculate the basic statistical parameters.
     Follow the "logarithmic (original) Folk & Ward (1957) graphical measures" in Blott & Pye (2001).
 
-    :param _ppf: A `interp1d` object returned by `reversed_phi_ppf` function.
+    :param _ppf: The function returned by `reversed_phi_ppf` function.
     :return: A `dict` that contains the basic statistical parameters and corresponding descriptions.
         `dict(mean=..., std=..., skewness=..., kurtosis=..., std_description=..., skewness_description=...,
             kurtosis_description=...)`
     """
 
-    def ppf(x):
-        if not isinstance(x, ndarray):
-            x = np.array(x)
-        return _ppf(1 - x)
-
-    def std_description(std_value):
-        if std_value < 0.35:
-            return "Very well sorted"
-        elif std_value < 0.50:
-            return "Well sorted"
-        elif std_value < 0.70:
-            return "Moderately well sorted"
-        elif std_value < 1.00:
-            return "Moderately sorted"
-        elif std_value < 2.00:
-            return "Poorly sorted"
-        elif std_value < 4.00:
-            return "Very poorly sorted"
-        else:
-            return "Extremely poorly sorted"
-
-    def skewness_description(skewness_value):
-        skewness_value = -skewness_value
-        if skewness_value < -0.3:
-            return "Very fine skewed"
-        elif skewness_value < -0.1:
-            return "Fine skewed"
-        elif skewness_value < 0.1:
-            return "Symmetrical"
-        elif skewness_value < 0.30:
-            return "Coarse skewed"
-        else:
-            return "Very coarse skewed"
-
-    def kurtosis_description(kurtosis_value):
-        if kurtosis_value < 0.67:
-            return "Very platykurtic"
-        elif kurtosis_value < 0.90:
-            return "Platykurtic"
-        elif kurtosis_value < 1.11:
-            return "Mesokurtic"
-        elif kurtosis_value < 1.50:
-            return "Leptokurtic"
-        elif kurtosis_value < 3.00:
-            return "Very leptokurtic"
-        else:
-            return "Extremely leptokurtic"
-
-    mean = np.mean(ppf([0.16, 0.50, 0.84]))
-    std = (ppf(0.84) - ppf(0.16)) / 4 + (ppf(0.95) - ppf(0.05)) / 6.6
-    skewness = (ppf(0.16) + ppf(0.84) - 2 * ppf(0.50)) / 2 / (ppf(0.84) - ppf(0.16)) + (
-            ppf(0.05) + ppf(0.95) - 2 * ppf(0.50)) / 2 / (ppf(0.95) - ppf(0.05))
-    kurtosis = (ppf(0.95) - ppf(0.05)) / (2.44 * (ppf(0.75) - ppf(0.25)))
+    # interpolate all percentiles by one call
+    q = dict(zip(_FW57_PERCENTS.tolist(), _ppf(1 - _FW57_PERCENTS)))
+    mean = np.mean([q[0.16], q[0.50], q[0.84]])
+    std = (q[0.84] - q[0.16]) / 4 + (q[0.95] - q[0.05]) / 6.6
+    skewness = (q[0.16] + q[0.84] - 2 * q[0.50]) / 2 / (q[0.84] - q[0.16]) + (
+            q[0.05] + q[0.95] - 2 * q[0.50]) / 2 / (q[0.95] - q[0.05])
+    kurtosis = (q[0.95] - q[0.05]) / (2.44 * (q[0.75] - q[0.25]))
 
     return dict(mean=mean, std=std, skewness=skewness, kurtosis=kurtosis,
-                std_description=std_description(std),
-                skewness_description=skewness_description(skewness),
-                kurtosis_description=kurtosis_description(kurtosis))
+                std_description=_logarithmic_std_description(std),
+                skewness_description=_fw57_skewness_description(-skewness),
+                kurtosis_description=_fw57_kurtosis_description(kurtosis))
 
 
 def geometric_fw57(_ppf: Callable[[Union[int, float, np.ndarray]], Union[int, float, np.ndarray]]) -> \
@@ -370,69 +340,24 @@ def geometric_fw57(_ppf: Callable[[Union[int, float, np.ndarray]], Union[int, fl
     Calculate the basic statistical parameters.
     Follow the "geometric (modified) Folk & Ward (1957) graphical measures" in Blott & Pye (2001).
 
-    :param _ppf: A `interp1d` object returned by `reversed_phi_ppf` function.
+    :param _ppf: The function returned by `reversed_phi_ppf` function.
     :return: A `dict` that contains the basic statistical parameters and corresponding descriptions.
         `dict(mean=..., std=..., skewness=..., kurtosis=..., std_description=..., skewness_description=...,
             kurtosis_description=...)`
     """
 
-    def log_ppf(x):
-        if not isinstance(x, ndarray):
-            x = np.array(x)
-        return np.log(to_microns(_ppf(x)))
-
-    def std_description(std_value):
-        if std_value < 1.27:
-            return "Very well sorted"
-        elif std_value < 1.41:
-            return "Well sorted"
-        elif std_value < 1.62:
-            return "Moderately well sorted"
-        elif std_value < 2.00:
-            return "Moderately sorted"
-        elif std_value < 4.00:
-            return "Poorly sorted"
-        elif std_value < 16.00:
-            return "Very poorly sorted"
-        else:
-            return "Extremely poorly sorted"
-
-    def skewness_description(skewness_value):
-        if skewness_value < -0.3:
-            return "Very fine skewed"
-        elif skewness_value < -0.1:
-            return "Fine skewed"
-        elif skewness_value < 0.1:
-            return "Symmetrical"
-        elif skewness_value < 0.30:
-            return "Coarse skewed"
-        else:
-            return "Very coarse skewed"
-
-    def kurtosis_description(kurtosis_value):
-        if kurtosis_value < 0.67:
-            return "Very platykurtic"
-        elif kurtosis_value < 0.90:
-            return "Platykurtic"
-        elif kurtosis_value < 1.11:
-            return "Mesokurtic"
-        elif kurtosis_value < 1.50:
-            return "Leptokurtic"
-        elif kurtosis_value < 3.00:
-            return "Very leptokurtic"
-        else:
-            return "Extremely leptokurtic"
-
-    mean = np.exp(np.mean(log_ppf([0.16, 0.50, 0.84])))
-    std = np.exp((log_ppf(0.84) - log_ppf(0.16)) / 4 + (log_ppf(0.95) - log_ppf(0.05)) / 6.6)
-    skewness = (log_ppf(0.16) + log_ppf(0.84) - 2 * log_ppf(0.50)) / 2 / (log_ppf(0.84) - log_ppf(0.16)) + (
-            log_ppf(0.05) + log_ppf(0.95) - 2 * log_ppf(0.50)) / 2 / (log_ppf(0.95) - log_ppf(0.05))
-    kurtosis = (log_ppf(0.95) - log_ppf(0.05)) / (2.44 * (log_ppf(0.75) - log_ppf(0.25)))
+    # interpolate all percentiles by one call
+    q = dict(zip(_FW57_PERCENTS.tolist(), np.log(to_microns(_ppf(_FW57_PERCENTS)))))
+    mean = np.exp(np.mean([q[0.16], q[0.50], q[0.84]]))
+    std = np.exp((q[0.84] - q[0.16]) / 4 + (q[0.95] - q[0.05]) / 6.6)
+    skewness = (q[0.16] + q[0.84] - 2 * q[0.50]) / 2 / (q[0.84] - q[0.16]) + (
+            q[0.05] + q[0.95] - 2 * q[0.50]) / 2 / (q[0.95] - q[0.05])
+    kurtosis = (q[0.95] - q[0.05]) / (2.44 * (q[0.75] - q[0.25]))
 
     return dict(mean=mean, std=std, skewness=skewness, kurtosis=kurtosis,
-                std_description=std_description(std),
-                skewness_description=skewness_description(skewness),
-                kurtosis_description=kurtosis_description(kurtosis))
+                std_description=_geometric_std_description(std),
+                skewness_description=_fw57_skewness_description(skewness),
+                kurtosis_description=_fw57_kurtosis_description(kurtosis))
 
 
 # Referred to Blott & Pye (2012)'s grain size scale
@@ -918,3 +843,147 @@ def all_statistics(classes: ndarray, classes_phi: ndarray, distribution: ndarray
     result["group_bp12_symbol"] = bp12_symbol
     result["group_bp12"] = bp12_description
     return result
+
+
+def all_statistics_batch(classes: ndarray, classes_phi: ndarray, distributions: ndarray) -> List[dict]:
+    """
+    Get the statistical parameters and classification groups of all methods of many grain size distributions.
+    The results are the same as calling `all_statistics` for each distribution, but the moments, percentiles,
+    modes and proportions are calculated for all distributions at once.
+
+    :param classes: The grain size classes in microns.
+    :param classes_phi: The grain size classes in phi values.
+    :param distributions: The frequency distributions of grain size classes, its shape is `(n_samples, n_classes)`.
+        Note, the sum of frequencies of each distribution should be equal to 1.
+    :return: The `list` of `dict`s that `all_statistics` returns for each distribution.
+    """
+    distributions = np.asarray(distributions)
+    n_samples, n_classes = distributions.shape
+
+    def moments(x: ndarray, is_geometric: bool = False):
+        # the mean and std are summed in the same way as `arithmetic`, etc., so that they are exactly the same,
+        # the descriptions are classified by their values and some distributions may be just on the boundaries
+        # the higher moments reuse the weighted squared deviations, avoiding the slow powers
+        mean = np.sum(distributions * x, axis=1)
+        # `geometric` takes the deviations from the logarithm of the geometric mean
+        deviation = x - (np.log(np.exp(mean)) if is_geometric else mean)[:, None]
+        squared_deviation = deviation * deviation
+        weighted_squared_deviation = distributions * squared_deviation
+        std = np.sqrt(np.sum(weighted_squared_deviation, axis=1))
+        skewness = np.einsum("nc,nc->n", weighted_squared_deviation, deviation) / (std ** 3)
+        kurtosis = np.einsum("nc,nc->n", weighted_squared_deviation, squared_deviation) / (std ** 4)
+        return mean, std, skewness, kurtosis
+
+    arithmetic_moments = moments(classes)
+    log_mean, log_std, geometric_skewness, geometric_kurtosis = moments(np.log(classes), is_geometric=True)
+    geometric_moments = (np.exp(log_mean), np.exp(log_std), geometric_skewness, geometric_kurtosis)
+    logarithmic_moments = moments(classes_phi)
+
+    # it's the same linear interpolation as `reversed_phi_ppf`, but for all distributions
+    interval = interval_phi(classes_phi)
+    expand_classes = np.linspace(classes_phi[0] - interval, classes_phi[-1] + interval, n_classes + 2)
+    cumulative = np.zeros((n_samples, n_classes + 2))
+    cumulative[:, 1:-1] = np.cumsum(distributions, axis=1)
+    cumulative[:, -1] = 1.0
+    rows = np.arange(n_samples)
+
+    def ppf(p: float) -> ndarray:
+        # like `np.interp`, take the last cumulative frequency which is not greater than `p`,
+        # so that the flat parts (i.e., the classes without particles) are interpolated in the same way
+        lower = np.count_nonzero(np.less_equal(cumulative, p), axis=1) - 1
+        at_top = lower >= n_classes + 1
+        lower = np.minimum(lower, n_classes)
+        upper = lower + 1
+        slope = (expand_classes[upper] - expand_classes[lower]) / (cumulative[rows, upper] - cumulative[rows, lower])
+        values = slope * (p - cumulative[rows, lower]) + expand_classes[lower]
+        return np.where(at_top, expand_classes[-1], values)
+
+    percents = (0.05, 0.16, 0.25, 0.50, 0.75, 0.84, 0.95)
+    # see `logarithmic_fw57` and `geometric_fw57`
+    phi = {x: ppf(1 - x) for x in percents}
+    log_microns = {x: np.log(to_microns(ppf(x))) for x in percents}
+
+    def fw57(q: Dict[float, ndarray]):
+        mean = np.mean([q[0.16], q[0.50], q[0.84]], axis=0)
+        std = (q[0.84] - q[0.16]) / 4 + (q[0.95] - q[0.05]) / 6.6
+        skewness = (q[0.16] + q[0.84] - 2 * q[0.50]) / 2 / (q[0.84] - q[0.16]) + (
+                q[0.05] + q[0.95] - 2 * q[0.50]) / 2 / (q[0.95] - q[0.05])
+        kurtosis = (q[0.95] - q[0.05]) / (2.44 * (q[0.75] - q[0.25]))
+        return mean, std, skewness, kurtosis
+
+    logarithmic_fw57_moments = fw57(phi)
+    log_mean, log_std, geometric_fw57_skewness, geometric_fw57_kurtosis = fw57(log_microns)
+    geometric_fw57_moments = (np.exp(log_mean), np.exp(log_std), geometric_fw57_skewness, geometric_fw57_kurtosis)
+    median_phi = ppf(0.5)
+    mode_indexes = np.argmax(distributions, axis=1)
+
+    def proportion(lower=-np.inf, upper=np.inf):
+        key = np.logical_and(np.greater_equal(classes_phi, lower), np.less(classes_phi, upper))
+        return np.sum(distributions[:, key], axis=1)
+
+    boulder = proportion(upper=-6)
+    gravel = proportion(-6, -1)
+    sand = proportion(-1, 4)
+    mud = proportion(lower=4)
+    silt = proportion(4, 9)
+    clay = proportion(lower=9)
+    class_scales = [scale_description(phi) for phi in classes_phi]
+    all_scale_proportions = {}
+    for scale in _all_scales():
+        key = np.array([class_scale == scale for class_scale in class_scales])
+        all_scale_proportions[scale] = np.sum(distributions[:, key], axis=1)
+
+    results = []
+    for i, distribution in enumerate(distributions):
+        peaks, _ = find_peaks(distribution)
+        peaks = peaks[np.greater_equal(distribution[peaks], 0.01)]
+
+        def method_statistics(method_moments, describe_std, describe_skewness, describe_kurtosis,
+                              is_geometric: bool):
+            mean, std, skewness, kurtosis = [values[i] for values in method_moments]
+            statistics = dict(mean=mean, std=std, skewness=skewness, kurtosis=kurtosis,
+                              std_description=describe_std(std),
+                              skewness_description=describe_skewness(skewness if is_geometric else -skewness),
+                              kurtosis_description=describe_kurtosis(kurtosis))
+            if is_geometric:
+                mean_phi = to_phi(mean)
+                statistics["median"] = to_microns(median_phi[i])
+            else:
+                mean_phi = mean
+                statistics["median"] = median_phi[i]
+            statistics["mean_description"] = string.capwords(" ".join(scale_description(mean_phi))).strip()
+            statistics["mode"] = (classes if is_geometric else classes_phi)[mode_indexes[i]]
+            statistics["modes"] = tuple((classes if is_geometric else classes_phi)[peaks])
+            return statistics
+
+        if gravel[i] > 0.0:
+            group_folk54 = group_gsm_folk54(gravel[i], sand[i], mud[i])
+            bp12_symbols, bp12_descriptions = group_gsm_bp12(gravel[i], sand[i], mud[i])
+        else:
+            group_folk54 = group_ssc_folk54(sand[i], silt[i], clay[i])
+            bp12_symbols, bp12_descriptions = group_ssc_bp12(sand[i], silt[i], clay[i])
+        result = {
+            "arithmetic": dict(zip(("mean", "std", "skewness", "kurtosis"),
+                                   [values[i] for values in arithmetic_moments])),
+            "geometric": method_statistics(
+                geometric_moments, _geometric_std_description,
+                _moments_skewness_description, _moments_kurtosis_description, is_geometric=True),
+            "logarithmic": method_statistics(
+                logarithmic_moments, _logarithmic_std_description,
+                _moments_skewness_description, _moments_kurtosis_description, is_geometric=False),
+            "geometric_fw57": method_statistics(
+                geometric_fw57_moments, _geometric_std_description,
+                _fw57_skewness_description, _fw57_kurtosis_description, is_geometric=True),
+            "logarithmic_fw57": method_statistics(
+                logarithmic_fw57_moments, _logarithmic_std_description,
+                _fw57_skewness_description, _fw57_kurtosis_description, is_geometric=False),
+            "proportions_gsm": (gravel[i], sand[i], mud[i]),
+            "proportions_ssc": (sand[i], silt[i], clay[i]),
+            "proportions_bgssc": (boulder[i], gravel[i], sand[i], silt[i], clay[i]),
+            "proportions": {scale: values[i] for scale, values in all_scale_proportions.items()},
+            "group_folk54": group_folk54,
+            "_group_bp12_symbols": bp12_symbols,
+            "group_bp12_symbol": "".join(bp12_symbols),
+            "group_bp12": string.capwords(" ".join(bp12_descriptions))}
+        results.append(result)
+    return results
@@ -12,6 +12,8 @@ from .models import KernelType, Dataset, UDMResult, ArtificialDataset
 from .kernels import ProportionModule, get_kernel
 
 torch.set_default_dtype(torch.float64)
+# the epochs between two synchronizations of the losses from the device
+_SYNC_INTERVAL = 50
 
 
 class UDMModule(torch.nn.Module):
@@ -22,8 +24,8 @@ class UDMModule(torch.nn.Module):
         self.n_components = n_components
         self.n_classes = len(classes_phi)
         self._interval_phi = np.abs((classes_phi[0] - classes_phi[-1]) / (classes_phi.shape[0] - 1))
-        self._classes_phi = torch.nn.Parameter(torch.from_numpy(classes_phi).repeat(n_samples, n_components, 1),
-                                               requires_grad=False)
+        # keep one copy of the classes, it is expanded to n_samples x n_members x n_classes without copying
+        self.register_buffer("_classes_phi", torch.from_numpy(classes_phi))
         self.kernel_type = kernel_type
         self.proportions = ProportionModule(n_samples, n_components)
         self.components = get_kernel(kernel_type, n_samples, self.n_components, self.n_classes, x0)
@@ -32,21 +34,31 @@ class UDMModule(torch.nn.Module):
         # n_samples x 1 x n_members
         proportions = self.proportions()
         # n_samples x n_members x n_classes
-        components = self.components(self._classes_phi, self._interval_phi)
+        classes_phi = self._classes_phi.expand(self.n_samples, self.n_components, self.n_classes)
+        components = self.components(classes_phi, self._interval_phi)
         return proportions, components
 
     @property
-    def all_parameters(self) -> np.ndarray:
+    def parameters_tensor(self) -> torch.Tensor:
         with torch.no_grad():
             all_parameters = torch.cat([self.components._params, self.proportions._params], dim=1)
-            all_parameters = all_parameters.detach().cpu().numpy()
-        return all_parameters
+        return all_parameters.detach()
+
+    @property
+    def all_parameters(self) -> np.ndarray:
+        return self.parameters_tensor.cpu().numpy()
+
+    def copy_parameters_to(self, out: torch.Tensor):
+        # concatenate the parameters into the existing tensor (e.g., a slot of the history) directly
+        with torch.no_grad():
+            torch.cat([self.components._params, self.proportions._params], dim=1, out=out)
 
 
 def try_udm(dataset: Union[ArtificialDataset, Dataset], kernel_type: KernelType, n_components: int, x0: ndarray = None,
             device="cpu", pretrain_epochs=200, min_epochs=200, max_epochs=2000, precision: Union[int, float] = 6,
             learning_rate=5e-3, betas=(0.8, 0.5), constraint_level: Union[int, float] = 2.0, need_history=True,
-            logger: logging.Logger = None, progress_callback: Callable[[float], None] = None) -> UDMResult:
+            compile_model=False, logger: logging.Logger = None,
+            progress_callback: Callable[[float], None] = None) -> UDMResult:
     assert isinstance(dataset, (ArtificialDataset, Dataset))
     assert isinstance(kernel_type, KernelType)
     assert isinstance(n_components, int)
@@ -73,6 +85,7 @@ def try_udm(dataset: Union[ArtificialDataset, Dataset], kernel_type: KernelType,
     assert isinstance(beta1, float)
     assert isinstance(beta2, float)
     assert isinstance(constraint_level, (int, float))
+    assert isinstance(compile_model, bool)
     assert pretrain_epochs >= 0
     assert min_epochs > 0
     assert max_epochs > 0
@@ -98,59 +111,91 @@ def try_udm(dataset: Union[ArtificialDataset, Dataset], kernel_type: KernelType,
     Learning rate: {learning_rate}
     Betas of weight decay: {betas}
     Constraint level: {constraint_level}
-    Need history: {need_history}"""
+    Need history: {need_history}
+    Compile model: {compile_model}"""
     logger.debug(start_text)
 
-    observation = torch.from_numpy(dataset.distributions.astype(np.float64)).to(device)
+    observation = torch.from_numpy(dataset.distributions.astype(np.float64))
+    if device[:4] == "cuda":
+        # the copy from page-locked memory is asynchronous, it overlaps with the construction of the module
+        observation = observation.pin_memory().to(device, non_blocking=True)
     udm = UDMModule(len(dataset), n_components, dataset.classes_phi.astype(np.float64), kernel_type, x0).to(device)
     optimizer = torch.optim.Adam(udm.parameters(), lr=learning_rate, betas=betas)
-    distribution_loss_series = []
-    component_loss_series = []
-    history: List[ndarray] = [udm.all_parameters]
-    udm.components.requires_grad_(False)
+
+    def train_step(observation: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+        proportions, components = udm()
+        prediction = (proportions @ components).squeeze(1)
+        distribution_loss = torch.log10(torch.nn.functional.mse_loss(prediction, observation))
+        # component_loss = torch.log10(torch.mean(torch.std(components, dim=0)))
+        component_loss = torch.mean(torch.std(components, dim=0))
+        return distribution_loss, component_loss
+
+    if compile_model:
+        # fuse the element-wise operations, it takes some time to compile, only worthwhile for long training
+        train_step = torch.compile(train_step, mode="reduce-overhead" if device[:4] == "cuda" else "default",
+                                   dynamic=False)
     max_total_epochs = pretrain_epochs + max_epochs
+    # keep the losses and history on the device to avoid synchronizing it at each epoch
+    # without history, only the parameters since last synchronization are kept to find the stopping one
+    loss_buffer = torch.zeros((max_total_epochs, 2), device=device)
+    history_size = max_total_epochs + 1 if need_history else _SYNC_INTERVAL + 1
+    history_buffer = torch.empty((history_size, *udm.parameters_tensor.shape), device=device)
+    udm.copy_parameters_to(history_buffer[0])
+    n_epochs = 0
+    udm.components.requires_grad_(False)
     start = time.time()
     for pretrain_epoch in range(pretrain_epochs):
-        proportions, components = udm()
-        prediction = (proportions @ components).squeeze(1)
-        distribution_loss = torch.log10(torch.mean(torch.square(observation - prediction)))
-        distribution_loss_series.append(distribution_loss.item())
-        component_loss_series.append(0.0)
+        distribution_loss, _ = train_step(observation)
+        loss_buffer[n_epochs, 0] = distribution_loss.detach()
         optimizer.zero_grad()
         distribution_loss.backward()
         torch.nn.utils.clip_grad_norm_(udm.parameters(), 1e-1)
         optimizer.step()
-        if need_history:
-            history.append(udm.all_parameters)
+        n_epochs += 1
+        udm.copy_parameters_to(history_buffer[n_epochs % history_size])
         if progress_callback is not None:
             progress_callback(pretrain_epoch / max_total_epochs)
 
     udm.components.requires_grad_(True)
+    n_checked = n_epochs
+    n_kept = None
     for epoch in range(max_epochs):
         # train
-        proportions, components = udm()
-        prediction = (proportions @ components).squeeze(1)
-        distribution_loss = torch.log10(torch.mean(torch.square(prediction - observation)))
-        # component_loss = torch.log10(torch.mean(torch.std(components, dim=0)))
-        component_loss = torch.mean(torch.std(components, dim=0))
+        distribution_loss, component_loss = train_step(observation)
         loss = distribution_loss + (10 ** constraint_level) * component_loss
-        if np.isnan(loss.item()):
-            logger.warning("Loss is NaN, training has beem terminated.")
-            break
-        distribution_loss_series.append(distribution_loss.item())
-        component_loss_series.append((10 ** constraint_level) * component_loss.item())
+        loss_buffer[n_epochs, 0] = distribution_loss.detach()
+        loss_buffer[n_epochs, 1] = (10 ** constraint_level) * component_loss.detach()
         optimizer.zero_grad()
         loss.backward()
         torch.nn.utils.clip_grad_norm_(udm.parameters(), 1e-1)
         optimizer.step()
-        if need_history:
-            history.append(udm.all_parameters)
+        n_epochs += 1
+        udm.copy_parameters_to(history_buffer[n_epochs % history_size])
         if progress_callback is not None:
             progress_callback((pretrain_epochs + epoch) / max_total_epochs)
-        if epoch > min_epochs:
-            delta_loss = np.mean(distribution_loss_series[-100:-80]) - np.mean(distribution_loss_series[-20:])
-            if delta_loss < 10 ** (-precision):
+        if n_epochs % _SYNC_INTERVAL == 0 or epoch == max_epochs - 1:
+            # check the epochs since last synchronization, and drop the epochs after the stopping one
+            # the convergence check only looks back 100 epochs, so only the tail of losses is copied
+            offset = max(0, n_checked - 99)
+            losses = loss_buffer[offset:n_epochs].cpu().numpy()
+            # flag the NaN losses of all these epochs by one call, instead of testing the scalars one by one
+            nan_flags = np.isnan(losses[:, 0] + losses[:, 1])
+            for i in range(n_checked, n_epochs):
+                if nan_flags[i - offset]:
+                    logger.warning("Loss is NaN, training has beem terminated.")
+                    n_kept = i
+                    break
+                if i - pretrain_epochs > min_epochs:
+                    distribution_loss_series = losses[:i - offset + 1, 0]
+                    delta_loss = np.mean(distribution_loss_series[-100:-80]) - np.mean(distribution_loss_series[-20:])
+                    if delta_loss < 10 ** (-precision):
+                        n_kept = i + 1
+                        break
+            n_checked = n_epochs
+            if n_kept is not None:
                 break
+    if n_kept is None:
+        n_kept = n_epochs
 
     # algorithm finished, preparing the result
     if device[:4] == "cuda":
@@ -158,16 +203,18 @@ def try_udm(dataset: Union[ArtificialDataset, Dataset], kernel_type: KernelType,
     time_spent = time.time() - start
     settings = dict(device=device, pretrain_epochs=pretrain_epochs, min_epochs=min_epochs,
                     max_epochs=max_epochs, precision=precision, learning_rate=learning_rate,
-                    betas=betas, constraint_level=constraint_level, need_history=need_history)
-    distribution_loss_series = np.array(distribution_loss_series)
-    component_loss_series = np.array(component_loss_series)
+                    betas=betas, constraint_level=constraint_level, need_history=need_history,
+                    compile_model=compile_model)
+    losses = loss_buffer[:n_kept].cpu().numpy()
+    distribution_loss_series = losses[:, 0]
+    component_loss_series = losses[:, 1]
     loss_series = {"total": distribution_loss_series + component_loss_series,
                    "distribution": distribution_loss_series,
                    "component": component_loss_series}
     if need_history:
-        parameters = np.concatenate([np.expand_dims(p, axis=0) for p in history], axis=0)
+        parameters = history_buffer[:n_kept + 1].cpu().numpy()
     else:
-        parameters = np.expand_dims(udm.all_parameters, axis=0)
+        parameters = history_buffer[n_kept % history_size].unsqueeze(0).cpu().numpy()
     result = UDMResult(dataset, kernel_type, n_components, parameters, time_spent, x0, settings, loss_series)
     if progress_callback is not None:
         progress_callback(1.0)
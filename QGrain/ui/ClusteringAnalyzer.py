@@ -59,6 +59,7 @@ class ClusteringAnalyzer(QtWidgets.QWidget):
         self.normal_msg = QtWidgets.QMessageBox(self)
         self.file_dialog = QtWidgets.QFileDialog(parent=self)
         self._last_dataset = None
+        self._last_transformed = None
         self._last_result = None
 
     def show_message(self, title: str, message: str):
@@ -95,6 +96,7 @@ class ClusteringAnalyzer(QtWidgets.QWidget):
         if dataset is None:
             return
         self._last_dataset = dataset
+        self._last_transformed = None
         self._last_result = None
         self.p_input.setMaximum(len(dataset))
         self.n_clusters_input.setMaximum(len(dataset) - 1)
@@ -115,10 +117,12 @@ class ClusteringAnalyzer(QtWidgets.QWidget):
                 return
         self.logger.debug(
             f"Calculate the linkage matrix with the method ({self.linkage_name}) and metric ({self.metric_name}).")
-        pca = PCA(n_components=0.95)
-        transformed = pca.fit_transform(self._last_dataset.distributions)
+        # the transformed data only depends on the dataset, reuse it when the linkage method or metric is changed
+        if self._last_transformed is None:
+            pca = PCA(n_components=0.95)
+            self._last_transformed = pca.fit_transform(self._last_dataset.distributions)
         try:
-            linkage_matrix = linkage(transformed, method=self.linkage_name, metric=self.metric_name)
+            linkage_matrix = linkage(self._last_transformed, method=self.linkage_name, metric=self.metric_name)
         except ValueError as e:
             self.logger.error(f"The linkage method {self.linkage_name} is not compatible with "
                               f"the distance metric {self.metric_name}: {e}.")
@@ -11,7 +11,8 @@ from grpc._channel import _InactiveRpcError
 from ..models import KernelType, Dataset, EMMAResult
 from ..charts.EMMAResultChart import EMMAResultChart
 from ..protos.client import QGrainClient
-from ..io import save_emma
+from ..io import save_emma, save_dump
+from . import create_progress_callback
 from .EMMASettings import EMMASettings
 from .ParameterEditor import ParameterEditor
 
@@ -186,12 +187,8 @@ class EMMAAnalyzer(QtWidgets.QWidget):
             self.tr("Performing the EMMA algorithm..."), self.tr("Cancel"), 0, 100, self)
         progress_dialog.setWindowTitle("QGrain")
         progress_dialog.setWindowModality(QtCore.Qt.WindowModal)
-
-        def callback(progress: float):
-            if progress_dialog.wasCanceled():
-                raise StopIteration()
-            progress_dialog.setValue(int(progress * 100))
-            QtCore.QCoreApplication.processEvents()
+        # the callback is called after every epoch, coalesce the repaints to about 30 per second
+        callback = create_progress_callback(progress_dialog, interval=33)
         try:
             from ..emma import try_emma
             result = try_emma(self._dataset, **settings, progress_callback=callback)
@@ -279,9 +276,8 @@ class EMMAAnalyzer(QtWidgets.QWidget):
                 progress_dialog.close()
         # Binary File
         else:
-            with open(filename, "wb") as f:
-                pickle.dump(self.selected_result, f)
-                self.logger.info("The selected EMMA result has been dumped.")
+            save_dump(self.selected_result, filename)
+            self.logger.info("The selected EMMA result has been dumped.")
 
     def changeEvent(self, event: QtCore.QEvent):
         if event.type() == QtCore.QEvent.LanguageChange:
@@ -1,9 +1,11 @@
 import logging
 import os
 import string
+from concurrent.futures import ThreadPoolExecutor
 from typing import *
 
 from PySide6 import QtCore, QtGui, QtWidgets
+from PySide6.QtCore import QT_TRANSLATE_NOOP
 from qt_material import apply_stylesheet, list_themes
 
 from .. import QGRAIN_ROOT_PATH
@@ -11,31 +13,70 @@ from ..models import Dataset
 from ..protos.client import QGrainClient
 from ..io import save_pca, save_statistics
 from ..utils import udm_to_ssu
-from . import EXTRA
+from . import EXTRA, create_progress_callback
 from .About import About
-from .ClusteringAnalyzer import ClusteringAnalyzer
-from .DatasetGenerator import DatasetGenerator
 from .DatasetLoader import DatasetLoader
-from .EMMAAnalyzer import EMMAAnalyzer
 from .EMMASettings import EMMASettings
 from .RuntimeLog import *
-from .PCAAnalyzer import PCAAnalyzer
 from .ParameterEditor import ParameterEditor
-from .SSUAnalyzer import SSUAnalyzer
 from .SSUMulticoreAnalyzer import SSUMulticoreAnalyzer
 from .SSUSettings import SSUSettings
-from .StatisticalAnalyzer import StatisticalAnalyzer
-from .UDMAnalyzer import UDMAnalyzer
 from .UDMSettings import UDMSettings
 
 
+class BackgroundTask(QtCore.QThread):
+    progress_changed = QtCore.Signal(int)
+
+    def __init__(self, function: Callable[[Callable[[float], None]], Any], parent=None):
+        super().__init__(parent)
+        self._function = function
+        self._last_value = -1
+        self.result = None
+        self.error: Optional[Exception] = None
+
+    def report_progress(self, progress: float):
+        # the task is stopped by raising `StopIteration` in the progress callback
+        if self.isInterruptionRequested():
+            raise StopIteration()
+        value = int(progress*100)
+        if value != self._last_value:
+            self._last_value = value
+            self.progress_changed.emit(value)
+
+    def run(self):
+        try:
+            self.result = self._function(self.report_progress)
+        except Exception as e:
+            self.error = e
+
+    def exec_with(self, progress_dialog: QtWidgets.QProgressDialog):
+        # the events are processed by a local event loop, the task does not need to process them itself
+        self.progress_changed.connect(progress_dialog.setValue)
+        progress_dialog.canceled.connect(self.requestInterruption)
+        loop = QtCore.QEventLoop()
+        self.finished.connect(loop.quit)
+        self.start()
+        loop.exec()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
 class MainWindow(QtWidgets.QMainWindow):
     logger = logging.getLogger("QGrain.MainWindow")
+    SUPPORTED_LANGUAGES = (("en", "English"),
+                           ("zh_CN", "简体中文"))
+    DEFAULT_THEME = os.path.join(QGRAIN_ROOT_PATH, "assets", "default_theme.xml")
 
     def __init__(self):
         super().__init__()
         self._dataset: Optional[Dataset] = None
         self._translator: Optional[QtCore.QTranslator] = None
+        # the translators are loaded once, and reused when the language is switched again
+        self._translators: Dict[str, QtCore.QTranslator] = {}
+        # the current language and theme are recorded when they are switched
+        self._language = self.SUPPORTED_LANGUAGES[0][0]
+        self._theme = self.DEFAULT_THEME
         self._client = QGrainClient()
         self.setWindowTitle("QGrain")
         self.ssu_setting_dialog = SSUSettings(self)
@@ -46,105 +87,133 @@ class MainWindow(QtWidgets.QMainWindow):
         self.tab_widget = QtWidgets.QTabWidget(self)
         self.tab_widget.setTabPosition(QtWidgets.QTabWidget.West)
         self.setCentralWidget(self.tab_widget)
-        self.dataset_generator = DatasetGenerator()
-        self.tab_widget.addTab(self.dataset_generator, self.tr("Generator"))
-        self.dataset_viewer = StatisticalAnalyzer()
-        self.tab_widget.addTab(self.dataset_viewer, self.tr("Statistics"))
-        self.pca_analyzer = PCAAnalyzer()
-        self.tab_widget.addTab(self.pca_analyzer, self.tr("PCA"))
-        self.clustering_analyzer = ClusteringAnalyzer()
-        self.tab_widget.addTab(self.clustering_analyzer, self.tr("Clustering"))
-        self.ssu_analyzer = SSUAnalyzer(self.ssu_setting_dialog, self.parameter_editor)
-        self.tab_widget.addTab(self.ssu_analyzer, self.tr("SSU"))
-        self.emma_analyzer = EMMAAnalyzer(self.emma_setting_dialog, self.parameter_editor, client=self._client)
-        self.tab_widget.addTab(self.emma_analyzer, self.tr("EMMA"))
-        self.udm_analyzer = UDMAnalyzer(self.udm_setting_dialog, self.parameter_editor, client=self._client)
-        self.tab_widget.addTab(self.udm_analyzer, self.tr("UDM"))
-
+        # the translatable texts of menus and actions are recorded as (widget, setter, source text),
+        # `retranslate` only needs to walk through them
+        self._i18n: List[Tuple[QtCore.QObject, str, str]] = []
+        # the analyzers are created when their tabs are shown or they are used at the first time,
+        # until then, the tabs only hold empty placeholders
+        self._tab_names = (
+            QT_TRANSLATE_NOOP("MainWindow", "Generator"), QT_TRANSLATE_NOOP("MainWindow", "Statistics"),
+            QT_TRANSLATE_NOOP("MainWindow", "PCA"), QT_TRANSLATE_NOOP("MainWindow", "Clustering"),
+            QT_TRANSLATE_NOOP("MainWindow", "SSU"), QT_TRANSLATE_NOOP("MainWindow", "EMMA"),
+            QT_TRANSLATE_NOOP("MainWindow", "UDM"))
+        self._tabs: List[Optional[QtWidgets.QWidget]] = [None] * len(self._tab_names)
+        for name in self._tab_names:
+            self.tab_widget.addTab(QtWidgets.QWidget(), self.tr(name))
+        self.tab_widget.currentChanged.connect(self.get_tab)
+        self.get_tab(self.tab_widget.currentIndex())
+
+        menu_bar = self.menuBar()
         # Open
-        self.open_menu = self.menuBar().addMenu(self.tr("Open"))
-        self.open_dataset_action = self.open_menu.addAction(self.tr("Grain Size Dataset"))
+        self.open_menu = self._translatable(
+            menu_bar.addMenu(""), "setTitle", QT_TRANSLATE_NOOP("MainWindow", "Open"))
+        self.open_dataset_action = self._translatable(
+            self.open_menu.addAction(""), "setText", QT_TRANSLATE_NOOP("MainWindow", "Grain Size Dataset"))
         self.open_dataset_action.triggered.connect(lambda: self.load_dataset_dialog.show())
-        self.load_ssu_result_action = self.open_menu.addAction(self.tr("SSU Results"))
-        self.load_ssu_result_action.triggered.connect(self.ssu_analyzer.result_view.load_results)
-        self.load_emma_result_action = self.open_menu.addAction(self.tr("EMMA Result"))
-        self.load_emma_result_action.triggered.connect(self.emma_analyzer.load_result)
-        self.load_udm_result_action = self.open_menu.addAction(self.tr("UDM Result"))
-        self.load_udm_result_action.triggered.connect(self.udm_analyzer.load_result)
+        self.load_ssu_result_action = self._translatable(
+            self.open_menu.addAction(""), "setText", QT_TRANSLATE_NOOP("MainWindow", "SSU Results"))
+        self.load_ssu_result_action.triggered.connect(lambda: self.ssu_analyzer.result_view.load_results())
+        self.load_emma_result_action = self._translatable(
+            self.open_menu.addAction(""), "setText", QT_TRANSLATE_NOOP("MainWindow", "EMMA Result"))
+        self.load_emma_result_action.triggered.connect(lambda: self.emma_analyzer.load_result())
+        self.load_udm_result_action = self._translatable(
+            self.open_menu.addAction(""), "setText", QT_TRANSLATE_NOOP("MainWindow", "UDM Result"))
+        self.load_udm_result_action.triggered.connect(lambda: self.udm_analyzer.load_result())
 
         # Save
-        self.save_menu = self.menuBar().addMenu(self.tr("Save"))
-        self.save_artificial_action = self.save_menu.addAction(self.tr("Artificial Dataset"))
-        self.save_artificial_action.triggered.connect(self.dataset_generator.on_save_clicked)
-        self.save_statistics_action = self.save_menu.addAction(self.tr("Statistical Result"))
+        self.save_menu = self._translatable(
+            menu_bar.addMenu(""), "setTitle", QT_TRANSLATE_NOOP("MainWindow", "Save"))
+        self.save_artificial_action = self._translatable(
+            self.save_menu.addAction(""), "setText", QT_TRANSLATE_NOOP("MainWindow", "Artificial Dataset"))
+        self.save_artificial_action.triggered.connect(lambda: self.dataset_generator.on_save_clicked())
+        self.save_statistics_action = self._translatable(
+            self.save_menu.addAction(""), "setText", QT_TRANSLATE_NOOP("MainWindow", "Statistical Result"))
         self.save_statistics_action.triggered.connect(self.on_save_statistics_clicked)
-        self.save_pca_action = self.save_menu.addAction(self.tr("PCA Result"))
+        self.save_pca_action = self._translatable(
+            self.save_menu.addAction(""), "setText", QT_TRANSLATE_NOOP("MainWindow", "PCA Result"))
         self.save_pca_action.triggered.connect(self.on_save_pca_clicked)
-        self.save_clustering_action = self.save_menu.addAction(self.tr("Clustering Result"))
-        self.save_clustering_action.triggered.connect(self.clustering_analyzer.save_result)
-        self.save_ssu_result_action = self.save_menu.addAction(self.tr("SSU Results"))
-        self.save_ssu_result_action.triggered.connect(self.ssu_analyzer.result_view.save_results)
-        self.save_emma_result_action = self.save_menu.addAction(self.tr("EMMA Result"))
-        self.save_emma_result_action.triggered.connect(self.emma_analyzer.save_selected_result)
-        self.save_udm_result_action = self.save_menu.addAction(self.tr("UDM Result"))
-        self.save_udm_result_action.triggered.connect(self.udm_analyzer.save_selected_result)
+        self.save_clustering_action = self._translatable(
+            self.save_menu.addAction(""), "setText", QT_TRANSLATE_NOOP("MainWindow", "Clustering Result"))
+        self.save_clustering_action.triggered.connect(lambda: self.clustering_analyzer.save_result())
+        self.save_ssu_result_action = self._translatable(
+            self.save_menu.addAction(""), "setText", QT_TRANSLATE_NOOP("MainWindow", "SSU Results"))
+        self.save_ssu_result_action.triggered.connect(lambda: self.ssu_analyzer.result_view.save_results())
+        self.save_emma_result_action = self._translatable(
+            self.save_menu.addAction(""), "setText", QT_TRANSLATE_NOOP("MainWindow", "EMMA Result"))
+        self.save_emma_result_action.triggered.connect(lambda: self.emma_analyzer.save_selected_result())
+        self.save_udm_result_action = self._translatable(
+            self.save_menu.addAction(""), "setText", QT_TRANSLATE_NOOP("MainWindow", "UDM Result"))
+        self.save_udm_result_action.triggered.connect(lambda: self.udm_analyzer.save_selected_result())
 
         # Config
-        self.config_menu = self.menuBar().addMenu(self.tr("Configure"))
-        self.config_ssu_action = self.config_menu.addAction(self.tr("SSU Algorithm"))
+        self.config_menu = self._translatable(
+            menu_bar.addMenu(""), "setTitle", QT_TRANSLATE_NOOP("MainWindow", "Configure"))
+        self.config_ssu_action = self._translatable(
+            self.config_menu.addAction(""), "setText", QT_TRANSLATE_NOOP("MainWindow", "SSU Algorithm"))
         self.config_ssu_action.triggered.connect(self.ssu_setting_dialog.show)
-        self.config_emma_action = self.config_menu.addAction(self.tr("EMMA Algorithm"))
+        self.config_emma_action = self._translatable(
+            self.config_menu.addAction(""), "setText", QT_TRANSLATE_NOOP("MainWindow", "EMMA Algorithm"))
         self.config_emma_action.triggered.connect(self.emma_setting_dialog.show)
-        self.config_udm_action = self.config_menu.addAction(self.tr("UDM Algorithm"))
+        self.config_udm_action = self._translatable(
+            self.config_menu.addAction(""), "setText", QT_TRANSLATE_NOOP("MainWindow", "UDM Algorithm"))
         self.config_udm_action.triggered.connect(self.udm_setting_dialog.show)
 
         # Experimental
-        self.experimental_menu = self.menuBar().addMenu(self.tr("Experimental"))
-        self.ssu_fit_all_action = self.experimental_menu.addAction(
-            self.tr("Perform SSU For All Samples"))
+        self.experimental_menu = self._translatable(
+            menu_bar.addMenu(""), "setTitle", QT_TRANSLATE_NOOP("MainWindow", "Experimental"))
+        self.ssu_fit_all_action = self._translatable(
+            self.experimental_menu.addAction(""), "setText",
+            QT_TRANSLATE_NOOP("MainWindow", "Perform SSU For All Samples"))
         self.ssu_fit_all_action.triggered.connect(self.ssu_fit_all_samples)
-        self.convert_udm_to_ssu_action = self.experimental_menu.addAction(
-            self.tr("Convert Selected UDM Result To SSU Results"))
+        self.convert_udm_to_ssu_action = self._translatable(
+            self.experimental_menu.addAction(""), "setText",
+            QT_TRANSLATE_NOOP("MainWindow", "Convert Selected UDM Result To SSU Results"))
         self.convert_udm_to_ssu_action.triggered.connect(self.convert_udm_to_ssu)
-        self.save_all_ssu_figures_action = self.experimental_menu.addAction(
-            self.tr("Save Figures For All SSU Results"))
+        self.save_all_ssu_figures_action = self._translatable(
+            self.experimental_menu.addAction(""), "setText",
+            QT_TRANSLATE_NOOP("MainWindow", "Save Figures For All SSU Results"))
         self.save_all_ssu_figures_action.triggered.connect(self.save_all_ssu_figure)
 
         # Language
-        self.language_menu = self.menuBar().addMenu(self.tr("Language"))
+        self.language_menu = self._translatable(
+            menu_bar.addMenu(""), "setTitle", QT_TRANSLATE_NOOP("MainWindow", "Language"))
         self.language_group = QtGui.QActionGroup(self.language_menu)
         self.language_group.setExclusive(True)
+        # the actions carry their keys, one connection of the group handles all of them
+        self.language_group.triggered.connect(lambda action: self.switch_language(action.data()))
         self.language_actions: List[QtGui.QAction] = []
         for key, name in self.supported_languages:
             action = self.language_group.addAction(name)
             action.setCheckable(True)
-            action.triggered.connect(lambda checked=False, language=key: self.switch_language(language))
+            action.setData(key)
             self.language_menu.addAction(action)
             self.language_actions.append(action)
         self.language_actions[0].setChecked(True)
 
         # Theme
-        self.theme_menu = self.menuBar().addMenu(self.tr("Theme"))
+        self.theme_menu = self._translatable(
+            menu_bar.addMenu(""), "setTitle", QT_TRANSLATE_NOOP("MainWindow", "Theme"))
         self.theme_group = QtGui.QActionGroup(self.theme_menu)
         self.theme_group.setExclusive(True)
+        self.theme_group.triggered.connect(lambda action: self.switch_theme(*action.data()))
         self.theme_actions = []
-        self.default_theme_action = self.theme_group.addAction(self.tr("Default"))
+        self.default_theme_action = self._translatable(
+            self.theme_group.addAction(""), "setText", QT_TRANSLATE_NOOP("MainWindow", "Default"))
         self.default_theme_action.setCheckable(True)
         self.default_theme_action.setChecked(True)
-        self.default_theme_action.triggered.connect(lambda: apply_stylesheet(app, theme=os.path.join(
-            QGRAIN_ROOT_PATH, "assets", "default_theme.xml"), invert_secondary=True, extra=EXTRA))
+        self.default_theme_action.setData((self.DEFAULT_THEME, True))
         self.theme_menu.addAction(self.default_theme_action)
         self.theme_actions.append(self.default_theme_action)
-        self.light_theme_menu = self.theme_menu.addMenu(self.tr("Light Theme"))
-        self.dark_theme_menu = self.theme_menu.addMenu(self.tr("Dark Theme"))
+        self.light_theme_menu = self._translatable(
+            self.theme_menu.addMenu(""), "setTitle", QT_TRANSLATE_NOOP("MainWindow", "Light Theme"))
+        self.dark_theme_menu = self._translatable(
+            self.theme_menu.addMenu(""), "setTitle", QT_TRANSLATE_NOOP("MainWindow", "Dark Theme"))
         for theme in list_themes():
             theme_name = string.capwords(" ".join(theme[:-4].split("_")[1:]))
             action = self.theme_group.addAction(theme_name)
             action.setCheckable(True)
-            app = QtCore.QCoreApplication.instance()
             invert = theme.startswith("light")
-            action.triggered.connect(lambda checked=False, t=theme, i=invert:
-                                     apply_stylesheet(app, theme=t, invert_secondary=i, extra=EXTRA))
+            action.setData((theme, invert))
             self.theme_actions.append(action)
             if invert:
                 self.light_theme_menu.addAction(action)
@@ -152,54 +221,153 @@ class MainWindow(QtWidgets.QMainWindow):
                 self.dark_theme_menu.addAction(action)
 
         # Log
-        self.log_action = QtGui.QAction(self.tr("Log"))
+        self.log_action = self._translatable(
+            QtGui.QAction(""), "setText", QT_TRANSLATE_NOOP("MainWindow", "Log"))
         self.log_action.triggered.connect(lambda: self.log_dialog.show())
-        self.menuBar().addAction(self.log_action)
+        menu_bar.addAction(self.log_action)
 
         # About
-        self.about_action = QtGui.QAction(self.tr("About"))
+        self.about_action = self._translatable(
+            QtGui.QAction(""), "setText", QT_TRANSLATE_NOOP("MainWindow", "About"))
         self.about_action.triggered.connect(lambda: self.about_dialog.show())
-        self.menuBar().addAction(self.about_action)
+        menu_bar.addAction(self.about_action)
 
         # Connect signals
-        self.ssu_multicore_analyzer.result_finished.connect(self.ssu_analyzer.result_view.add_result)
+        self.ssu_multicore_analyzer.result_finished.connect(
+            lambda result: self.ssu_analyzer.result_view.add_result(result))
         self.load_dataset_dialog = DatasetLoader(self)
         self.load_dataset_dialog.dataset_loaded.connect(self.on_dataset_loaded)
-        self.load_dataset_dialog.dataset_loaded.connect(self.dataset_viewer.on_dataset_loaded)
-        self.load_dataset_dialog.dataset_loaded.connect(self.pca_analyzer.on_dataset_loaded)
-        self.load_dataset_dialog.dataset_loaded.connect(self.clustering_analyzer.on_dataset_loaded)
-        self.load_dataset_dialog.dataset_loaded.connect(self.ssu_analyzer.on_dataset_loaded)
-        self.load_dataset_dialog.dataset_loaded.connect(self.emma_analyzer.on_dataset_loaded)
-        self.load_dataset_dialog.dataset_loaded.connect(self.udm_analyzer.on_dataset_loaded)
-        self.log_dialog = RuntimeLog(self)
-        self.about_dialog = About(self)
-        self.file_dialog = QtWidgets.QFileDialog(parent=self)
-        self.normal_msg = QtWidgets.QMessageBox(self)
-        self.close_msg = QtWidgets.QMessageBox(self)
-        self.close_msg.setWindowTitle(self.tr("Warning"))
-        self.close_msg.setText(self.tr("Closing this window will terminate all running tasks, are you sure to close it?"))
-        self.close_msg.setStandardButtons(QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No)
-        self.close_msg.setDefaultButton(QtWidgets.QMessageBox.No)
+        # the dialogs are created when they are used at the first time
+        self._log_dialog: Optional[RuntimeLog] = None
+        self._about_dialog: Optional[About] = None
+        self._file_dialog: Optional[QtWidgets.QFileDialog] = None
+        self._normal_msg: Optional[QtWidgets.QMessageBox] = None
+        self._close_msg: Optional[QtWidgets.QMessageBox] = None
+
+    def _translatable(self, widget: QtCore.QObject, setter: str, source: str):
+        self._i18n.append((widget, setter, source))
+        getattr(widget, setter)(self.tr(source))
+        return widget
+
+    def _create_tab(self, index: int) -> QtWidgets.QWidget:
+        # the modules of analyzers are imported here, they are not loaded until their tabs are used
+        if index == 0:
+            from .DatasetGenerator import DatasetGenerator
+            return DatasetGenerator()
+        elif index == 1:
+            from .StatisticalAnalyzer import StatisticalAnalyzer
+            return StatisticalAnalyzer()
+        elif index == 2:
+            from .PCAAnalyzer import PCAAnalyzer
+            return PCAAnalyzer()
+        elif index == 3:
+            from .ClusteringAnalyzer import ClusteringAnalyzer
+            return ClusteringAnalyzer()
+        elif index == 4:
+            from .SSUAnalyzer import SSUAnalyzer
+            return SSUAnalyzer(self.ssu_setting_dialog, self.parameter_editor)
+        elif index == 5:
+            from .EMMAAnalyzer import EMMAAnalyzer
+            return EMMAAnalyzer(self.emma_setting_dialog, self.parameter_editor, client=self._client)
+        elif index == 6:
+            from .UDMAnalyzer import UDMAnalyzer
+            return UDMAnalyzer(self.udm_setting_dialog, self.parameter_editor, client=self._client)
+        else:
+            raise NotImplementedError(index)
+
+    def get_tab(self, index: int) -> QtWidgets.QWidget:
+        widget = self._tabs[index]
+        if widget is None:
+            widget = self._create_tab(index)
+            self._tabs[index] = widget
+            current_index = self.tab_widget.currentIndex()
+            placeholder = self.tab_widget.widget(index)
+            text = self.tab_widget.tabText(index)
+            self.tab_widget.blockSignals(True)
+            self.tab_widget.removeTab(index)
+            self.tab_widget.insertTab(index, widget, text)
+            self.tab_widget.setCurrentIndex(current_index)
+            self.tab_widget.blockSignals(False)
+            placeholder.deleteLater()
+            # the analyzer missed the dataset loaded before
+            if self._dataset is not None and hasattr(widget, "on_dataset_loaded"):
+                widget.on_dataset_loaded(self._dataset)
+        return widget
+
+    @property
+    def dataset_generator(self) -> QtWidgets.QWidget:
+        return self.get_tab(0)
+
+    @property
+    def dataset_viewer(self) -> QtWidgets.QWidget:
+        return self.get_tab(1)
+
+    @property
+    def pca_analyzer(self) -> QtWidgets.QWidget:
+        return self.get_tab(2)
+
+    @property
+    def clustering_analyzer(self) -> QtWidgets.QWidget:
+        return self.get_tab(3)
+
+    @property
+    def ssu_analyzer(self) -> QtWidgets.QWidget:
+        return self.get_tab(4)
+
+    @property
+    def emma_analyzer(self) -> QtWidgets.QWidget:
+        return self.get_tab(5)
+
+    @property
+    def udm_analyzer(self) -> QtWidgets.QWidget:
+        return self.get_tab(6)
+
+    @property
+    def log_dialog(self) -> RuntimeLog:
+        if self._log_dialog is None:
+            self._log_dialog = RuntimeLog(self)
+        return self._log_dialog
 
     @property
-    def supported_languages(self) -> List[Tuple[str, str]]:
-        languages = [("en", "English"),
-                     ("zh_CN", "简体中文")]
-        return languages
+    def about_dialog(self) -> About:
+        if self._about_dialog is None:
+            self._about_dialog = About(self)
+        return self._about_dialog
+
+    @property
+    def file_dialog(self) -> QtWidgets.QFileDialog:
+        if self._file_dialog is None:
+            self._file_dialog = QtWidgets.QFileDialog(parent=self)
+        return self._file_dialog
+
+    @property
+    def normal_msg(self) -> QtWidgets.QMessageBox:
+        if self._normal_msg is None:
+            self._normal_msg = QtWidgets.QMessageBox(self)
+        return self._normal_msg
+
+    @property
+    def close_msg(self) -> QtWidgets.QMessageBox:
+        if self._close_msg is None:
+            self._close_msg = QtWidgets.QMessageBox(self)
+            self._close_msg.setWindowTitle(self.tr("Warning"))
+            self._close_msg.setText(self.tr(
+                "Closing this window will terminate all running tasks, are you sure to close it?"))
+            self._close_msg.setStandardButtons(QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No)
+            self._close_msg.setDefaultButton(QtWidgets.QMessageBox.No)
+        return self._close_msg
+
+    @property
+    def supported_languages(self) -> Sequence[Tuple[str, str]]:
+        return self.SUPPORTED_LANGUAGES
 
     @property
     def language(self) -> str:
-        for i, language_action in enumerate(self.language_actions):
-            if language_action.isChecked():
-                key, name = self.supported_languages[i]
-                return key
+        return self._language
 
     @property
     def theme(self) -> str:
-        for i, theme_action in enumerate(self.theme_actions):
-            if theme_action.isChecked():
-                theme = list_themes()[i]
-                return theme
+        return self._theme
 
     def show_message(self, title: str, message: str):
         self.normal_msg.setWindowTitle(title)
@@ -219,6 +387,9 @@ class MainWindow(QtWidgets.QMainWindow):
         if dataset is None:
             return
         self._dataset = dataset
+        for widget in self._tabs:
+            if widget is not None and hasattr(widget, "on_dataset_loaded"):
+                widget.on_dataset_loaded(dataset)
 
     def ssu_fit_all_samples(self):
         tasks = self.ssu_analyzer.get_all_tasks()
@@ -236,13 +407,18 @@ class MainWindow(QtWidgets.QMainWindow):
             0, 100, self)
         progress_dialog.setWindowTitle("QGrain")
         progress_dialog.setWindowModality(QtCore.Qt.WindowModal)
+        progress_dialog.setMinimumDuration(200)
 
-        def callback(progress: float):
-            if progress_dialog.wasCanceled():
-                raise StopIteration()
-            progress_dialog.setValue(int(progress*100))
-            QtCore.QCoreApplication.processEvents()
-        ssu_results = udm_to_ssu(udm_result, logger=self.logger, progress_callback=callback)
+        # the results are converted by a background thread, the window keeps responsive
+        task = BackgroundTask(lambda callback: udm_to_ssu(udm_result, logger=self.logger,
+                                                          progress_callback=callback), self)
+        try:
+            ssu_results = task.exec_with(progress_dialog)
+        except StopIteration:
+            self.logger.info("The converting task was canceled.")
+            return
+        finally:
+            task.deleteLater()
         self.ssu_analyzer.result_view.add_results(ssu_results)
 
     def save_all_ssu_figure(self):
@@ -260,20 +436,19 @@ class MainWindow(QtWidgets.QMainWindow):
             0, 100, self)
         progress_dialog.setWindowTitle("QGrain")
         progress_dialog.setWindowModality(QtCore.Qt.WindowModal)
+        progress_dialog.setMinimumDuration(200)
 
-        def callback(progress: float):
-            if progress_dialog.wasCanceled():
-                raise StopIteration()
-            progress_dialog.setValue(int(progress*100))
-            QtCore.QCoreApplication.processEvents()
+        callback = create_progress_callback(progress_dialog)
         try:
             all_results = self.ssu_analyzer.result_view.all_results
-            for i, result in enumerate(all_results):
-                self.ssu_analyzer.result_chart.show_chart(result)
-                image = self.ssu_analyzer.result_chart.grab()
-                filename = os.path.join(directory, f"{i}.png")
-                image.save(filename)
-                callback(i/len(all_results))
+            chart = self.ssu_analyzer.result_chart
+            # the images are encoded and written by a background thread while the next figure is drawn
+            with ThreadPoolExecutor(max_workers=1, thread_name_prefix="QGrainFigureSaver") as executor:
+                for i, result in enumerate(all_results):
+                    chart.show_chart(result)
+                    filename = os.path.join(directory, f"{i}.png")
+                    executor.submit(chart.to_image().save, filename)
+                    callback(i/len(all_results))
             callback(1.0)
         except StopIteration as e:
             self.logger.info("The saving task was canceled.")
@@ -295,12 +470,9 @@ class MainWindow(QtWidgets.QMainWindow):
             0, 100, self)
         progress_dialog.setWindowTitle("QGrain")
         progress_dialog.setWindowModality(QtCore.Qt.WindowModal)
+        progress_dialog.setMinimumDuration(200)
 
-        def callback(progress: float):
-            if progress_dialog.wasCanceled():
-                raise StopIteration()
-            progress_dialog.setValue(int(progress*100))
-            QtCore.QCoreApplication.processEvents()
+        callback = create_progress_callback(progress_dialog)
         try:
             save_statistics(self._dataset, filename, progress_callback=callback, logger=self.logger)
         except StopIteration as e:
@@ -322,12 +494,9 @@ class MainWindow(QtWidgets.QMainWindow):
             0, 100, self)
         progress_dialog.setWindowTitle("QGrain")
         progress_dialog.setWindowModality(QtCore.Qt.WindowModal)
+        progress_dialog.setMinimumDuration(200)
 
-        def callback(progress: float):
-            if progress_dialog.wasCanceled():
-                raise StopIteration()
-            progress_dialog.setValue(int(progress*100))
-            QtCore.QCoreApplication.processEvents()
+        callback = create_progress_callback(progress_dialog)
         try:
             save_pca(self._dataset, filename, progress_callback=callback, logger=self.logger)
         except StopIteration as e:
@@ -335,14 +504,26 @@ class MainWindow(QtWidgets.QMainWindow):
         finally:
             progress_dialog.close()
 
+    def switch_theme(self, theme: str, invert_secondary: bool):
+        # rebuilding and applying the stylesheet is expensive, skip it if the theme is not changed
+        if theme == self._theme:
+            return
+        app = QtWidgets.QApplication.instance()
+        apply_stylesheet(app, theme=theme, invert_secondary=invert_secondary, extra=EXTRA)
+        self._theme = theme
+
     def switch_language(self, language: str):
         app = QtWidgets.QApplication.instance()
         if self._translator is not None:
             app.removeTranslator(self._translator)
-        translator = QtCore.QTranslator(app)
-        translator.load(os.path.join(QGRAIN_ROOT_PATH, "assets", language))
+        translator = self._translators.get(language)
+        if translator is None:
+            translator = QtCore.QTranslator(app)
+            translator.load(os.path.join(QGRAIN_ROOT_PATH, "assets", language))
+            self._translators[language] = translator
         app.installTranslator(translator)
         self._translator = translator
+        self._language = language
 
     def changeEvent(self, event: QtCore.QEvent):
         if event.type() == QtCore.QEvent.LanguageChange:
@@ -357,41 +538,12 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def retranslate(self):
         self.setWindowTitle("QGrain")
-        self.close_msg.setWindowTitle(self.tr("Warning"))
-        self.close_msg.setText(self.tr("Closing this window will terminate all running tasks, are you sure to close it?"))
-        self.open_menu.setTitle((self.tr("Open")))
-        self.save_menu.setTitle(self.tr("Save"))
-        self.open_dataset_action.setText(self.tr("Grain Size Dataset"))
-        self.load_ssu_result_action.setText(self.tr("SSU Results"))
-        self.load_emma_result_action.setText(self.tr("EMMA Result"))
-        self.load_udm_result_action.setText(self.tr("UDM Result"))
-        self.save_artificial_action.setText(self.tr("Artificial Dataset"))
-        self.save_statistics_action.setText(self.tr("Statistical Result"))
-        self.save_pca_action.setText(self.tr("PCA Result"))
-        self.save_clustering_action.setText(self.tr("Clustering Result"))
-        self.save_ssu_result_action.setText(self.tr("SSU Results"))
-        self.save_emma_result_action.setText(self.tr("EMMA Result"))
-        self.save_udm_result_action.setText(self.tr("UDM Result"))
-        self.config_menu.setTitle(self.tr("Configure"))
-        self.config_ssu_action.setText(self.tr("SSU Algorithm"))
-        self.config_emma_action.setText(self.tr("EMMA Algorithm"))
-        self.config_udm_action.setText(self.tr("UDM Algorithm"))
-        self.experimental_menu.setTitle(self.tr("Experimental"))
-        self.ssu_fit_all_action.setText(self.tr("Perform SSU For All Samples"))
-        self.convert_udm_to_ssu_action.setText(self.tr("Convert Selected UDM Result To SSU Results"))
-        self.save_all_ssu_figures_action.setText(self.tr("Save Figures For All SSU Results"))
-        self.language_menu.setTitle(self.tr("Language"))
-        self.theme_menu.setTitle(self.tr("Theme"))
-        self.default_theme_action.setText(self.tr("Default"))
-        self.light_theme_menu.setTitle(self.tr("Light Theme"))
-        self.dark_theme_menu.setTitle(self.tr("Dark Theme"))
-        self.log_action.setText(self.tr("Log"))
-        self.about_action.setText(self.tr("About"))
-        self.tab_widget.setTabText(0, self.tr("Generator"))
-        self.tab_widget.setTabText(1, self.tr("Statistics"))
-        self.tab_widget.setTabText(2, self.tr("PCA"))
-        self.tab_widget.setTabText(3, self.tr("Clustering"))
-        self.tab_widget.setTabText(4, self.tr("SSU"))
-        self.tab_widget.setTabText(5, self.tr("EMMA"))
-        self.tab_widget.setTabText(6, self.tr("UDM"))
+        if self._close_msg is not None:
+            self._close_msg.setWindowTitle(self.tr("Warning"))
+            self._close_msg.setText(self.tr(
+                "Closing this window will terminate all running tasks, are you sure to close it?"))
+        for widget, setter, source in self._i18n:
+            getattr(widget, setter)(self.tr(source))
+        for index, name in enumerate(self._tab_names):
+            self.tab_widget.setTabText(index, self.tr(name))
         self.ssu_multicore_analyzer.retranslate()
@@ -204,7 +204,8 @@ class ParameterEditor(QtWidgets.QDialog):
                 if component.isEnabled():
                     parameters.append(component.parameters)
         parameters = np.expand_dims(np.array(parameters).T, axis=0)
-        classes = np.expand_dims(np.expand_dims(self._classes_phi, axis=0), axis=0).repeat(self.n_components, axis=1)
+        # it is evaluated on every value change, share the classes among the components without copying
+        classes = np.broadcast_to(self._classes_phi, (1, self.n_components, len(self._classes_phi)))
         sorted_parameters = sort_parameters(self.distribution_type, parameters, classes, self._interval_phi)
         return sorted_parameters[0]
 
@@ -250,8 +251,9 @@ class ParameterEditor(QtWidgets.QDialog):
         self._cache_dict[self.preset_index] = (self.distribution_type, self.n_components, self.parameters)
 
     def switch_preset(self, preset_index: int):
-        if preset_index in self._cache_dict.keys():
-            distribution_type, n_components, parameter_matrix = self._cache_dict[preset_index]
+        cache = self._cache_dict.get(preset_index)
+        if cache is not None:
+            distribution_type, n_components, parameter_matrix = cache
             self.distribution_type_combo_box.setCurrentIndex(self.DISTRIBUTION_INDEX_MAP[distribution_type])
             self.n_components_input.setValue(n_components)
             parameters = parameter_matrix.T
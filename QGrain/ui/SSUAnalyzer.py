@@ -125,26 +125,25 @@ class SSUAnalyzer(QtWidgets.QWidget):
     def on_sample_index_changed(self, index):
         self.sample_name_display.setText(self._dataset[index - 1].name)
 
-    def get_task(self, sample_index: int) -> Dict[str, Any]:
-        task = {}
-        sample = self._dataset[sample_index]
-        task["sample"] = sample
+    def get_options(self) -> Dict[str, Any]:
+        options = {}
         if self.parameter_editor.parameter_enabled:
-            task["distribution_type"] = self.parameter_editor.distribution_type
-            task["n_components"] = self.parameter_editor.n_components
-            task["x0"] = self.parameter_editor.parameters
+            options["distribution_type"] = self.parameter_editor.distribution_type
+            options["n_components"] = self.parameter_editor.n_components
+            options["x0"] = self.parameter_editor.parameters
         else:
-            task["distribution_type"] = self.distribution_type
-            task["n_components"] = self.n_components
-        task.update(self.setting_dialog.settings)
-        return task
+            options["distribution_type"] = self.distribution_type
+            options["n_components"] = self.n_components
+        options.update(self.setting_dialog.settings)
+        return options
+
+    def get_task(self, sample_index: int) -> Dict[str, Any]:
+        return dict(sample=self._dataset[sample_index], **self.get_options())
 
     def get_all_tasks(self) -> List[Dict[str, Any]]:
-        tasks = []
-        for i in range(len(self._dataset)):
-            task = self.get_task(i)
-            tasks.append(task)
-        return tasks
+        # all tasks share the same options, read them from the widgets only once
+        options = self.get_options()
+        return [dict(sample=sample, **options) for sample in self._dataset]
 
     def on_result_displayed(self, result: SSUResult):
         self.result_chart.show_result(result)
@@ -220,8 +220,9 @@ class SSUMulticoreAnalyzer(QtWidgets.QDialog):
         self.n_failed_tasks_display.setText("0")
         self.n_finished_tasks_display.setText("0")
         self.page_combo_box.clear()
-        for i in range(self.n_pages):
-            self.page_combo_box.addItem(self.tr("Page {0}").format(i+1))
+        # translate the page name once, there may be hundreds of pages
+        page_name = self.tr("Page {0}")
+        self.page_combo_box.addItems([page_name.format(i+1) for i in range(self.n_pages)])
         self.page_combo_box.setCurrentIndex(0)
         self.n_workers_input.setEnabled(True)
         self.run_button.setEnabled(True)
@@ -311,8 +312,9 @@ class SSUMulticoreAnalyzer(QtWidgets.QDialog):
             self.n_failed_tasks_display.setText(self.tr("Unknown"))
             self.page_combo_box.addItem(self.tr("No Page"))
         else:
+            page_name = self.tr("Page {0}")
             for i in range(self.page_combo_box.count()):
-                self.page_combo_box.setItemText(i, self.tr("Page {0}").format(i+1))
+                self.page_combo_box.setItemText(i, page_name.format(i+1))
         self.run_button.setText(self.tr("Start"))
         self.state_group.setTitle(self.tr("State"))
         self.previous_button.setText(self.tr("Previous"))
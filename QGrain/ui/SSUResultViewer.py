@@ -7,17 +7,143 @@ from typing import *
 import numpy as np
 from PySide6 import QtCore, QtGui, QtWidgets
 
-from ..models import SSUResult
+from ..models import SSUResult, SSUResultComponent
 from ..ssu import built_in_losses
 from ..metrics import loss_numpy
 from ..charts.BoxplotChart import BoxplotChart
 from ..charts.LossSeriesChart import LossSeriesChart
-from ..io import save_ssu
+from ..io import save_ssu, save_dump
 from .ParameterTable import ParameterTable
 
 
+def _batch_losses(results: Sequence[SSUResult], name: str) -> List[float]:
+    # the results usually share the same grain size classes, then their losses are calculated in one call
+    if len(results) == 0:
+        return []
+    if len({len(result.distribution) for result in results}) != 1:
+        return [result.loss(name) for result in results]
+    predictions = np.array([result.distribution for result in results])
+    observations = np.array([result.sample.distribution for result in results])
+    return loss_numpy(name)(predictions, observations, 1).tolist()
+
+
+def _component_values(results: Sequence[SSUResult], get_value: Callable[[SSUResultComponent], float]) -> np.ndarray:
+    # the values of components are stored column by column, the missing components of a result are filled by NaN
+    values = np.full((len(results), max((len(result) for result in results), default=0)), np.nan)
+    for i, result in enumerate(results):
+        values[i, :len(result)] = [get_value(component) for component in result]
+    return values
+
+
+class SSUResultTableModel(QtCore.QAbstractTableModel):
+    # the table reads the results on demand, only the visible cells are formatted when they are painted
+    def __init__(self, results: List[SSUResult], parent=None):
+        super().__init__(parent)
+        # the list is shared with the viewer, it must be modified through the methods of this model
+        self._results = results
+        self._loss_name = "lmse"
+        self._losses: List[float] = []
+        # the losses of all results are cached by the names of loss functions, switching back to one is free
+        self._loss_cache: Dict[str, List[float]] = {self._loss_name: self._losses}
+        self._headers = []
+        self.retranslate()
+
+    @property
+    def loss_name(self) -> str:
+        return self._loss_name
+
+    @loss_name.setter
+    def loss_name(self, name: str):
+        self._loss_name = name
+        losses = self._loss_cache.get(name)
+        if losses is None:
+            losses = _batch_losses(self._results, name)
+            self._loss_cache[name] = losses
+        self._losses = losses
+        if len(self._results) != 0:
+            self.dataChanged.emit(self.index(0, 4), self.index(len(self._results)-1, 4))
+
+    @property
+    def losses(self) -> np.ndarray:
+        return np.array(self._losses)
+
+    def rowCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._results)
+
+    def columnCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._headers)
+
+    def data(self, index: QtCore.QModelIndex, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == QtCore.Qt.TextAlignmentRole:
+            return QtCore.Qt.AlignCenter
+        if role != QtCore.Qt.DisplayRole:
+            return None
+        result = self._results[index.row()]
+        column = index.column()
+        if column == 0:
+            return result.distribution_type.name
+        elif column == 1:
+            return str(len(result))
+        elif column == 2:
+            return str(result.n_iterations)
+        elif column == 3:
+            return f"{result.time_spent: 0.4f}"
+        elif column == 4:
+            return f"{self._losses[index.row()]: 0.4f}"
+        elif column == 5:
+            return self.tr("Yes") if result.x0 is not None else self.tr("No")
+        return None
+
+    def headerData(self, section: int, orientation: QtCore.Qt.Orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.TextAlignmentRole:
+            return QtCore.Qt.AlignCenter
+        if role != QtCore.Qt.DisplayRole:
+            return None
+        if orientation == QtCore.Qt.Horizontal:
+            return self._headers[section]
+        return self._results[section].sample.name
+
+    def add_results(self, results: List[SSUResult]):
+        if len(results) == 0:
+            return
+        self.beginInsertRows(QtCore.QModelIndex(), len(self._results), len(self._results)+len(results)-1)
+        self._results.extend(results)
+        self._losses.extend(_batch_losses(results, self._loss_name))
+        # the losses of other functions are calculated again when they are used
+        self._loss_cache = {self._loss_name: self._losses}
+        self.endInsertRows()
+
+    def remove_results(self, indexes: List[int]):
+        self.beginResetModel()
+        # the kept rows are collected in one pass, popping them one by one is quadratic for many outliers
+        removed = set(indexes)
+        kept = [i for i in range(len(self._results)) if i not in removed]
+        self._results[:] = [self._results[i] for i in kept]
+        for losses in self._loss_cache.values():
+            losses[:] = [losses[i] for i in kept]
+        self.endResetModel()
+
+    def clear(self):
+        self.beginResetModel()
+        self._results.clear()
+        self._losses.clear()
+        self._loss_cache = {self._loss_name: self._losses}
+        self.endResetModel()
+
+    def retranslate(self):
+        self._headers = [
+            self.tr("Distribution Type"),
+            self.tr("Number of Components"),
+            self.tr("Number of Iterations"),
+            self.tr("Spent Time [s]"),
+            self.tr("Final Loss"),
+            self.tr("Has Reference")]
+        self.headerDataChanged.emit(QtCore.Qt.Horizontal, 0, len(self._headers)-1)
+
+
 class SSUResultViewer(QtWidgets.QWidget):
-    PAGE_ROWS = 20
     logger = logging.getLogger("QGrain.SSUResultViewer")
     result_displayed = QtCore.Signal(SSUResult)
     result_referred = QtCore.Signal(SSUResult)
@@ -26,33 +152,24 @@ class SSUResultViewer(QtWidgets.QWidget):
         super().__init__(parent=parent)
         self._results: List[SSUResult] = []
         self.setWindowTitle(self.tr("SSU Result Viewer"))
-        self.data_table = QtWidgets.QTableWidget(100, 100)
+        self.results_model = SSUResultTableModel(self._results, parent=self)
+        self.data_table = QtWidgets.QTableView()
+        self.data_table.setModel(self.results_model)
+        self.data_table.horizontalHeader().setDefaultAlignment(QtCore.Qt.AlignCenter | QtCore.Qt.TextWordWrap)
         self.data_table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
         self.data_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
         self.data_table.setAlternatingRowColors(True)
         self.data_table.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
         self.main_layout = QtWidgets.QGridLayout(self)
-        self.main_layout.addWidget(self.data_table, 0, 0, 1, 3)
-        self.previous_button = QtWidgets.QPushButton(self.tr("Previous"))
-        self.previous_button.setToolTip(self.tr("Click to get back to the previous page."))
-        self.page_combo_box = QtWidgets.QComboBox()
-        self.page_combo_box.addItem(self.tr("Page {0}").format(1))
-        self.next_button = QtWidgets.QPushButton(self.tr("Next"))
-        self.next_button.setToolTip(self.tr("Click to jump to the next page."))
-        self.previous_button.clicked.connect(lambda: self.page_combo_box.setCurrentIndex(max(self.page_index-1, 0)))
-        self.page_combo_box.currentIndexChanged.connect(self.update_page)
-        self.next_button.clicked.connect(lambda: self.page_combo_box.setCurrentIndex(min(self.page_index+1, self.n_pages-1)))
-        self.main_layout.addWidget(self.previous_button, 1, 0)
-        self.main_layout.addWidget(self.page_combo_box, 1, 1)
-        self.main_layout.addWidget(self.next_button, 1, 2)
+        self.main_layout.addWidget(self.data_table, 0, 0, 1, 2)
         self.loss_label = QtWidgets.QLabel(self.tr("Loss"))
         self.loss_label.setToolTip(self.tr("The function to calculate the difference between prediction and observation."))
         self.loss_combo_box = QtWidgets.QComboBox()
         self.loss_combo_box.addItems(built_in_losses)
         self.loss_combo_box.setCurrentText("lmse")
-        self.loss_combo_box.currentTextChanged.connect(lambda: self.update_page(self.page_index))
-        self.main_layout.addWidget(self.loss_label, 2, 0)
-        self.main_layout.addWidget(self.loss_combo_box, 2, 1, 1, 2)
+        self.loss_combo_box.currentTextChanged.connect(self.on_loss_changed)
+        self.main_layout.addWidget(self.loss_label, 1, 0)
+        self.main_layout.addWidget(self.loss_combo_box, 1, 1)
         self.menu = QtWidgets.QMenu(self.data_table)
         self.menu.setShortcutAutoRepeat(True)
         self.remove_action = self.menu.addAction(self.tr("Remove"))
@@ -86,15 +203,14 @@ class SSUResultViewer(QtWidgets.QWidget):
         self.check_proportion_action = self.detect_outliers_menu.addAction(self.tr("Proportion"))
         self.check_proportion_action.triggered.connect(self.check_component_proportion)
         self.data_table.customContextMenuRequested.connect(self.show_menu)
-        self.data_table.itemSelectionChanged.connect(self.on_selection_changed)
+        self.data_table.selectionModel().selectionChanged.connect(self.on_selection_changed)
         # necessary to add actions of menu to this widget itself,
         # otherwise, the shortcuts will not be triggered
         self.addActions(self.menu.actions())
 
-        self.boxplot_chart = BoxplotChart()
-        self.loss_chart = LossSeriesChart()
-        self.update_page_list()
-        self.update_page(self.page_index)
+        # the charts are created when they are used at the first time
+        self._boxplot_chart: Optional[BoxplotChart] = None
+        self._loss_chart: Optional[LossSeriesChart] = None
         self.normal_msg = QtWidgets.QMessageBox(self)
         self.parameter_table = None
 
@@ -116,20 +232,24 @@ class SSUResultViewer(QtWidgets.QWidget):
         self.show_message(self.tr("Error"), message)
 
     @property
-    def loss_name(self) -> str:
-        return self.loss_combo_box.currentText()
+    def boxplot_chart(self) -> BoxplotChart:
+        if self._boxplot_chart is None:
+            self._boxplot_chart = BoxplotChart()
+        return self._boxplot_chart
 
     @property
-    def distance_function(self) -> Callable:
-        return loss_numpy(self.loss_combo_box.currentText())
+    def loss_chart(self) -> LossSeriesChart:
+        if self._loss_chart is None:
+            self._loss_chart = LossSeriesChart()
+        return self._loss_chart
 
     @property
-    def page_index(self) -> int:
-        return self.page_combo_box.currentIndex()
+    def loss_name(self) -> str:
+        return self.loss_combo_box.currentText()
 
     @property
-    def n_pages(self) -> int:
-        return self.page_combo_box.count()
+    def distance_function(self) -> Callable:
+        return loss_numpy(self.loss_combo_box.currentText())
 
     @property
     def n_results(self) -> int:
@@ -137,12 +257,7 @@ class SSUResultViewer(QtWidgets.QWidget):
 
     @property
     def selections(self) -> List[int]:
-        start = self.page_index*self.PAGE_ROWS
-        temp = set()
-        for item in self.data_table.selectedRanges():
-            for i in range(item.topRow(), min(self.PAGE_ROWS+1, item.bottomRow()+1)):
-                temp.add(i+start)
-        indexes = list(temp)
+        indexes = [index.row() for index in self.data_table.selectionModel().selectedRows()]
         indexes.sort()
         return indexes
 
@@ -154,91 +269,21 @@ class SSUResultViewer(QtWidgets.QWidget):
     def auto_show_selected(self) -> bool:
         return self.auto_show_selected_action.isChecked()
 
-    def update_page_list(self):
-        last_page_index = self.page_index
-        if self.n_results == 0:
-            n_pages = 1
-        else:
-            n_pages, left = divmod(self.n_results, self.PAGE_ROWS)
-            if left != 0:
-                n_pages += 1
-        self.page_combo_box.blockSignals(True)
-        self.page_combo_box.clear()
-        self.page_combo_box.addItems([self.tr("Page {0}").format(i+1) for i in range(n_pages)])
-        if last_page_index >= n_pages:
-            self.page_combo_box.setCurrentIndex(n_pages-1)
-        else:
-            self.page_combo_box.setCurrentIndex(last_page_index)
-        self.page_combo_box.blockSignals(False)
-
-    def update_page(self, page_index: int):
-        def write(row: int, col: int, value: Union[int, float, str]):
-            if isinstance(value, str):
-                pass
-            elif isinstance(value, int):
-                value = str(value)
-            elif isinstance(value, float):
-                value = f"{value: 0.4f}"
-            else:
-                value = value.__str__()
-            item = QtWidgets.QTableWidgetItem(value)
-            item.setTextAlignment(QtCore.Qt.AlignCenter)
-            self.data_table.setItem(row, col, item)
-        # necessary to clear
-        self.data_table.clear()
-        if page_index == self.n_pages - 1:
-            start = page_index * self.PAGE_ROWS
-            end = self.n_results
-        else:
-            start, end = page_index * self.PAGE_ROWS, (page_index+1) * self.PAGE_ROWS
-        self.data_table.setRowCount(end-start)
-        self.data_table.setColumnCount(6)
-        self.data_table.setHorizontalHeaderLabels([
-            self.tr("Distribution Type"),
-            self.tr("Number of Components"),
-            self.tr("Number of Iterations"),
-            self.tr("Spent Time [s]"),
-            self.tr("Final Loss"),
-            self.tr("Has Reference")])
-        self.data_table.horizontalHeader().setDefaultAlignment(QtCore.Qt.AlignCenter | QtCore.Qt.TextWordWrap)
-        sample_names = [result.sample.name for result in self._results[start: end]]
-        self.data_table.setVerticalHeaderLabels(sample_names)
-        for row, result in enumerate(self._results[start: end]):
-            write(row, 0, result.distribution_type.name)
-            write(row, 1, len(result))
-            write(row, 2, result.n_iterations)
-            write(row, 3, result.time_spent)
-            write(row, 4, result.loss(self.loss_name))
-            write(row, 5, self.tr("Yes") if result.x0 is not None else self.tr("No"))
+    def on_loss_changed(self, loss_name: str):
+        self.results_model.loss_name = loss_name
         self.data_table.resizeColumnsToContents()
 
     def add_result(self, result: SSUResult):
-        if self.n_results == 0 or (self.page_index==self.n_pages-1 and divmod(self.n_results, self.PAGE_ROWS)[-1]!=0):
-            need_update = True
-        else:
-            need_update = False
-        self._results.append(result)
-        self.update_page_list()
-        if need_update:
-            self.update_page(self.page_index)
+        self.add_results([result])
 
     def add_results(self, results: List[SSUResult]):
-        if self.n_results == 0 or (self.page_index==self.n_pages-1 and divmod(self.n_results, self.PAGE_ROWS)[-1]!=0):
-            need_update = True
-        else:
-            need_update = False
-        self._results.extend(results)
-        self.update_page_list()
-        if need_update:
-            self.update_page(self.page_index)
+        need_resize = self.n_results == 0
+        self.results_model.add_results(results)
+        if need_resize:
+            self.data_table.resizeColumnsToContents()
 
     def remove_results(self, indexes):
-        results = []
-        for i in reversed(indexes):
-            res = self._results.pop(i)
-            results.append(res)
-        self.update_page_list()
-        self.update_page(self.page_index)
+        self.results_model.remove_results(indexes)
 
     def remove_selections(self):
         indexes = self.selections
@@ -252,9 +297,7 @@ class SSUResultViewer(QtWidgets.QWidget):
         remove_msg.setText(self.tr("Are you sure to remove all SSU results?"))
         res = remove_msg.exec_()
         if res == QtWidgets.QMessageBox.Yes:
-            self._results.clear()
-            self.update_page_list()
-            self.update_page(0)
+            self.results_model.clear()
 
     def refer_result(self):
         results = [self._results[i] for i in self.selections]
@@ -361,9 +404,8 @@ class SSUResultViewer(QtWidgets.QWidget):
             finally:
                 progress_dialog.close()
         else:
-            with open(filename, "wb") as f:
-                pickle.dump(self._results, f)
-                self.logger.info("All SSU results have been dumped.")
+            save_dump(self._results, filename)
+            self.logger.info("All SSU results have been dumped.")
 
     def ask_deal_outliers(self, outlier_results: List[SSUResult], outlier_indexes: List[int]):
         assert len(outlier_indexes) == len(outlier_results)
@@ -400,10 +442,8 @@ class SSUResultViewer(QtWidgets.QWidget):
         elif self.n_results < 10:
             self.show_error(self.tr("The number of results is not enough."))
             return
-        losses = []
-        for result in self._results:
-            losses.append(result.loss(self.loss_name))
-        losses = np.array(losses)
+        # the losses of current loss function are cached by the table model
+        losses = self.results_model.losses
         self.boxplot_chart.show_dataset([losses], xlabels=[self.loss_name], ylabel="Loss")
         self.boxplot_chart.show()
 
@@ -416,14 +456,9 @@ class SSUResultViewer(QtWidgets.QWidget):
         value_1_4 = np.median(lower_group)
         value_3_4 = np.median(upper_group)
         loss_QR = value_3_4 - value_1_4
-        outlier_results = []
-        outlier_indexes = []
-        for i, (result, loss) in enumerate(zip(self._results, losses)):
-            if loss > value_3_4 + loss_QR * 1.5:
-            # which error too small is not outlier
-            # if loss > value_3_4 + loss_QR * 1.5 or loss < value_1_4 - loss_QR * 1.5:
-                outlier_results.append(result)
-                outlier_indexes.append(i)
+        # which error too small is not outlier
+        outlier_indexes = np.flatnonzero(np.greater(losses, value_3_4 + loss_QR * 1.5)).tolist()
+        outlier_results = [self._results[i] for i in outlier_indexes]
         self.logger.debug(f"Check the final losses using Whisker plot.")
         self.ask_deal_outliers(outlier_results, outlier_indexes)
 
@@ -434,29 +469,17 @@ class SSUResultViewer(QtWidgets.QWidget):
         elif self.n_results < 10:
             self.show_error(self.tr("The number of results is not enough."))
             return
-        max_n_components = 0
-        for result in self._results:
-            if len(result) > max_n_components:
-                max_n_components = len(result)
-        moments = []
-        for i in range(max_n_components):
-            moments.append([])
-
-        for result in self._results:
-            for i, component in enumerate(result):
-                if np.isnan(component.moments[key]) or np.isinf(component.moments[key]):
-                    pass
-                else:
-                    moments[i].append(component.moments[key])
+        values = _component_values(self._results, lambda component: component.moments[key])
+        max_n_components = values.shape[1]
+        moments = [column[np.isfinite(column)] for column in values.T]
 
         key_label_trans = {"mean": "Mean [φ]", "std": "Sorting Coefficient", "skewness": "Skewness", "kurtosis": "Kurtosis"}
         self.boxplot_chart.show_dataset(moments, xlabels=[f"C{i+1}" for i in range(max_n_components)], ylabel=key_label_trans[key])
         self.boxplot_chart.show()
 
-        outlier_dict = {}
-
+        is_outlier = np.zeros(self.n_results, dtype=bool)
         for i in range(max_n_components):
-            stacked_moments = np.array(moments[i])
+            stacked_moments = moments[i]
             # calculate the 1/4, 1/2, and 3/4 position value to judge which result is invalid
             # 1. the mean squared errors are much higher in the results which are lack of components
             # 2. with the component number getting higher, the mean squared error will get lower and finally reach the minimum
@@ -466,30 +489,19 @@ class SSUResultViewer(QtWidgets.QWidget):
             value_1_4 = np.median(lower_group)
             value_3_4 = np.median(upper_group)
             moment_QR = value_3_4 - value_1_4
+            # the missing components (NaN) are never outliers
+            is_outlier |= np.greater(values[:, i], value_3_4 + moment_QR * 1.5)
+            is_outlier |= np.less(values[:, i], value_1_4 - moment_QR * 1.5)
 
-            for j, result in enumerate(self._results):
-                if len(result) > i:
-                    moment = result[i].moments[key]
-                    if moment > value_3_4 + moment_QR * 1.5 or moment < value_1_4 - moment_QR * 1.5:
-                        outlier_dict[j] = result
-
-        outlier_results = []
-        outlier_indexes = []
-        for index, result in sorted(outlier_dict.items(), key=lambda x:x[0]):
-            outlier_indexes.append(index)
-            outlier_results.append(result)
+        outlier_indexes = np.flatnonzero(is_outlier).tolist()
+        outlier_results = [self._results[i] for i in outlier_indexes]
         self.logger.debug(f"Check the {key_label_trans[key]} values using Whisker plot.")
         self.ask_deal_outliers(outlier_results, outlier_indexes)
 
     def check_component_proportion(self):
-        outlier_results = []
-        outlier_indexes = []
-        for i, result in enumerate(self._results):
-            for component in result:
-                if component.proportion < 1e-3:
-                    outlier_results.append(result)
-                    outlier_indexes.append(i)
-                    break
+        proportions = _component_values(self._results, lambda component: component.proportion)
+        outlier_indexes = np.flatnonzero(np.any(np.less(proportions, 1e-3), axis=1)).tolist()
+        outlier_results = [self._results[i] for i in outlier_indexes]
         self.logger.debug("Check if the proportion of any component is near zero.")
         self.ask_deal_outliers(outlier_results, outlier_indexes)
 
@@ -497,20 +509,8 @@ class SSUResultViewer(QtWidgets.QWidget):
         if event.type() == QtCore.QEvent.LanguageChange:
             self.retranslate()
 
-    def keyPressEvent(self, event: QtGui.QKeyEvent):
-        if event.key() == QtCore.Qt.Key_Up:
-            self.page_combo_box.setCurrentIndex(max(self.page_index-1, 0))
-        elif event.key() == QtCore.Qt.Key_Down:
-            self.page_combo_box.setCurrentIndex(min(self.page_index+1, self.n_pages-1))
-
     def retranslate(self):
         self.setWindowTitle(self.tr("SSU Result Viewer"))
-        self.previous_button.setText(self.tr("Previous"))
-        self.previous_button.setToolTip(self.tr("Click to get back to the previous page."))
-        for i in range(self.page_combo_box.count()):
-            self.page_combo_box.setItemText(i, self.tr("Page {0}").format(i+1))
-        self.next_button.setText(self.tr("Next"))
-        self.next_button.setToolTip(self.tr("Click to jump to the next page."))
         self.loss_label.setText(self.tr("Loss"))
         self.loss_label.setToolTip(self.tr("The function to calculate the difference between prediction and observation."))
         self.remove_action.setText(self.tr("Remove"))
@@ -528,4 +528,4 @@ class SSUResultViewer(QtWidgets.QWidget):
         self.check_skewness_action.setText(self.tr("Skewness"))
         self.check_kurtosis_action.setText(self.tr("Kurtosis"))
         self.check_proportion_action.setText(self.tr("Proportion"))
-        self.update_page(self.page_index)
+        self.results_model.retranslate()
@@ -218,7 +218,9 @@ class StatisticalAnalyzer(QtWidgets.QWidget):
         page_count, left = divmod(len(self._dataset), self.PAGE_ROWS)
         if left != 0:
             page_count += 1
-        self.current_page_combo_box.addItems([self.tr("Page {0}").format(i + 1) for i in range(page_count)])
+        # translate the page name once, there may be hundreds of pages
+        page_name = self.tr("Page {0}")
+        self.current_page_combo_box.addItems([page_name.format(i + 1) for i in range(page_count)])
         self.previous_button.setEnabled(True)
         self.current_page_combo_box.setEnabled(True)
         self.next_button.setEnabled(True)
@@ -287,21 +289,16 @@ class StatisticalAnalyzer(QtWidgets.QWidget):
         if self._dataset is None:
             return
 
-        def write(row: int, col: int, value: Union[int, float, str]):
-            if isinstance(value, str):
-                pass
-            elif isinstance(value, int):
-                value = str(value)
-            elif isinstance(value, float):
-                value = f"{value: 0.2f}"
+        def write(row: int, col: int, value: str):
+            # reuse the existing items, only create the missing ones
+            item = self.data_table.item(row, col)
+            if item is None:
+                item = QtWidgets.QTableWidgetItem(value)
+                item.setTextAlignment(QtCore.Qt.AlignCenter)
+                self.data_table.setItem(row, col, item)
             else:
-                value = value.__str__()
-            item = QtWidgets.QTableWidgetItem(value)
-            item.setTextAlignment(QtCore.Qt.AlignCenter)
-            self.data_table.setItem(row, col, item)
+                item.setText(value)
 
-        # necessary to clear
-        self.data_table.clear()
         if page_index == self.n_pages - 1:
             start = page_index * self.PAGE_ROWS
             end = len(self._dataset)
@@ -322,20 +319,23 @@ class StatisticalAnalyzer(QtWidgets.QWidget):
                      self.tr("Group (Folk, 1954)"),
                      self.tr("Group Symbol (Blott and Pye, 2012)"),
                      self.tr("Group (Blott and Pye, 2012)")]
-        col_keys = [(True, "mean"),
-                    (True, "mean_description"),
-                    (True, "median"),
-                    (True, "modes"),
-                    (True, "std"),
-                    (True, "std_description"),
-                    (True, "skewness"),
-                    (True, "skewness_description"),
-                    (True, "kurtosis"),
-                    (True, "kurtosis_description"),
-                    (False, proportion_key),
-                    (False, "group_folk54"),
-                    (False, "group_bp12_symbol"),
-                    (False, "group_bp12")]
+        # the formatter of each column is chosen once, instead of checking the type of every value
+        number = "{: 0.2f}".format
+        col_keys = [(True, "mean", number),
+                    (True, "mean_description", str),
+                    (True, "median", number),
+                    (True, "modes", lambda value: ", ".join([f"{m:0.2f}" for m in value])),
+                    (True, "std", number),
+                    (True, "std_description", str),
+                    (True, "skewness", number),
+                    (True, "skewness_description", str),
+                    (True, "kurtosis", number),
+                    (True, "kurtosis_description", str),
+                    (False, proportion_key, lambda value: ", ".join([f"{p * 100:0.2f}" for p in value])),
+                    (False, "group_folk54", str),
+                    (False, "group_bp12_symbol", str),
+                    (False, "group_bp12", str)]
+        self.data_table.setUpdatesEnabled(False)
         self.data_table.setRowCount(end - start)
         self.data_table.setColumnCount(len(col_names))
         self.data_table.setHorizontalHeaderLabels(col_names)
@@ -353,28 +353,18 @@ class StatisticalAnalyzer(QtWidgets.QWidget):
                     sub_key = "logarithmic_fw57"
                 else:
                     sub_key = "logarithmic"
-            for col, (in_sub, key) in enumerate(col_keys):
+            for col, (in_sub, key, formatter) in enumerate(col_keys):
                 value = statistics[sub_key][key] if in_sub else statistics[key]
-                if key == "modes":
-                    write(row, col, ", ".join([f"{m:0.2f}" for m in value]))
-                elif key[:11] == "proportions":
-                    write(row, col, ", ".join([f"{p * 100:0.2f}" for p in value]))
-                else:
-                    write(row, col, value)
-
+                write(row, col, formatter(value))
         self.data_table.resizeColumnsToContents()
+        self.data_table.setUpdatesEnabled(True)
 
     @property
     def selections(self):
         if self._dataset is None:
             return []
         start = self.page_index * self.PAGE_ROWS
-        temp = set()
-        for item in self.data_table.selectedRanges():
-            for i in range(item.topRow(), min(self.PAGE_ROWS + 1, item.bottomRow() + 1)):
-                temp.add(i + start)
-        indexes = list(temp)
-        indexes.sort()
+        indexes = sorted(index.row() + start for index in self.data_table.selectionModel().selectedRows())
         samples = [self._dataset[i] for i in indexes]
         return samples
 
@@ -414,8 +404,9 @@ class StatisticalAnalyzer(QtWidgets.QWidget):
             self.current_page_combo_box.setItemText(0, self.tr("No Page"))
         else:
             self.update_page(self.page_index)
+            page_name = self.tr("Page {0}")
             for i in range(self.n_pages):
-                self.current_page_combo_box.setItemText(i, self.tr("Page {0}").format(i + 1))
+                self.current_page_combo_box.setItemText(i, page_name.format(i + 1))
         self.previous_button.setText(self.tr("Previous"))
         self.previous_button.setToolTip(self.tr("Click to back to the previous page."))
         self.next_button.setText(self.tr("Next"))
@@ -11,7 +11,8 @@ from grpc._channel import _InactiveRpcError
 from ..models import Dataset, KernelType, UDMResult
 from ..charts.UDMResultChart import UDMResultChart
 from ..protos.client import QGrainClient
-from ..io import save_udm
+from ..io import save_udm, save_dump
+from . import create_progress_callback
 from .UDMSettings import UDMSettings
 from .ParameterEditor import ParameterEditor
 
@@ -185,12 +186,8 @@ class UDMAnalyzer(QtWidgets.QWidget):
             0, 100, self)
         progress_dialog.setWindowTitle("QGrain")
         progress_dialog.setWindowModality(QtCore.Qt.WindowModal)
-
-        def callback(progress: float):
-            if progress_dialog.wasCanceled():
-                raise StopIteration()
-            progress_dialog.setValue(int(progress * 100))
-            QtCore.QCoreApplication.processEvents()
+        # the callback is called after every epoch, coalesce the repaints to about 30 per second
+        callback = create_progress_callback(progress_dialog, interval=33)
         try:
             from ..udm import try_udm
             result = try_udm(self._dataset, **settings, progress_callback=callback)
@@ -284,9 +281,8 @@ class UDMAnalyzer(QtWidgets.QWidget):
                 progress_dialog.close()
         # Binary File
         else:
-            with open(filename, "wb") as f:
-                pickle.dump(self.selected_result, f)
-                self.logger.info("The selected UDM result has been dumped.")
+            save_dump(self.selected_result, filename)
+            self.logger.info("The selected UDM result has been dumped.")
 
     def changeEvent(self, event: QtCore.QEvent):
         if event.type() == QtCore.QEvent.LanguageChange:
@@ -2,6 +2,7 @@ import logging
 import os
 import sys
 from logging.handlers import TimedRotatingFileHandler
+from typing import *
 
 import matplotlib as mpl
 from PySide6 import QtWidgets, QtCore, QtGui
@@ -21,6 +22,28 @@ def get_dir_size(directory: str):
     return size
 
 
+def create_progress_callback(progress_dialog: QtWidgets.QProgressDialog,
+                             interval: int = 0) -> Callable[[float], None]:
+    # the cancellation is checked for every call, but the dialog is only updated when the percentage changes,
+    # and not more often than every `interval` milliseconds, the repaints may dominate the cost of fast tasks,
+    # once the modal dialog is shown, `setValue` processes the pending events itself
+    last_value = -1
+    update_timer = QtCore.QElapsedTimer()
+    update_timer.start()
+
+    def callback(progress: float):
+        nonlocal last_value
+        if progress_dialog.wasCanceled():
+            raise StopIteration()
+        value = int(progress*100)
+        if value == last_value or (value < 100 and update_timer.elapsed() < interval):
+            return
+        last_value = value
+        update_timer.restart()
+        progress_dialog.setValue(value)
+    return callback
+
+
 def create_necessary_folders():
     necessary_folders = (
         os.path.join(os.path.expanduser("~"), "QGrain"),
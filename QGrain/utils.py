@@ -11,23 +11,12 @@ from QGrain.models import DistributionType, UDMResult, SSUResult
 
 def get_image_by_proportions(proportions: ndarray, resolution: int = 100) -> ndarray:
     n_samples, n_components = proportions.shape
-    index = np.repeat(np.expand_dims(np.linspace(0.0, 1.0, resolution), axis=0), n_samples, axis=0)
-    image = np.zeros((n_samples, resolution))
-
-    bound = np.ones((n_samples, n_components+1))
-    bound[:, 0] = 0.0
-    bottom = np.zeros(n_samples)
-    for i in range(n_components):
-        bottom += proportions[:, i]
-        bound[:, i+1] = bottom
-    bound[:, -1] = 1.0
-
-    for i in range(n_components):
-        lower = np.repeat(np.expand_dims(bound[:, i], axis=1), resolution, axis=1)
-        upper = np.repeat(np.expand_dims(bound[:, i+1], axis=1), resolution, axis=1)
-        key = np.logical_and(np.greater_equal(index, lower), np.less_equal(index, upper))
-        image[key] = i
-    return image.T
+    index = np.linspace(0.0, 1.0, resolution)
+    # the pixel belongs to the last component whose lower bound is not greater than it,
+    # i.e., the number of inner bounds (cumulative proportions) below or at the pixel
+    bounds = np.cumsum(proportions[:, :-1], axis=1)
+    image = np.count_nonzero(np.less_equal(bounds[:, :, None], index[None, None, :]), axis=1)
+    return image.astype(np.uint8).T
 
 
 def udm_to_ssu(result: UDMResult, logger: logging.Logger = None,
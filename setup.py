@@ -24,7 +24,7 @@ setup(
         "matplotlib>=3.5.0",
         "SciencePlots",
         "qt-material"],
-    extras_require={"server": ["torch"]},
+    extras_require={"server": ["torch"], "excel": ["lxml"]},
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
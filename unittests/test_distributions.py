@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from scipy.stats import norm, skewnorm, weibull_min
+
+# `QGrain.distributions` and `QGrain.models` import each other, `models` has to be imported first
+import QGrain.models
+from QGrain.distributions import normal_pdf, skew_normal_pdf, weibull_pdf, weibull_moments
+
+x = np.linspace(-10, 10, 1001)
+locations = (-3.0, 0.0, 2.5)
+scales = (1e-8, 0.3, 2.0)
+shapes = (-5.0, 0.0, 0.3, 7.0)
+
+
+def test_normal_pdf():
+    for loc in locations:
+        for scale in scales:
+            assert np.allclose(normal_pdf(x, loc, scale), norm.pdf(x, loc=loc, scale=scale), rtol=1e-12, atol=0.0)
+
+
+def test_skew_normal_pdf():
+    for shape in shapes:
+        for loc in locations:
+            for scale in scales:
+                assert np.allclose(skew_normal_pdf(x, shape, loc, scale),
+                                   skewnorm.pdf(x, shape, loc=loc, scale=scale), rtol=1e-12, atol=0.0)
+
+
+def test_weibull_pdf():
+    # the origin is included, where the shapes less than, equal to, and greater than 1 have different limits
+    for shape in (1e-8, 0.3, 1.0, 2.0, 3.6, 17.0):
+        for loc in locations:
+            for scale in scales:
+                assert np.allclose(weibull_pdf(x, shape, loc, scale),
+                                   weibull_min.pdf(x, shape, loc=loc, scale=scale), rtol=1e-12, atol=0.0)
+
+
+def test_weibull_moments():
+    weibull_shapes = np.linspace(0.1, 30.0, 300)
+    for loc in locations:
+        for scale in scales:
+            expected = weibull_min.stats(weibull_shapes, loc=loc, scale=scale, moments="mvsk")
+            actual = weibull_moments(weibull_shapes, loc, scale)
+            for expected_values, actual_values in zip(expected, actual):
+                assert np.allclose(actual_values, expected_values, rtol=1e-12, atol=0.0)
+
+
+if __name__ == "__main__":
+    pytest.main(["-s"])
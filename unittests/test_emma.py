@@ -69,6 +69,15 @@ class TestTryEMMA:
             assert result.proportions.tobytes() == proportions_bytes
             assert result.end_members.tobytes() == end_members_bytes
 
+    def test_get_history(self):
+        result = try_emma(self.dataset, KernelType.Normal, self.dataset.n_components)
+        indexes = [0, result.n_iterations // 2, result.n_iterations - 1]
+        history = list(result.history)
+        for i, h in zip(indexes, result.get_history(indexes)):
+            assert isinstance(h, EMMAResult)
+            assert np.all(h.proportions == history[i].proportions)
+            assert np.all(h.end_members == history[i].end_members)
+
     def test_loss(self):
         result = try_emma(self.dataset, KernelType.Normal, self.dataset.n_components)
         for loss_name in built_in_losses:
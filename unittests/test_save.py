@@ -0,0 +1,241 @@
+import os
+from concurrent.futures import Future
+
+import numpy as np
+import openpyxl
+
+from QGrain.models import *
+from QGrain.generate import random_dataset, SIMPLE_PRESET
+from QGrain.kernels import KernelType
+from QGrain.emma import try_emma
+from QGrain.udm import try_udm
+from QGrain.io import *
+
+
+def load_rows(filename: str, sheet_name: str):
+    wb = openpyxl.load_workbook(filename)
+    return list(wb[sheet_name].iter_rows(values_only=True))
+
+
+def merged_ranges(filename: str, sheet_name: str):
+    wb = openpyxl.load_workbook(filename)
+    return sorted(str(cell_range) for cell_range in wb[sheet_name].merged_cells.ranges)
+
+
+def check_header(row, names, classes):
+    # the floats may lose their last digit in the file, compare them approximately
+    n_names = len(names)
+    assert list(row[:n_names]) == names
+    assert np.allclose(np.array(row[n_names:], dtype=np.float64), classes)
+
+
+def check_distributions(rows, names, classes, distributions):
+    check_header(rows[0], ["Sample Name"], classes)
+    assert len(rows) == len(names) + 1
+    for row, name, distribution in zip(rows[1:], names, distributions):
+        assert row[0] == name
+        assert np.allclose(np.array(row[1:], dtype=np.float64), distribution)
+
+
+class TestSaveDataset:
+    dataset = random_dataset(**SIMPLE_PRESET, n_samples=20)
+
+    def test_save_dataset(self, tmp_path):
+        filename = os.path.join(tmp_path, "dataset.xlsx")
+        assert save_dataset(self.dataset, filename) is None
+        wb = openpyxl.load_workbook(filename)
+        assert wb.sheetnames == ["README", "GSDs"]
+        check_distributions(load_rows(filename, "GSDs"), self.dataset.sample_names,
+                            self.dataset.classes, self.dataset.distributions)
+        assert merged_ranges(filename, "GSDs") == []
+
+    def test_save_artificial_dataset(self, tmp_path):
+        filename = os.path.join(tmp_path, "artificial_dataset.xlsx")
+        save_artificial_dataset(self.dataset, filename)
+        wb = openpyxl.load_workbook(filename)
+        component_names = [f"C{i+1}" for i in range(self.dataset.n_components)]
+        assert wb.sheetnames == ["README", "GSDs", "Parameters", *component_names]
+        check_distributions(load_rows(filename, "GSDs"), self.dataset.sample_names,
+                            self.dataset.classes, self.dataset.distributions)
+        for i, component_name in enumerate(component_names):
+            distributions = [sample[i].distribution for sample in self.dataset]
+            check_distributions(load_rows(filename, component_name), self.dataset.sample_names,
+                                self.dataset.classes, distributions)
+        # the sample name spans two header rows, and each component spans its parameters
+        n = self.dataset.n_parameters
+        expected = ["A1:A2"] + [f"{column_to_char(1+i*n)}1:{column_to_char(n+i*n)}1"
+                                for i in range(self.dataset.n_components)]
+        assert merged_ranges(filename, "Parameters") == sorted(expected)
+        rows = load_rows(filename, "Parameters")
+        assert len(rows) == len(self.dataset) + 2
+        for row, parameters in zip(rows[2:], self.dataset.parameters):
+            # the parameters of each component are written one by one
+            assert np.allclose(np.array(row[1:], dtype=np.float64), parameters.T.ravel())
+
+    def test_compress_level(self, tmp_path):
+        filename_0 = os.path.join(tmp_path, "level_0.xlsx")
+        filename_9 = os.path.join(tmp_path, "level_9.xlsx")
+        save_dataset(self.dataset, filename_0, compress_level=0)
+        save_dataset(self.dataset, filename_9, compress_level=9)
+        assert load_rows(filename_0, "GSDs") == load_rows(filename_9, "GSDs")
+        assert os.path.getsize(filename_0) > os.path.getsize(filename_9)
+
+    def test_async_save(self, tmp_path):
+        filename = os.path.join(tmp_path, "async.xlsx")
+        future = save_dataset(self.dataset, filename, async_save=True)
+        assert isinstance(future, Future)
+        future.result()
+        assert os.path.exists(filename)
+        check_distributions(load_rows(filename, "GSDs"), self.dataset.sample_names,
+                            self.dataset.classes, self.dataset.distributions)
+
+    def test_sparse(self, tmp_path):
+        filename = os.path.join(tmp_path, "sparse.xlsx")
+        save_dataset(self.dataset, filename, sparse=True)
+        rows = load_rows(filename, "GSDs")
+        values = np.array([row[1:] for row in rows[1:]], dtype=object)
+        blank = np.equal(values, None)
+        distributions = self.dataset.distributions
+        # the near-zero frequencies are left blank, and the others are kept
+        assert np.any(blank)
+        assert np.all(blank == (np.abs(distributions) < SPARSE_EPSILON))
+        assert np.allclose(values[~blank].astype(np.float64), distributions[~blank])
+
+    def test_progress_callback(self, tmp_path):
+        progresses = []
+        save_dataset(self.dataset, os.path.join(tmp_path, "progress.xlsx"), progress_callback=progresses.append)
+        assert all(0.0 <= p <= 1.0 for p in progresses)
+        assert progresses[-1] == 1.0
+
+
+class TestSaveAnalyses:
+    dataset = random_dataset(**SIMPLE_PRESET, n_samples=20)
+
+    def test_save_statistics(self, tmp_path):
+        filename = os.path.join(tmp_path, "statistics.xlsx")
+        save_statistics(self.dataset, filename)
+        wb = openpyxl.load_workbook(filename)
+        assert wb.sheetnames == ["README", "GSDs", "Arithmetic", "Geometric", "Logarithmic",
+                                 "Geometric_fw57", "Logarithmic_fw57", "Proportion and Classification"]
+        check_distributions(load_rows(filename, "GSDs"), self.dataset.sample_names,
+                            self.dataset.classes, self.dataset.distributions)
+        rows = load_rows(filename, "Arithmetic")
+        assert list(rows[0]) == ["Sample Name", "Mean [μm]", "Sorting Coefficient", "Skewness", "Kurtosis"]
+        assert [row[0] for row in rows[1:]] == self.dataset.sample_names
+        for sheet_name in wb.sheetnames:
+            assert merged_ranges(filename, sheet_name) == []
+
+    def test_save_statistics_processes(self, tmp_path):
+        filename_1 = os.path.join(tmp_path, "statistics_1.xlsx")
+        filename_2 = os.path.join(tmp_path, "statistics_2.xlsx")
+        save_statistics(self.dataset, filename_1, n_processes=1)
+        save_statistics(self.dataset, filename_2, n_processes=2)
+        wb = openpyxl.load_workbook(filename_1)
+        for sheet_name in wb.sheetnames[1:]:
+            assert load_rows(filename_1, sheet_name) == load_rows(filename_2, sheet_name)
+
+    def test_include_gsds(self, tmp_path):
+        filename = os.path.join(tmp_path, "statistics.xlsx")
+        save_statistics(self.dataset, filename, include_gsds=False)
+        assert "GSDs" not in openpyxl.load_workbook(filename).sheetnames
+        filename = os.path.join(tmp_path, "pca.xlsx")
+        save_pca(self.dataset, filename, include_gsds=False)
+        assert openpyxl.load_workbook(filename).sheetnames == ["README", "Distributions of PCs", "Variations of PCs"]
+
+    def test_save_pca(self, tmp_path):
+        filename = os.path.join(tmp_path, "pca.xlsx")
+        save_pca(self.dataset, filename)
+        wb = openpyxl.load_workbook(filename)
+        assert wb.sheetnames == ["README", "GSDs", "Distributions of PCs", "Variations of PCs"]
+        rows = load_rows(filename, "Distributions of PCs")
+        check_header(rows[0], ["PC"], self.dataset.classes)
+        assert len(rows) == 11
+        rows = load_rows(filename, "Variations of PCs")
+        assert [row[0] for row in rows[1:]] == self.dataset.sample_names
+        assert len(rows[0]) == 11
+
+    def test_save_clustering(self, tmp_path):
+        filename = os.path.join(tmp_path, "clustering.xlsx")
+        flags = [i % 3 for i in range(len(self.dataset))]
+        save_clustering(self.dataset, flags, filename)
+        wb = openpyxl.load_workbook(filename)
+        assert wb.sheetnames == ["README", "GSDs", "Cluster Flags of Samples", "Typical Samples of Clusters",
+                                 "Cluster0", "Cluster1", "Cluster2"]
+        rows = load_rows(filename, "Cluster Flags of Samples")
+        assert [list(row) for row in rows[1:]] == [[name, flag] for name, flag in zip(self.dataset.sample_names, flags)]
+        for flag in range(3):
+            indexes = [i for i in range(len(self.dataset)) if flags[i] == flag]
+            check_distributions(load_rows(filename, f"Cluster{flag}"),
+                                [self.dataset.sample_names[i] for i in indexes],
+                                self.dataset.classes, self.dataset.distributions[indexes])
+
+
+class TestSaveResults:
+    dataset = random_dataset(**SIMPLE_PRESET, n_samples=20)
+    component_names = [f"C{i+1}" for i in range(dataset.n_components)]
+
+    def check_components(self, filename: str, proportions: np.ndarray, components: np.ndarray):
+        n_samples, n_components, n_classes = components.shape
+        rows = load_rows(filename, "Unmixed Components")
+        check_header(rows[0], ["Sample Name", None], self.dataset.classes)
+        # each sample has the rows of its components and their sum, the sample name spans all of them
+        n_rows = n_components + 1
+        expected = ["A1:B1"] + [f"A{2+i*n_rows}:A{1+(i+1)*n_rows}" for i in range(n_samples)]
+        assert merged_ranges(filename, "Unmixed Components") == sorted(expected)
+        assert len(rows) == n_samples * n_rows + 1
+        for i in range(n_samples):
+            unmixed = proportions[i, :, None] * components[i]
+            for j in range(n_components):
+                row = rows[1 + i*n_rows + j]
+                assert row[0] == (self.dataset.sample_names[i] if j == 0 else None)
+                assert row[1] == self.component_names[j]
+                assert np.allclose(np.array(row[2:], dtype=np.float64), unmixed[j])
+            row = rows[1 + i*n_rows + n_components]
+            assert row[:2] == (None, "Sum")
+            assert np.allclose(np.array(row[2:], dtype=np.float64), np.sum(unmixed, axis=0))
+        for j, component_name in enumerate(self.component_names):
+            check_distributions(load_rows(filename, component_name), self.dataset.sample_names,
+                                self.dataset.classes, components[:, j])
+        # the sample name spans two header rows, and each component spans its moments
+        rows = load_rows(filename, "Statistical Moments")
+        n_moments = (len(rows[0]) - 1) // n_components
+        expected = ["A1:A2"] + [f"{column_to_char(1+j*n_moments)}1:{column_to_char(n_moments+j*n_moments)}1"
+                                for j in range(n_components)]
+        assert merged_ranges(filename, "Statistical Moments") == sorted(expected)
+        assert [row[0] for row in rows[2:]] == self.dataset.sample_names
+
+    def test_save_ssu(self, tmp_path):
+        filename = os.path.join(tmp_path, "ssu.xlsx")
+        results = [SSUResult(sample, self.dataset.distribution_type, parameters[None, :, :], 1.0)
+                   for sample, parameters in zip(self.dataset, self.dataset.parameters)]
+        save_ssu(results, filename, align_components=False)
+        wb = openpyxl.load_workbook(filename)
+        assert wb.sheetnames == ["README", "GSDs", "Information of Fitting", "Statistical Moments",
+                                 "Unmixed Components", *self.component_names]
+        proportions = np.array([[component.proportion for component in result] for result in results])
+        components = np.array([[component.distribution for component in result] for result in results])
+        self.check_components(filename, proportions, components)
+
+    def test_save_emma(self, tmp_path):
+        filename = os.path.join(tmp_path, "emma.xlsx")
+        result = try_emma(self.dataset, KernelType.Normal, self.dataset.n_components, min_epochs=10, max_epochs=20)
+        save_emma(result, filename)
+        wb = openpyxl.load_workbook(filename)
+        assert wb.sheetnames == ["README", "GSDs", "Distributions of End Members", "Proportions of End Members"]
+        rows = load_rows(filename, "Distributions of End Members")
+        check_header(rows[0], ["End Member"], self.dataset.classes)
+        assert np.allclose(np.array([row[1:] for row in rows[1:]], dtype=np.float64), result.end_members)
+        rows = load_rows(filename, "Proportions of End Members")
+        assert [row[0] for row in rows[1:]] == self.dataset.sample_names
+        assert np.allclose(np.array([row[1:] for row in rows[1:]], dtype=np.float64),
+                           result.proportions * 100)
+
+    def test_save_udm(self, tmp_path):
+        filename = os.path.join(tmp_path, "udm.xlsx")
+        result = try_udm(self.dataset, KernelType.Normal, self.dataset.n_components,
+                         pretrain_epochs=10, min_epochs=10, max_epochs=20)
+        save_udm(result, filename)
+        wb = openpyxl.load_workbook(filename)
+        assert wb.sheetnames == ["README", "GSDs", "Resolved Parameters", "Statistical Moments",
+                                 "Unmixed Components", *self.component_names]
+        self.check_components(filename, result.proportions[:, 0, :], result.components)
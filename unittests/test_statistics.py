@@ -116,5 +116,39 @@ def test_all_statistics():
             assert key in statistics.keys()
 
 
+def test_all_statistics_batch():
+    def assert_same(expected, actual):
+        if isinstance(expected, dict):
+            assert expected.keys() == actual.keys()
+            for key in expected.keys():
+                assert_same(expected[key], actual[key])
+        elif isinstance(expected, (tuple, list)):
+            assert len(expected) == len(actual)
+            for expected_value, actual_value in zip(expected, actual):
+                assert_same(expected_value, actual_value)
+        elif isinstance(expected, str):
+            assert expected == actual
+        else:
+            assert np.isclose(expected, actual)
+
+    all_sample_statistics = all_statistics_batch(classes, classes_phi, np.array(distributions))
+    assert len(all_sample_statistics) == len(distributions)
+    for distribution, statistics in zip(distributions, all_sample_statistics):
+        assert_same(all_statistics(classes, classes_phi, distribution), statistics)
+
+    # the cumulative frequencies have flat parts, some percentiles are just on them
+    plateau_classes_phi = np.linspace(10, -1, 101)
+    plateau_classes = to_microns(plateau_classes_phi)
+    plateau_distribution = np.zeros(101)
+    plateau_distribution[40] = plateau_distribution[60] = 0.5
+    expected = all_statistics(plateau_classes, plateau_classes_phi, plateau_distribution)
+    actual = all_statistics_batch(plateau_classes, plateau_classes_phi, plateau_distribution[None, :])[0]
+    assert_same(expected, actual)
+    assert np.isclose(actual["logarithmic"]["median"], 3.549, atol=1e-3)
+    assert np.isclose(actual["geometric"]["median"], 85.45, atol=1e-2)
+    assert np.isclose(actual["logarithmic_fw57"]["mean"], 4.218, atol=1e-3)
+    assert np.isclose(actual["geometric_fw57"]["mean"], 53.73, atol=1e-2)
+
+
 if __name__ == "__main__":
     pytest.main(["-s"])
@@ -37,6 +37,12 @@ class TestTryUDM:
         self.log_message(result)
         assert isinstance(result, UDMResult)
 
+    def test_compile_model(self):
+        result = try_udm(self.dataset, KernelType.Normal, self.dataset.n_components, x0=self.x0,
+                         pretrain_epochs=10, min_epochs=10, max_epochs=20, compile_model=True)
+        self.log_message(result)
+        assert isinstance(result, UDMResult)
+
     def test_no_device(self):
         with pytest.raises(AssertionError):
             result = try_udm(self.dataset, KernelType.Normal, self.dataset.n_components, x0=self.x0,
@@ -71,6 +77,15 @@ class TestTryUDM:
             assert result.proportions.tobytes() == proportions_bytes
             assert result.components.tobytes() == components_bytes
 
+    def test_get_history(self):
+        result = try_udm(self.dataset, KernelType.Normal, self.dataset.n_components)
+        indexes = [0, result.n_iterations // 2, result.n_iterations - 1]
+        history = list(result.history)
+        for i, h in zip(indexes, result.get_history(indexes)):
+            assert isinstance(h, UDMResult)
+            assert np.all(h.proportions == history[i].proportions)
+            assert np.all(h.components == history[i].components)
+
     def test_loss(self):
         result = try_udm(self.dataset, KernelType.Normal, self.dataset.n_components)
         for loss_name in built_in_losses: